@@ -1,11 +1,19 @@
 import pygame
 
-pygame.init()
+from fonts import get_font
+from profiler import profiled
+from scaling import rescaled_position, scaled, track
+from text_cache import render
+from text_layout import get_layout
 
 
 class Label:
+    __slots__ = ("surface", "text", "position", "color", "background", "wraplength", "justify", "geometry", "_rect",
+                 "text_rect", "font", "_font_args", "_scale", "_unscaled_wraplength", "text_surface", "dirty",
+                 "_origin", "__weakref__")
+
     def __init__(self, master, text, position, font=None, font_size=30, color=(0, 0, 0), background=None,
-                 underline=False, bold=False, italic=False):
+                 underline=False, bold=False, italic=False, wraplength=0, justify="left"):
         """
         activebackground, activeforeground, anchor, background, bitmap, borderwidth, cursor, disabledforeground, font,
         foreground, highlightbackground, highlightcolor, highlightthickness, justify, padx, pady, relief,
@@ -17,38 +25,95 @@ class Label:
         :param font_size:
         :param color:
         :param background:
+        :param wraplength: the width in pixels the text is wrapped at, 0 only breaks lines on newlines
+        :param justify: "left", "center" or "right" alignment of wrapped lines
         """
         self.surface = master
         self.text = text
         self.position = position
         self.color = color
         self.background = background
+        self.wraplength = wraplength
+        self.justify = justify
+        # Set by the geometry manager the label is arranged by, it is told when the text changes size
+        self.geometry = None
+        self._rect = None
+        self.text_rect = None
 
-        # Set the font, use default if not provided
-        if font is None:
-            self.font = pygame.font.Font(None, font_size)
-        else:
-            self.font = pygame.font.Font(font, font_size)
-
-        if underline:
-            font.set_underline(True)
-        if bold:
-            font.set_bold(True)
-        if italic:
-            font.set_italic(True)
+        # Labels with the same font file, size and style share one font, None is the default font
+        self.font = get_font(font, font_size, bold, italic, underline)
+        self._font_args = (font, font_size, bold, italic, underline)
+        self._scale = 1
+        self._origin = None
+        self._unscaled_wraplength = wraplength
 
         # Render the text
         self.render_text()
+        track(self)
+
+    def apply_scale(self, scale):
+        """
+        Rasterize the text again with the font at a UI scale factor, scaling.set_scale calls this
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        self.position, self._origin = rescaled_position(self.position, self._scale, scale, self._origin)
+        self._scale = scale
+        path, size, bold, italic, underline = self._font_args
+        self.font = get_font(path, max(1, round(size * scale)), bold, italic, underline)
+        self.wraplength = scaled(self._unscaled_wraplength, scale)
+        self.render_text()
 
+    @profiled("render")
     def render_text(self):
+        previous_size = self.text_rect.size if self.text_rect is not None else None
         # Render the text surface with or without background color
-        if self.background:
-            self.text_surface = self.font.render(self.text, True, self.color, self.background)
+        if self.wraplength > 0 or "\n" in self.text:
+            layout = get_layout(self.font, self.text, self.wraplength, justify=self.justify)
+            self.text_surface = layout.render(self.color, self.background)
+        elif self.background:
+            self.text_surface = render(self.font, self.text, True, self.color, self.background)
         else:
-            self.text_surface = self.font.render(self.text, True, self.color)
+            self.text_surface = render(self.font, self.text, True, self.color)
         # Get the rectangle of the text surface
         self.text_rect = self.text_surface.get_rect(topleft=self.position)
+        if self._rect is not None:
+            self._align()
+        self.dirty = True
+        if self.geometry is not None and self.text_rect.size != previous_size:
+            self.geometry.invalidate(self)
+
+    def get_requested_size(self):
+        """Return the size of the rendered text."""
+        return self.text_surface.get_size()
 
-    def draw(self):
+    def set_rect(self, rect):
+        """
+        Put the text inside rect, this is how geometry managers arrange it. The text keeps its size and is aligned
+        horizontally by justify and centered vertically
+        :param rect: the area the label is given
+        """
+        self._rect = pygame.Rect(rect)
+        self._align()
+        self.dirty = True
+
+    def _align(self):
+        if self.justify == "center":
+            self.text_rect.center = self._rect.center
+        elif self.justify == "right":
+            self.text_rect.midright = self._rect.midright
+        else:
+            self.text_rect.midleft = self._rect.midleft
+        self.position = self.text_rect.topleft
+
+    def get_bounds(self):
+        """Return the rect covering the rendered text."""
+        return self.text_rect.copy()
+
+    @profiled("render")
+    def draw(self, surface=None):
         # Draw the text surface onto the given surface
-        self.surface.blit(self.text_surface, self.text_rect)
+        (self.surface if surface is None else surface).blit(self.text_surface, self.text_rect)
+        self.dirty = False
+
@@ -0,0 +1,165 @@
+import time
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from event_loop import after
+
+# The number of surfaces a transition between two states is drawn with, the first and last being the states
+KEYFRAMES = 10
+
+
+def ease(progress):
+    """Smoothstep easing, ease(1 - p) == 1 - ease(p) so a transition reversed halfway looks continuous."""
+    return progress * progress * (3 - 2 * progress)
+
+
+def keyframes(start, end, count=KEYFRAMES):
+    """
+    Return count surfaces going from start to end, their size, colors and alpha interpolated linearly
+    :param start: the surface of the state the transition starts from
+    :param end: the surface of the state the transition ends in
+    """
+    frames = [start]
+    start_size, end_size = pygame.Vector2(start.get_size()), pygame.Vector2(end.get_size())
+    for index in range(1, count - 1):
+        t = index / (count - 1)
+        size = start_size.lerp(end_size, t)
+        size = (round(size.x), round(size.y))
+        # Both states scaled to the size of the frame and mixed channel by channel, alpha included
+        first = start.copy() if start.get_size() == size else pygame.transform.smoothscale(start, size)
+        second = end.copy() if end.get_size() == size else pygame.transform.smoothscale(end, size)
+        weight = round(255 * t)
+        first.fill((255 - weight,) * 4, special_flags=pygame.BLEND_RGBA_MULT)
+        second.fill((weight,) * 4, special_flags=pygame.BLEND_RGBA_MULT)
+        first.blit(second, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+        frames.append(first)
+    frames.append(end)
+    return frames
+
+
+class KeyframeCache:
+    """A least recently used cache of the keyframes of transitions, shared by every widget.
+
+    Widgets that look alike go through the same transitions, so the keyframes are keyed by what the two state
+    surfaces are drawn from, eg. a button's style, text and size, and the states, rather than kept per widget. Like
+    the text cache, the surfaces handed out are shared and must not be modified.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """
+        :param max_bytes: the amount of pixel memory the cached keyframes may use before the least recently used
+                          ones are evicted
+        """
+        self._frames = OrderedDict()
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    @staticmethod
+    def _size(frames):
+        # The first and last frame are the state surfaces, which the widgets keep anyway
+        return sum(frame.get_pitch() * frame.get_height() for frame in frames[1:-1])
+
+    def get(self, key, start, end):
+        """
+        Return the keyframes from start to end, made once per key
+        :param key: a hashable describing both surfaces, widgets with equal keys must draw equal surfaces
+        :param start: a function returning the surface of the state the transition starts from
+        :param end: a function returning the surface of the state the transition ends in
+        """
+        frames = self._frames.get(key)
+        if frames is not None:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frames
+        self.misses += 1
+        frames = self._frames[key] = keyframes(start(), end())
+        self.size_bytes += self._size(frames)
+        while self.size_bytes > self.max_bytes and len(self._frames) > 1:
+            _, old = self._frames.popitem(last=False)
+            self.size_bytes -= self._size(old)
+        return frames
+
+    def clear(self):
+        self._frames.clear()
+        self.size_bytes = 0
+
+
+class Transition:
+    """A running transition of a widget from one visual state to another."""
+    __slots__ = ("start_state", "end_state", "started", "duration")
+
+    def __init__(self, start_state, end_state, duration, started=None):
+        """
+        :param start_state: the state the widget was shown in
+        :param end_state: the state the widget is going to
+        :param duration: the length of the transition in seconds
+        :param started: the time.monotonic() the transition started at, defaults to now
+        """
+        self.start_state = start_state
+        self.end_state = end_state
+        self.duration = duration
+        self.started = time.monotonic() if started is None else started
+
+    def progress(self, now=None):
+        """Return how far the transition got, from 0 to 1."""
+        if self.duration <= 0:
+            return 1.0
+        return min(1.0, ((time.monotonic() if now is None else now) - self.started) / self.duration)
+
+    def retarget(self, end_state, duration):
+        """Return the transition from the state shown now to end_state. Going back to the start state continues
+        from the frame shown, else the transition starts from the nearer of the two states."""
+        progress = self.progress()
+        if end_state == self.start_state:
+            return Transition(self.end_state, end_state, duration, time.monotonic() - (1 - progress) * duration)
+        return Transition(self.start_state if progress < 0.5 else self.end_state, end_state, duration)
+
+    def frame(self, frames):
+        """Return the keyframe of a list of keyframes that is shown now."""
+        return frames[round(ease(self.progress()) * (len(frames) - 1))]
+
+
+class Animator:
+    """Repaints the widgets whose transitions are running, and only those.
+
+    A widget calls start() when a transition begins, the animator then marks it dirty once a frame through an
+    after() timer until its ``animating`` attribute turns False. While no widget animates no timer is scheduled, so
+    the main loop can sleep.
+    """
+
+    def __init__(self, frame_ms=1000 / 60):
+        """
+        :param frame_ms: the time between two frames of a transition
+        """
+        self.frame_ms = frame_ms
+        self.widgets = weakref.WeakSet()
+        self._timer = None
+
+    def start(self, widget):
+        """Repaint a widget every frame until its transition ended."""
+        self.widgets.add(widget)
+        if self._timer is None:
+            self._timer = after(self.frame_ms, self._tick)
+
+    def _tick(self):
+        self._timer = None
+        for widget in list(self.widgets):
+            if widget.animating:
+                widget.dirty = True
+            else:
+                self.widgets.discard(widget)
+        if self.widgets:
+            self._timer = after(self.frame_ms, self._tick)
+
+
+# The animator the widgets register their transitions with
+animator = Animator()
+# The keyframes of the transitions of every widget
+keyframe_cache = KeyframeCache()
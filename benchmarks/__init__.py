@@ -0,0 +1,5 @@
+"""Headless performance benchmarks.
+
+python -m benchmarks runs the widget scenarios and can write or compare JSON reports, python -m
+benchmarks.text_layout compares the text wrapping strategies.
+"""
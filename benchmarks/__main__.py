@@ -0,0 +1,69 @@
+"""Run the widget benchmarks without a display and optionally compare them with an earlier run.
+
+python -m benchmarks --output results.json
+python -m benchmarks --compare results.json
+"""
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from benchmarks import runner
+from benchmarks.widgets import SCENARIOS, SCREEN_SIZE
+
+DEFAULT_COUNTS = (10, 100, 1000, 10000)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help="the scenarios to run, every scenario by default")
+    parser.add_argument("--counts", nargs="+", type=int, default=DEFAULT_COUNTS, help="the widget counts")
+    parser.add_argument("--frames", type=int, default=30, help="timed frames per scenario and count")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="a JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative p50 slowdown reported as a regression, default 0.1")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    results = []
+    print(f"{'scenario':<20} {'count':>6} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'peak alloc':>11}")
+    for name in args.scenarios:
+        for count in args.counts:
+            # Constructing thousands of widgets takes long enough that fewer frames are plenty
+            frames = args.frames if count < 10000 else max(3, args.frames // 10)
+            result = runner.measure(name, count, SCENARIOS[name](screen, count), frames=frames)
+            results.append(result)
+            print(f"{name:<20} {count:>6} {result['p50_ms']:>9.3f} {result['p90_ms']:>9.3f} "
+                  f"{result['p99_ms']:>9.3f} {result['alloc_peak_bytes']:>11}")
+
+    report = {"meta": runner.metadata(), "results": results}
+    if args.output:
+        runner.save(results, args.output)
+
+    if args.compare:
+        regressed = False
+        print(f"\n{'scenario':<20} {'count':>6} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+        for name, count, before, after, ratio, slower in runner.compare(runner.load(args.compare), report,
+                                                                        args.threshold):
+            regressed |= slower
+            print(f"{name:<20} {count:>6} {before:>10.3f} {after:>10.3f} {ratio:>7.2f}"
+                  f"{'  REGRESSION' if slower else ''}")
+        return 1 if regressed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Time building a 1000 widget screen one constructor at a time and through factory.build_widgets, starting from
+cold text, layout and image caches every time."""
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from factory import WIDGETS, build_widgets
+from image_cache import image_cache
+from text_cache import text_cache
+from text_layout import clear_layouts
+
+RUNS = 5
+
+
+def screen_specs(count=1000):
+    """Return specs of a screen with 60% buttons, 30% labels and 10% input boxes reusing 50 captions."""
+    icon = pygame.Surface((24, 24))
+    icon.fill((40, 120, 200))
+    specs = []
+    for i in range(count):
+        position = ((i % 10) * 120, (i // 10) % 18 * 40)
+        if i % 10 < 6:
+            specs.append({"type": "button", "position": position, "text": f"Action {i % 50}", "width": 110,
+                          "height": 34, "hover_font_color": (0, 0, 150), "image": icon if i % 5 == 0 else None})
+        elif i % 10 < 9:
+            specs.append({"type": "label", "text": f"Caption {i % 50}", "position": position, "font_size": 22})
+        else:
+            specs.append({"type": "input_box", "x": position[0], "y": position[1], "w": 110, "h": 32,
+                          "text": "search"})
+    return specs
+
+
+def one_by_one(screen, specs):
+    widgets = []
+    for spec in specs:
+        options = dict(spec)
+        cls = WIDGETS[options.pop("type")]
+        widgets.append(cls(**options) if options.keys() >= {"x", "y"} else cls(screen, **options))
+    return widgets
+
+
+def timed(function):
+    timings = []
+    for _ in range(RUNS):
+        text_cache.clear()
+        clear_layouts()
+        image_cache.clear()
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((1280, 720))
+    specs = screen_specs()
+    print(f"one constructor at a time:   {timed(lambda: one_by_one(screen, specs)):8.1f} ms")
+    print(f"build_widgets:               {timed(lambda: build_widgets(screen, specs)):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
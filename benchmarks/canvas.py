@@ -0,0 +1,83 @@
+"""Time a Canvas redrawing 100k points, a 100k point line and 10k rectangles that change every frame, against the
+same drawing done with pygame.draw calls in a Python loop. The budget of a 60 fps frame is 16.7 ms."""
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from canvas import Canvas
+
+SIZE = (1280, 720)
+COUNT = 100000
+FRAMES = 30
+
+
+def frame_time(draw, frames=FRAMES):
+    timings = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        draw(frame)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode(SIZE)
+    random = np.random.default_rng(0)
+    points = random.random((FRAMES, COUNT, 2)) * SIZE
+    x = np.linspace(0, SIZE[0] - 1, COUNT)
+    lines = [np.column_stack((x, SIZE[1] / 2 + np.sin(x / 40 + frame) * 300)) for frame in range(FRAMES)]
+    rects = [np.column_stack((random.random((COUNT // 10, 2)) * SIZE, np.full((COUNT // 10, 2), 4)))
+             for _ in range(FRAMES)]
+
+    canvas = Canvas(screen, (0, 0) + SIZE)
+    canvas.create_rectangles([(0, SIZE[1] // 2, SIZE[0], 1)], color=(80, 80, 80), layer="grid")
+    item = canvas.create_points(points[0], color=(0, 255, 0), layer="data")
+
+    def canvas_points(frame):
+        canvas.coords(item, points[frame])
+        canvas.draw()
+
+    def loop_points(frame):
+        screen.fill((0, 0, 0))
+        for x, y in points[frame].astype(int).tolist():
+            screen.set_at((x, y), (0, 255, 0))
+
+    print(f"{COUNT} points:     canvas {frame_time(canvas_points):7.2f} ms   set_at loop {frame_time(loop_points):7.2f} ms")
+
+    canvas.delete(item)
+    item = canvas.create_line(lines[0], color=(0, 255, 0), layer="data")
+
+    def canvas_line(frame):
+        canvas.coords(item, lines[frame])
+        canvas.draw()
+
+    def draw_line(frame):
+        screen.fill((0, 0, 0))
+        pygame.draw.lines(screen, (0, 255, 0), False, lines[frame].tolist())
+
+    print(f"{COUNT} point line: canvas {frame_time(canvas_line):7.2f} ms   draw.lines  {frame_time(draw_line):7.2f} ms")
+
+    canvas.delete(item)
+    item = canvas.create_rectangles(rects[0], color=(0, 255, 0), layer="data")
+
+    def canvas_rects(frame):
+        canvas.coords(item, rects[frame])
+        canvas.draw()
+
+    def loop_rects(frame):
+        screen.fill((0, 0, 0))
+        for rect in rects[frame].tolist():
+            screen.fill((0, 255, 0), rect)
+
+    print(f"{COUNT // 10} rectangles: canvas {frame_time(canvas_rects):7.2f} ms   fill loop   {frame_time(loop_rects):7.2f} ms")
+    print(f"unchanged canvas:  {frame_time(lambda frame: canvas.draw()):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Time the frames of a loop while a button's command blocks for 200 ms, once called directly and once run through
+commands.runner, a blocking command stalls one frame by its whole duration."""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from button import Button
+from commands import runner
+
+COMMAND_SECONDS = 0.2
+FRAMES = 30
+
+
+def slow_command():
+    time.sleep(COMMAND_SECONDS)
+    return "done"
+
+
+def worst_frame(async_command):
+    """Return the longest frame in ms and the frame the result arrived in."""
+    screen = pygame.display.set_mode((320, 240))
+    results = []
+    button = Button(screen, (10, 10), text="Fetch", command=slow_command, async_command=async_command,
+                    on_result=lambda value: results.append(frame))
+    press = pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=button.rect_original.center)
+    release = pygame.event.Event(pygame.MOUSEBUTTONUP, button=1, pos=button.rect_original.center)
+    worst = 0
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+        if frame == 0:
+            button.check_event(press)
+            button.check_event(release)
+        runner.process()
+        button.draw()
+        worst = max(worst, time.perf_counter() - start)
+        time.sleep(max(0.0, 1 / 60 - (time.perf_counter() - start)))
+    return worst * 1000, results[0] if results else None
+
+
+def main():
+    pygame.display.init()
+    for async_command in (False, True):
+        worst, arrived = worst_frame(async_command)
+        line = f"{'async' if async_command else 'sync':5}: longest frame {worst:7.2f} ms"
+        if arrived is not None:
+            line += f", result delivered in frame {arrived}"
+        print(line)
+    runner.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Time streaming log lines into a Text widget, 500 lines a frame, as the history grows to 100k lines."""
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from text import END, Text
+
+LINES_PER_FRAME = 500
+CHECKPOINTS = (1000, 10000, 100000)
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((1280, 720))
+    console = Text(screen, (0, 0, 1280, 720), font_size=18, max_lines=100000)
+    written = 0
+    timings = []
+    for checkpoint in CHECKPOINTS:
+        while written < checkpoint:
+            start = time.perf_counter()
+            for _ in range(LINES_PER_FRAME):
+                console.insert(END, f"{written:08d} INFO worker-{written % 16} processed request in {written % 97} ms\n")
+                written += 1
+            console.draw()
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"{checkpoint:7d} lines of history: {statistics.median(timings[-20:]):6.2f} ms per frame of "
+              f"{LINES_PER_FRAME} lines")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        console.scroll(-1)
+        console.draw()
+    print(f"scrolling back one line:      {(time.perf_counter() - start) * 10:6.3f} ms per frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Count how often an idle window repaints and how much CPU it uses, for a loop polling pygame.event.get() at 60 fps
+with pygame.time.Clock and for event_loop.mainloop, which sleeps until an event arrives or a timer is due. The window
+has a few buttons and an InputBox, blinking when it is active.
+
+SDL only blocks in pygame.event.wait() with a real video driver, the dummy driver polls for events every
+millisecond, so the CPU figures of a headless run are an upper bound for mainloop."""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from button import Button
+from event_loop import after, loop, mainloop
+from input_box import InputBox
+from widget_manager import WidgetManager
+
+SECONDS = 3
+
+
+class CountingManager(WidgetManager):
+    passes = 0
+
+    def update(self, force=False, poll=True):
+        self.passes += 1
+        return super().update(force, poll)
+
+
+def build(screen, active):
+    manager = CountingManager(screen, background=(30, 30, 30))
+    manager.add(InputBox(10, 10, 300, 32, active=active))
+    manager.add(*(Button(screen, (10 + 80 * i, 60), text=f"B{i}") for i in range(6)))
+    return manager
+
+
+def polling(manager):
+    clock = pygame.time.Clock()
+    end = time.monotonic() + SECONDS
+    while time.monotonic() < end:
+        for event in pygame.event.get():
+            for widget in manager.widgets:
+                widget.check_event(event)
+        loop.run_timers()
+        pygame.display.update(manager.update())
+        clock.tick(60)
+
+
+def event_driven(manager):
+    after(SECONDS * 1000, loop.quit)
+    mainloop(manager)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((640, 200))
+    for name, run, active in (("polling at 60 fps", polling, True), ("mainloop", event_driven, True),
+                              ("mainloop, no caret", event_driven, False)):
+        manager = build(screen, active)
+        start_cpu, start = time.process_time(), time.monotonic()
+        run(manager)
+        cpu, wall = time.process_time() - start_cpu, time.monotonic() - start
+        print(f"{name:19} {manager.passes / wall:5.1f} passes per second   {100 * cpu / wall:4.1f}% CPU")
+        manager.widgets[0].active = False
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Time reflowing a 500 widget window after a resize through the geometry managers, against building every widget
+again at its new position, and the relayout after one label changes its text."""
+import os
+import statistics
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from Label import Label
+from button import Button
+from geometry import Grid, Pack
+from input_box import InputBox
+
+ROWS = 160
+RUNS = 20
+
+
+def build(screen, size):
+    """Build a toolbar of 20 buttons above a form of 160 label/input box/button rows, 500 widgets in all."""
+    root = Pack(pygame.Rect((0, 0), size))
+    toolbar = Pack()
+    root.pack(toolbar, side="top", fill="x")
+    for i in range(20):
+        toolbar.pack(Button(screen, (0, 0), text=f"Tool {i}", width=60, height=28), side="left", padx=2, pady=2)
+    form = Grid()
+    form.columnconfigure(1, weight=1)
+    root.pack(form, side="top", fill="both", expand=True)
+    labels = []
+    for row in range(ROWS):
+        label = Label(screen, f"Field {row}", (0, 0), font_size=20)
+        labels.append(label)
+        form.grid(label, row=row, column=0, sticky="w", padx=4)
+        form.grid(InputBox(0, 0, 120, 22), row=row, column=1, sticky="ew", pady=1)
+        form.grid(Button(screen, (0, 0), text="Clear", width=50, height=22), row=row, column=2, padx=4)
+    root.update()
+    return root, labels
+
+
+def median_ms(function, runs=RUNS):
+    timings = []
+    for run in range(runs):
+        start = time.perf_counter()
+        function(run)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((1280, 720))
+    root, labels = build(screen, (1280, 4000))
+    sizes = [(1280 - 10 * run, 4000 - 5 * run) for run in range(1, RUNS + 1)]
+    print(f"rebuilding 500 widgets:         {median_ms(lambda run: build(screen, sizes[run])):8.2f} ms")
+    print(f"relayout after a resize:        "
+          f"{median_ms(lambda run: root.set_rect(pygame.Rect((0, 0), sizes[run]))):8.2f} ms")
+
+    def change_label(run):
+        labels[run].text = f"A longer field name {run}"
+        labels[run].render_text()
+        root.update()
+    print(f"relayout after a label changed: {median_ms(change_label):8.2f} ms")
+    print(f"relayout with nothing changed:  {median_ms(lambda run: root.update()):8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
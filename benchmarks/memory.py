@@ -0,0 +1,57 @@
+"""Measure the Python memory every widget takes, with tracemalloc, for a screen of widgets that look alike. Pixel
+memory allocated by SDL is not traced, shared surfaces are counted once at most anyway."""
+import gc
+import os
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from Label import Label
+from button import Button
+from dropdown import DropDown
+from fonts import get_font
+from input_box import InputBox
+
+COUNT = 2000
+
+
+def makers(screen):
+    font = get_font(None, 24)
+    colors = [(200, 200, 200), (150, 150, 150)]
+    return {
+        "Button": lambda i: Button(screen, (i, 0), text="OK", font=font, width=80, height=30,
+                                   highlight_color=(200, 200, 255)),
+        "Label": lambda i: Label(screen, "Name", (i, 0), font_size=24),
+        "InputBox": lambda i: InputBox(i, 0, 100, 30, font=font),
+        "DropDown": lambda i: DropDown(colors, colors, i, 0, 80, 20, font, "Menu", ["a", "b"]),
+    }
+
+
+def bytes_per_widget(make, count=COUNT):
+    """Return the traced bytes one widget adds, once the shared caches are warm."""
+    make(0)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    widgets = [make(i) for i in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count, widgets
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((640, 480))
+    for name, make in makers(screen).items():
+        size, widgets = bytes_per_widget(make)
+        line = f"{name:10} {size:8.0f} bytes"
+        if name == "Button":
+            line += f"   {len({id(button.style) for button in widgets})} style(s) for {len(widgets)} buttons"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Timing, allocation and comparison helpers shared by the benchmark scenarios."""
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import pygame
+
+
+def percentile(sorted_values, fraction):
+    """Return the value below which the given fraction of the sorted values fall, using the nearest rank."""
+    if not sorted_values:
+        return 0.0
+    rank = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def measure(name, count, frame, frames=30, warmup=3):
+    """
+    Time a frame function and measure the memory it allocates
+    :param name: the name of the scenario
+    :param count: the number of widgets in the scenario
+    :param frame: a function doing the work of one frame
+    :param frames: the number of timed frames
+    :param warmup: frames run before timing starts, so caches are warm
+    :return: a dictionary with latency percentiles in milliseconds and allocations in bytes
+    """
+    for _ in range(warmup):
+        frame()
+
+    timings = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        frame()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+
+    # Allocations are measured on a separate frame, tracing would distort the timings
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    frame()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"name": name, "count": count, "frames": frames,
+            "mean_ms": sum(timings) / len(timings), "p50_ms": percentile(timings, 0.5),
+            "p90_ms": percentile(timings, 0.9), "p99_ms": percentile(timings, 0.99), "max_ms": timings[-1],
+            "alloc_peak_bytes": peak - before, "alloc_net_bytes": after - before}
+
+
+def metadata():
+    """Describe the environment the benchmarks ran in."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())), "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+
+
+def save(results, path):
+    with open(path, "w") as file:
+        json.dump({"meta": metadata(), "results": results}, file, indent=2)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(baseline, current, threshold=0.1, metric="p50_ms"):
+    """
+    Compare two benchmark reports
+    :param baseline: the report loaded from an earlier run
+    :param current: the report of this run
+    :param threshold: the relative slowdown that counts as a regression, 0.1 is 10% slower
+    :param metric: the result field that is compared
+    :return: a list of (name, count, baseline value, current value, ratio, regressed) tuples
+    """
+    old = {(result["name"], result["count"]): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        key = (result["name"], result["count"])
+        if key not in old:
+            continue
+        before, after = old[key][metric], result[metric]
+        ratio = after / before if before else float("inf") if after else 1.0
+        rows.append((*key, before, after, ratio, ratio > 1 + threshold))
+    return rows
@@ -0,0 +1,49 @@
+"""Measure how long importing the widget modules takes in a fresh interpreter, and how long building 1000 labels
+takes along with the number of distinct font objects they end up holding."""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+IMPORT = "import button, input_box, dropdown, Label"
+RUNS = 10
+
+
+def import_time():
+    """Return the median wall time in milliseconds of a fresh interpreter importing the widget modules, minus the
+    time of one only importing pygame."""
+    def median(code):
+        timings = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings) * 1000
+    return median(IMPORT) - median("import pygame")
+
+
+def build_labels(count=1000):
+    import pygame
+    from Label import Label
+
+    pygame.display.init()
+    screen = pygame.display.set_mode((640, 480))
+    start = time.perf_counter()
+    labels = [Label(screen, f"Label {i}", (0, 0), font_size=24) for i in range(count)]
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, len({id(label.font) for label in labels})
+
+
+def main():
+    print(f"widget module import: {import_time():.1f} ms")
+    elapsed, fonts = build_labels()
+    print(f"1000 labels: {elapsed:.1f} ms, {fonts} distinct font objects")
+
+
+if __name__ == "__main__":
+    main()
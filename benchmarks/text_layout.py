@@ -0,0 +1,53 @@
+"""Compare the per-word wrapping of text_layout with re-measuring the growing line for every word, the way Button
+used to wrap its text. The time per word should stay flat for wrap_lines as the caption gets longer."""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from text_layout import wrap_lines
+
+pygame.font.init()
+
+WORD_COUNTS = (250, 500, 1000, 2000, 4000, 8000)
+
+
+def wrap_remeasuring(font, text, width):
+    lines = []
+    current_line = ""
+    for word in text.split(" "):
+        if font.size(current_line + word)[0] <= width:
+            current_line += word + " "
+        else:
+            lines.append(current_line.strip())
+            current_line = word + " "
+    lines.append(current_line.strip())
+    return lines
+
+
+def best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    font = pygame.font.Font(None, 24)
+    vocabulary = "the quick brown fox jumps over a lazy dog while seven wizards box".split()
+    print(f"{'words':>6} {'wrap_lines us/word':>20} {'re-measuring us/word':>22}")
+    for count in WORD_COUNTS:
+        text = " ".join(vocabulary[i % len(vocabulary)] for i in range(count))
+        # A line as wide as the whole text is the worst case for re-measuring the growing line
+        width = 10 ** 7
+        linear = best_of(lambda: wrap_lines(font, text, width))
+        remeasuring = best_of(lambda: wrap_remeasuring(font, text, width), repeat=1)
+        print(f"{count:>6} {linear / count * 1e6:>20.3f} {remeasuring / count * 1e6:>22.3f}")
+
+
+if __name__ == "__main__":
+    main()
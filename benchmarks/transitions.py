@@ -0,0 +1,90 @@
+"""Time the frames of 200 buttons fading into their hover state at once, first while every button builds the
+keyframes of the transition, then with the keyframes cached, against scaling and mixing the two state surfaces
+every frame. Also shows that only the buttons animating are repainted."""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from animation import animator, ease
+from button import Button
+from dispatcher import EventDispatcher
+from event_loop import loop
+
+COUNT = 200
+TRANSITION_MS = 150
+
+
+def build(screen):
+    dispatcher = EventDispatcher()
+    buttons = [Button(screen, (i % 20 * 60, i // 20 * 40), text=f"B{i}", width=56, height=36, border_radius=6,
+                      bg=(40, 40, 40), highlight_color=(90, 140, 230), transition_ms=TRANSITION_MS)
+               for i in range(COUNT)]
+    dispatcher.register(*buttons)
+    for button in buttons:
+        button.draw()
+    return buttons
+
+
+def run_transition(buttons, change):
+    """Change the state of every button and draw until the transitions ended, return the frame times in ms."""
+    for button in buttons:
+        change(button)
+    timings = []
+    while any(button.animating for button in buttons) or not timings:
+        start = time.perf_counter()
+        for button in buttons:
+            button.draw()
+        timings.append((time.perf_counter() - start) * 1000)
+        time.sleep(max(0.0, 1 / 60 - timings[-1] / 1000))
+    return timings
+
+
+def mixed_every_frame(screen, buttons):
+    """Draw the same transition by scaling and mixing the two state surfaces anew every frame."""
+    timings = []
+    started = time.monotonic()
+    while True:
+        progress = min(1.0, (time.monotonic() - started) * 1000 / TRANSITION_MS)
+        weight = round(255 * ease(progress))
+        start = time.perf_counter()
+        for button in buttons:
+            normal, hovered = button._state_surfaces["normal"], button._state_surfaces["hovered"]
+            first = pygame.transform.smoothscale(normal, normal.get_size())
+            second = pygame.transform.smoothscale(hovered, hovered.get_size())
+            first.fill((255 - weight,) * 4, special_flags=pygame.BLEND_RGBA_MULT)
+            second.fill((weight,) * 4, special_flags=pygame.BLEND_RGBA_MULT)
+            first.blit(second, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            screen.blit(first, button.rect_original)
+        timings.append((time.perf_counter() - start) * 1000)
+        if progress >= 1:
+            return timings
+        time.sleep(max(0.0, 1 / 60 - timings[-1] / 1000))
+
+
+def describe(name, timings):
+    print(f"{name:28} {len(timings):3d} frames   mean {sum(timings) / len(timings):6.2f} ms   "
+          f"max {max(timings):6.2f} ms")
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((1200, 400))
+    buttons = build(screen)
+    describe("building keyframes", run_transition(buttons, Button.on_enter))
+    run_transition(buttons, Button.on_leave)
+    describe("cached keyframes", run_transition(buttons, Button.on_enter))
+    describe("mixing every frame", mixed_every_frame(screen, buttons))
+
+    # The animator drops the buttons whose transition ended on its next frame
+    buttons[0].on_leave()
+    buttons[0].draw()
+    time.sleep(animator.frame_ms / 1000)
+    loop.run_timers()
+    print(f"one button hovered: {len(animator.widgets)} of {COUNT} buttons scheduled")
+
+
+if __name__ == "__main__":
+    main()
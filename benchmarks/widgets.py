@@ -0,0 +1,150 @@
+"""The benchmark scenarios, each builds its widgets for a widget count and returns the work of one frame."""
+import pygame
+
+from Label import Label
+from button import Button
+from dropdown import DropDown
+from frame import Frame
+from input_box import InputBox
+
+SCREEN_SIZE = (1280, 720)
+
+
+def _grid_position(index, width=120, height=40):
+    columns = SCREEN_SIZE[0] // width
+    return (index % columns) * width, (index // columns) % (SCREEN_SIZE[1] // height) * height
+
+
+def button_init(screen, count):
+    font = pygame.font.Font(None, 24)
+
+    def frame():
+        for i in range(count):
+            Button(screen, _grid_position(i), text=f"Button {i % 50}", font=font, width=110, height=34,
+                   highlight_color=(200, 200, 255), hover_font_color=(0, 0, 120))
+    return frame
+
+
+def _buttons(screen, count):
+    font = pygame.font.Font(None, 24)
+    return [Button(screen, _grid_position(i), text=f"Button {i % 50}", font=font, width=110, height=34,
+                   highlight_color=(200, 200, 255), command=lambda: None) for i in range(count)]
+
+
+def button_update(screen, count):
+    buttons = _buttons(screen, count)
+
+    def frame():
+        for button in buttons:
+            button.update()
+    return frame
+
+
+def button_check_event(screen, count):
+    buttons = _buttons(screen, count)
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(50, 15), rel=(1, 0), buttons=(0, 0, 0)),
+              pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(50, 15), button=1),
+              pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(50, 15), button=1)]
+
+    def frame():
+        for event in events:
+            for button in buttons:
+                button.check_event(event)
+    return frame
+
+
+def input_box_typing(screen, count):
+    boxes = [InputBox(*_grid_position(i, 200, 40), 190, 34, active=True) for i in range(count)]
+    keys = "the quick brown fox jumps over the lazy dog "
+    typed = [0]
+
+    def frame():
+        event = pygame.event.Event(pygame.TEXTINPUT, text=keys[typed[0] % len(keys)])
+        typed[0] += 1
+        for box in boxes:
+            box.check_event(event)
+            box.update(screen)
+    return frame
+
+
+def _dropdown(count):
+    colors = [(200, 200, 200), (150, 150, 150)]
+    dropdown = DropDown(colors, colors, 100, 10, 200, 24, pygame.font.Font(None, 22), "Servers",
+                        [f"server-{i:05d}" for i in range(count)])
+    dropdown.draw_menu = True
+    return dropdown
+
+
+def dropdown_draw(screen, count):
+    dropdown = _dropdown(count)
+
+    def frame():
+        dropdown.draw(screen)
+    return frame
+
+
+def dropdown_update(screen, count):
+    dropdown = _dropdown(count)
+    events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(150, 60), rel=(0, 1), buttons=(0, 0, 0))]
+
+    def frame():
+        dropdown.update(events)
+        dropdown.draw_menu = True
+    return frame
+
+
+def label_render_text(screen, count):
+    labels = [Label(screen, "label", _grid_position(i), font_size=24) for i in range(count)]
+    rendered = [0]
+
+    def frame():
+        # A new text every frame, so the text cache cannot answer every call
+        rendered[0] += 1
+        for i, label in enumerate(labels):
+            label.text = f"Label {i % 100} frame {rendered[0]}"
+            label.render_text()
+    return frame
+
+
+def _panel(screen, count):
+    frame = Frame(screen, (0, 0) + SCREEN_SIZE, background=(30, 30, 30),
+                  content_size=(SCREEN_SIZE[0], 40 * (count // (SCREEN_SIZE[0] // 120) + 1)))
+    font = pygame.font.Font(None, 24)
+    columns = SCREEN_SIZE[0] // 120
+    frame.add(*[Button(frame.surface, ((i % columns) * 120, (i // columns) * 40), text=f"Button {i % 50}",
+                       font=font, width=110, height=34) for i in range(count)])
+    frame.update()
+    return frame
+
+
+def frame_static(screen, count):
+    frame = _panel(screen, count)
+
+    def frame_work():
+        frame.update()
+    return frame_work
+
+
+def frame_scroll(screen, count):
+    frame = _panel(screen, count)
+    step = [1]
+
+    def frame_work():
+        if frame.scroll_y in (0, frame.surface.get_height() - frame.rect.h):
+            step[0] = -step[0]
+        frame.scroll(0, step[0] * 5)
+        frame.update()
+    return frame_work
+
+
+SCENARIOS = {
+    "button_init": button_init,
+    "button_update": button_update,
+    "button_check_event": button_check_event,
+    "input_box_typing": input_box_typing,
+    "dropdown_draw": dropdown_draw,
+    "dropdown_update": dropdown_update,
+    "label_render_text": label_render_text,
+    "frame_static": frame_static,
+    "frame_scroll": frame_scroll,
+}
@@ -1,6 +1,15 @@
+import inspect
+
 import pygame
 
-pygame.init()
+from animation import Transition, animator, keyframe_cache
+from commands import runner
+from fonts import font_from, with_style
+from image_cache import image_cache
+from profiler import profiled, profiler
+from scaling import rescaled_position, scaled, scaled_font, scaled_image, track
+from style import Style
+from text_layout import get_layout
 
 
 def draw_bordered_rounded_rect(surface, rect, color, border_color, corner_radius, border_thickness):
@@ -23,23 +32,78 @@ def draw_bordered_rounded_rect(surface, rect, color, border_color, corner_radius
         pygame.draw.rect(surface, color, rect_tmp, border_radius=inner_radius)
 
 
+# How much the text shrinks while the button is pressed
+PRESSED_SCALE = (1 - 0.13, 1 - 0.24)
+
+
+def _map_images(image, function):
+    """Apply function to an image or to every image of a list of images."""
+    if isinstance(image, list):
+        return [function(img) for img in image]
+    return function(image) if image else image
+
+
+def _pressed_images(image):
+    """Return the shrunk variant of an image or list of images shown while the button is pressed."""
+    return _map_images(image, lambda img: image_cache.scaled(
+        img, (PRESSED_SCALE[0] * img.get_width(), PRESSED_SCALE[1] * img.get_height())))
+
+
+def _scale_position(position, scale):
+    # A position is an (x, y) pair, or a list of them for a list of images
+    if not position:
+        return position
+    if isinstance(position[0], (tuple, list)):
+        return [_scale_position(each, scale) for each in position]
+    return scaled(position[0], scale), scaled(position[1], scale)
+
+
+def _style_property(field, doc, text=False):
+    """A button attribute kept in its shared style, setting it gives the button a style with the new value. The text
+    is rendered again when the field is one of the text's (text=True)."""
+    def get(self):
+        return getattr(self.style, field)
+
+    def set(self, value):
+        self.style = self.style.replace(**{field: value})
+        if text:
+            self.render_text()
+        else:
+            self.dirty = True
+    return property(get, set, doc=doc)
+
+
 class Button:
-    """A fairly straight forward button class."""
+    """A fairly straight forward button class.
+
+    The colors, font, border and sounds of a button live in a Style shared by every button with the same look, the
+    button itself only stores its text, images, geometry and state.
+    """
+    __slots__ = ("master", "style", "text", "image", "pressed_image", "disabled_image", "text_surface",
+                 "hover_text", "clicked_text", "text_inflated", "call_on_release", "function", "kwargs",
+                 "value_from_function", "text_position", "image_position", "width", "height", "wraplength", "rect",
+                 "rect_original", "rect_inflated", "dirty", "clicked", "hovered", "_state_disabled", "dispatcher",
+                 "async_command", "on_result", "on_error", "future", "geometry", "_requested_size", "_state_surfaces",
+                 "_state_signature", "_scale", "_unscaled", "_scaled_states", "_shown_state", "_transition", "_origin",
+                 "__weakref__")
+
     def __init__(self, master, position, bg=(255, 255, 255), command=None, text=None,
-                 font=pygame.font.Font(None, 36), call_on_release=True,
+                 font=None, call_on_release=True,
                  highlight_color=None, active_background=None, fg=(0, 0, 0), hover_font_color=None,
                  active_foreground=None, click_sound=None, hover_sound=None, image=None, text_position=None,
                  image_position=None, border_radius=0, border_color=None, image_align="bottom", fill_bg=True,
                  bd: int = 7, state: bool | str = True, disabled_image=None, disabled_color=None,
                  disabled_border_color=None, alpha=255, justify_text: str = "center", width=0, height=0,
-                 underline=False, bold=False, italic=False, wraplength=-1, **kwargs):
+                 underline=False, bold=False, italic=False, wraplength=-1, style: Style = None, async_command=False,
+                 on_result=None, on_error=None, transition_ms=0, **kwargs):
         """
         :param master: surface
         :param position: x and y position
         :param bg: background color
         :param command: function bound with the button
         :param text: text inside the button
-        :param font: font type
+        :param font: font type, defaults to the shared 36px default font. A (path, size) pair is loaded through
+                     get_font, so the text is rasterized again at the scaled size when the UI is scaled
         :param call_on_release: should the function start when you release the button
         :param highlight_color: color of the button when mouse hovers over it
         :param active_background: the color of the button when it is clicked
@@ -57,7 +121,7 @@ class Button:
         :param fill_bg: The background color
         :param bd: the border width
         :param state: If the state is "disabled" or False
-        :param disabled_image:
+        :param disabled_image: image shown while the button is disabled, True greys out image
         :param disabled_color:
         :param disabled_border_color:
         :param alpha:
@@ -67,66 +131,91 @@ class Button:
         :param underline:
         :param bold:
         :param italic:
+        :param wraplength: the width the text is wrapped at, defaults to width, the text is not wrapped if neither
+                           is given
+        :param style: a shared Style, when given it replaces bg, font, the colors, sounds, border, alpha,
+                      justify_text and image_align
+        :param async_command: run the command on a thread pool instead of waiting for it, coroutine functions always
+                              run on the event loop of commands.runner. The button is busy and disabled until the
+                              result was delivered by commands.runner.process()
+        :param on_result: called with the command's result once an asynchronous command finished
+        :param on_error: called with the exception an asynchronous command raised, without it the exception is raised
+                         by commands.runner.process()
+        :param transition_ms: how long the button takes to fade and shrink into a new state, 0 switches at once
         :param kwargs:
         """
         self.master = master
+        # Buttons built with the same look share one style, shared fonts are swapped for their styled variant
+        # instead of being changed in place
+        if style is None:
+            style = Style.shared(bg=bg, highlight_color=highlight_color, active_background=active_background, fg=fg,
+                                 hover_font_color=hover_font_color, active_foreground=active_foreground,
+                                 font=with_style(font_from(font), bold, italic, underline),
+                                 click_sound=click_sound, hover_sound=hover_sound, border_radius=border_radius,
+                                 border_color=border_color, bd=bd, fill_bg=fill_bg, disabled_color=disabled_color,
+                                 disabled_border_color=disabled_border_color, alpha=alpha, justify=justify_text,
+                                 image_align=image_align, transition_ms=transition_ms)
+        elif style.font is None or isinstance(style.font, tuple) or bold or italic or underline:
+            style = style.replace(font=with_style(font_from(style.font), bold, italic, underline))
+        self.style = style
+        # Images with the same content are shared between buttons, as are their scaled and faded variants
+        image = _map_images(image, image_cache.shared)
+        if disabled_image is True:
+            disabled_image = _map_images(image, image_cache.disabled)
+        else:
+            disabled_image = _map_images(disabled_image, image_cache.shared)
         self.image: pygame.Surface = image
-        self.alpha = alpha
+        self.pressed_image = _pressed_images(image) if image else image
+        self.disabled_image = disabled_image
         self.text: str = text
         self.text_surface: pygame.Surface = None
-        self.font = font
+        self.hover_text = None
+        self.clicked_text = None
+        self.text_inflated = None
         self.call_on_release = call_on_release
-        self.hover_color = highlight_color
-        self.clicked_color = active_background
-        self.font_color = fg
-        self.hover_font_color = hover_font_color
-        self.clicked_font_color = active_foreground
-        self.click_sound = click_sound
-        self.hover_sound = hover_sound
-        self.image_original = image
+        self.function = command
+        self.kwargs = kwargs or None
+        self.value_from_function = None
+        self.async_command = async_command
+        self.on_result = on_result
+        self.on_error = on_error
+        # The future of the asynchronous command running, None while the button is not busy
+        self.future = None
         self.text_position = text_position
         self.image_position = image_position
-        self.border_radius = border_radius
-        self.border_color = border_color
-        self.border_color_copy = border_color
-        self.image_align = image_align
-        self.image_copy = self.image_original
-        self.fill_bg = fill_bg
-        self.border_thickness = bd
         self.width = width
         self.height = height
+        self.wraplength = wraplength
+        self.dirty = True
+        self.clicked = False
+        self.hovered = False
         if isinstance(state, bool):
             self.state_disabled = not state
         else:
             self.state_disabled = True if state == "disabled" else False
-        self.disabled_image = disabled_image
-        self.disabled_color = disabled_color
-        self.disabled_border_color = disabled_border_color
-        self.justify = justify_text
-        self.kwargs = kwargs
-        self.value_from_function = None
-        if underline:
-            font.set_underline(True)
-        if bold:
-            font.set_bold(True)
-        if italic:
-            font.set_italic(True)
-        if self.image_original:
-            if not isinstance(self.image_original, list):
-                self.image_copy = pygame.transform.scale(
-                    self.image_original,
-                    (0.87 * self.image_original.get_width(), 0.76 * self.image_original.get_height()))
-            else:
-                self.image_copy = [pygame.transform.scale(
-                    image, (0.87 * image.get_width(), 0.76 * image.get_height()))
-                    for image in self.image_original]
+        # Set by an EventDispatcher the button is registered with, it then feeds the hover state
+        self.dispatcher = None
+        # Set by the geometry manager the button is arranged by
+        self.geometry = None
+        # Finished surfaces for the "normal", "hovered", "clicked" and "disabled" states, built lazily by draw()
+        self._state_surfaces = {}
+        self._state_signature = None
+        # The state painted by the last draw, and the transition away from it while one is running
+        self._shown_state = None
+        self._transition = None
+        # What apply_scale derives the scaled look from, and the surfaces of the other scales used, both are only
+        # kept once the button was scaled
+        self._scale = 1
+        self._unscaled = None
+        self._scaled_states = None
+        self._origin = None
         self.render_text()
         if width and height:
             self.rect_original = pygame.Rect(position[0], position[1], width, height)
         elif self.image and not self.text:
-            if isinstance(self.image_original, list):
-                max_width = width or max(self.image_original, key=lambda img: img.get_width())
-                max_height = height or max(self.image_original, key=lambda img: img.get_height())
+            if isinstance(self.image, list):
+                max_width = width or max(img.get_width() for img in self.image)
+                max_height = height or max(img.get_height() for img in self.image)
             else:
                 max_width = width or self.image.get_width()
                 max_height = height or self.image.get_height()
@@ -142,19 +231,72 @@ class Button:
         else:
             self.rect_original = pygame.Rect(position[0], position[1], width or 100, height or 50)
 
-        self.rect = self.rect_original.copy()
+        self._requested_size = self.rect_original.size
+        self.rect = self.rect_original
         self.rect_inflated = self.rect_original.inflate(-0.13 * self.rect_original.w,
                                                         -0.24 * self.rect_original.h)
-        self.text_original = self.text_surface.copy()
-        self.text_inflated = pygame.transform.scale(self.text_original, ((1-0.13)*self.text_original.get_width(),
-                                                                         (1-0.24)*self.text_original.get_height()))
-        self.color = bg
-        self.color_copy = bg
-        self.function = command
-        self.clicked = False
-        self.hovered = False
-        self.hover_text = None
-        self.clicked_text = None
+        track(self)
+
+    color = _style_property("bg", "The background color.")
+    hover_color = _style_property("highlight_color", "The background color while the mouse is over the button.")
+    clicked_color = _style_property("active_background", "The background color while the button is pressed.")
+    font_color = _style_property("fg", "The text color.", text=True)
+    hover_font_color = _style_property("hover_font_color", "The text color while the mouse is over the button.",
+                                       text=True)
+    clicked_font_color = _style_property("active_foreground", "The text color while the button is pressed.",
+                                         text=True)
+    click_sound = _style_property("click_sound", "The sound played when the button is clicked.")
+    hover_sound = _style_property("hover_sound", "The sound played when the mouse enters the button.")
+    border_color = _style_property("border_color", "The color of the border.")
+    fill_bg = _style_property("fill_bg", "Paint a black frame around the background when there is no border radius.")
+    disabled_color = _style_property("disabled_color", "The background color while the button is disabled.")
+    disabled_border_color = _style_property("disabled_border_color", "The border color while the button is disabled.")
+    alpha = _style_property("alpha", "The opacity of the button, 255 is opaque.")
+    justify = _style_property("justify", "The alignment of the text, \"left\", \"center\" or \"right\".",
+                              text=True)
+    image_align = _style_property("image_align", "Whether the image is above (\"top\") or below the text.")
+    transition_ms = _style_property("transition_ms", "How long a change of the visual state is animated for.")
+
+    @property
+    def font(self):
+        """The font at the current UI scale, setting it sets the unscaled font of the style."""
+        return scaled_font(self.style.font, self._scale)
+
+    @font.setter
+    def font(self, value):
+        self.style = self.style.replace(font=font_from(value))
+        self.render_text()
+
+    @property
+    def border_radius(self):
+        return scaled(self.style.border_radius, self._scale)
+
+    @border_radius.setter
+    def border_radius(self, value):
+        self.style = self.style.replace(border_radius=value)
+        self.dirty = True
+
+    @property
+    def border_thickness(self):
+        return scaled(self.style.bd, self._scale)
+
+    @border_thickness.setter
+    def border_thickness(self, value):
+        self.style = self.style.replace(bd=value)
+        self.dirty = True
+
+    @property
+    def state_disabled(self):
+        return self._state_disabled
+
+    @state_disabled.setter
+    def state_disabled(self, value):
+        self._state_disabled = value
+        self.dirty = True
+
+    def get_bounds(self):
+        """Return the rect covering everything the button paints."""
+        return self.rect_original.copy()
 
     def move(self, x_add=0, y_add=0):
         """
@@ -166,65 +308,105 @@ class Button:
         self.rect_inflated.x += x_add
         self.rect_original.y += y_add
         self.rect_inflated.y += y_add
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def get_requested_size(self):
+        """Return the size the button was created with, geometry managers give it at least this much room."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the button, this is how geometry managers arrange it. The text is wrapped again to the new
+        width
+        :param rect: the new rect of the button
+        """
+        rect = pygame.Rect(rect)
+        resized = rect.size != self.rect_original.size
+        self.rect_original = rect
+        self.rect_inflated = rect.inflate(-0.13 * rect.w, -0.24 * rect.h)
+        self.rect = self.rect_inflated if self.clicked else self.rect_original
+        if resized:
+            self.width, self.height = rect.size
+            self.render_text()
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def apply_scale(self, scale):
+        """
+        Resize the button and rasterize its text again at a UI scale factor, scaling.set_scale calls this. The
+        composited state surfaces of the scales used before are kept, so switching back to one reuses them
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        if self._scale == 1:
+            self._unscaled = (self.image, self.disabled_image, self.text_position, self.image_position,
+                              self.wraplength, self.width, self.height, self._requested_size)
+            if self._scaled_states is None:
+                self._scaled_states = {}
+        image, disabled_image, text_position, image_position, wraplength, width, height, size = self._unscaled
+        position, self._origin = rescaled_position(self.rect_original.topleft, self._scale, scale, self._origin)
+        self._scaled_states[self._scale] = (self.text, self.wraplength, self.width, self.height, self.style,
+                                            self.text_surface, self.hover_text, self.clicked_text,
+                                            self.text_inflated, self._state_signature, self._state_surfaces)
+        self._state_surfaces = {}
+        self._scale = scale
+
+        self.image = scaled_image(image, scale)
+        self.pressed_image = _pressed_images(self.image) if self.image else self.image
+        self.disabled_image = scaled_image(disabled_image, scale)
+        self.text_position = _scale_position(text_position, scale)
+        self.image_position = _scale_position(image_position, scale)
+        self.wraplength = scaled(wraplength, scale)
+        self.width, self.height = scaled(width, scale), scaled(height, scale)
+        self._requested_size = (scaled(size[0], scale), scaled(size[1], scale))
+        cached = self._scaled_states.pop(scale, None)
+        if cached is not None and cached[:5] == (self.text, self.wraplength, self.width, self.height, self.style):
+            # The text rendered at this scale before is still current
+            (self.text_surface, self.hover_text, self.clicked_text, self.text_inflated, self._state_signature,
+             self._state_surfaces) = cached[5:]
+            self.dirty = True
+        else:
+            self.render_text()
+
+        self.rect_original = pygame.Rect(position, self._requested_size)
+        self.rect_inflated = self.rect_original.inflate(-0.13 * self.rect_original.w, -0.24 * self.rect_original.h)
+        self.rect = self.rect_inflated if self.clicked else self.rect_original
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+        if self.geometry is not None:
+            self.geometry.invalidate(self)
 
     def render_text(self):
         """Pre-render the button text.
-        If for some reason you change the text, you must call the render_text method."""
+        If for some reason you change the text, you must call the render_text method, this also drops the cached
+        state surfaces."""
         if self.text:
+            style = self.style
+            # The line breaks are computed once and shared by every color
+            layout = self.get_text_layout(self.font, self.text, self.width, self.height, self.wraplength,
+                                          style.justify)
             # Handle hover text color rendering
-            if self.hover_font_color:
-                color = self.hover_font_color
-                self.hover_text = self._wrap_text(self.text, color)
+            self.hover_text = layout.render(style.hover_font_color) if style.hover_font_color else None
 
             # Handle clicked text color rendering
-            if self.clicked_font_color:
-                color = self.clicked_font_color
-                self.clicked_text = self._wrap_text(self.text, color)
+            self.clicked_text = layout.render(style.active_foreground) if style.active_foreground else None
 
             # Handle normal text color rendering
-            self.text_surface: pygame.Surface = self._wrap_text(self.text, self.font_color)
-
-    def _wrap_text(self, text, color):
-        """Helper method to wrap text based on self.width and render it."""
-        words = text.split(' ')
-        lines = []
-        current_line = ''
-        space_width, _ = self.font.size(' ')
-
-        for word in words:
-            word_width, word_height = self.font.size(word)
-            line_width, _ = self.font.size(current_line + word)
-
-            # Check if adding the word exceeds the width
-            if line_width <= self.width:
-                current_line += word + ' '
-            else:
-                # Add current line to lines and start a new line
-                lines.append(current_line.strip())
-                current_line = word + ' '
-
-        # Add the last line
-        lines.append(current_line.strip())
-
-        # Render each line
-        surfaces = []
-        y_offset = 0
-        for line in lines:
-            line_surface = self.font.render(line, True, color)
-            surfaces.append((line_surface, y_offset))
-            y_offset += word_height
-
-            # Ensure it does not exceed the height
-            if y_offset + word_height > self.height:
-                break
-
-        # Combine all lines into a single surface with height adjustment
-        text_surface = pygame.Surface((self.width, min(y_offset, self.height)), pygame.SRCALPHA)
-        for line_surface, y in surfaces:
-            text_surface.blit(line_surface, (0, y))
+            self.text_surface: pygame.Surface = layout.render(style.fg)
+            self.text_inflated = layout.render_scaled(style.fg, PRESSED_SCALE)
+        self._state_surfaces.clear()
+        self.dirty = True
 
-        return text_surface
+    @staticmethod
+    def get_text_layout(font, text, width=0, height=0, wraplength=-1, justify="center"):
+        """Return the shared TextLayout a button with these arguments renders its text with."""
+        return get_layout(font, text, wraplength if wraplength > 0 else width, height, justify)
 
+    @profiled("event")
     def check_event(self, event):
         """
         This is the method that checks if the player is pressing a button. It should be called inside the for loop
@@ -236,114 +418,234 @@ class Button:
         """
         if not self.state_disabled:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if self.rect.collidepoint(event.pos):
+                # A busy button ignores presses, but the release of the press that started its command still counts
+                if self.future is None and self.rect.collidepoint(event.pos):
                     self.clicked = True
+                    self.dirty = True
                     if not self.call_on_release and self.function:
-                        if self.kwargs:
-                            self.value_from_function = self.function(self.kwargs)
-                        else:
-                            self.value_from_function = self.function()
+                        self._run_command()
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
                 if self.function and self.clicked and self.call_on_release:
-                    if self.kwargs:
-                        self.value_from_function = self.function(self.kwargs)
-                    else:
-                        self.value_from_function = self.function()
+                    self._run_command()
+                if self.clicked:
+                    self.dirty = True
                 self.clicked = False
 
+    def _run_command(self):
+        args = (self.kwargs,) if self.kwargs else ()
+        if self.async_command or inspect.iscoroutinefunction(self.function):
+            self.future = runner.submit(self.function, *args, callback=self._command_done)
+            self.hovered = False
+            self.dirty = True
+        else:
+            self.value_from_function = profiler.call(self, self.function, *args)
+
+    def _command_done(self, future):
+        # Called by commands.runner.process() on the UI thread
+        self.future = None
+        self.dirty = True
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if self.on_error is None:
+                raise error
+            profiler.call(self, self.on_error, error)
+            return
+        self.value_from_function = future.result()
+        if self.on_result is not None:
+            profiler.call(self, self.on_result, self.value_from_function)
+
+    @property
+    def busy(self):
+        """Whether an asynchronous command of the button is still running."""
+        return self.future is not None
+
+    def check_hover(self):
+        """Update the hover state from the mouse position, marking the button dirty when it changes. Buttons
+        registered with an EventDispatcher are told about hovering instead and do not poll the mouse."""
+        if self._transition is not None:
+            self.dirty = True
+        if self.dispatcher is not None:
+            return
+        if self.rect_original.collidepoint(pygame.mouse.get_pos()):
+            self.on_enter()
+        else:
+            self.on_leave()
+
+    def on_enter(self):
+        """Called when the mouse moves over the button."""
+        if self.state_disabled or self.future is not None:
+            self.on_leave()
+        elif not self.hovered:
+            self.hovered = True
+            self.dirty = True
+            if self.hover_sound:
+                self.hover_sound.play()
+
+    def on_leave(self):
+        """Called when the mouse leaves the button."""
+        if self.hovered:
+            self.hovered = False
+            self.dirty = True
+
     def update(self):
         """Update needs to be called every frame in the main loop."""
-        color = self.color
-        self.image = self.image_original
-        self.rect = self.rect_original
-        self.color = self.color_copy
-        self.border_color = self.border_color_copy
-        self.text_surface = self.text_original
-
-        # The next block of code checks mouse hovering, I wanted to create a method for this but then the user
-        # of this library would be disturbed with an unnecessary method
-        if self.rect.collidepoint(pygame.mouse.get_pos()) and not self.state_disabled:
-            if not self.hovered:
-                self.hovered = True
-                if self.hover_sound:
-                    self.hover_sound.play()
+        self.check_hover()
+        self.draw()
+
+    @profiled("render")
+    def draw(self, surface=None):
+        """
+        Paint the button in its current state without polling the mouse
+        :param surface: the surface to draw on, defaults to master
+        """
+        master = self.master if surface is None else surface
+        self.rect = self.rect_inflated if self.clicked else self.rect_original
+        signature = self._style_signature()
+        if signature != self._state_signature:
+            self._state_surfaces.clear()
+            self._state_signature = signature
+
+        state = self.get_visual_state()
+        if state != self._shown_state:
+            duration = self.style.transition_ms / 1000
+            if self._shown_state is None or duration <= 0:
+                self._transition = None
+            elif self._transition is None:
+                self._transition = Transition(self._shown_state, state, duration)
+            else:
+                self._transition = self._transition.retarget(state, duration)
+            if self._transition is not None:
+                animator.start(self)
+            self._shown_state = state
+        transition = self._transition
+        if transition is not None and transition.progress() >= 1:
+            transition = self._transition = None
+        if transition is None:
+            master.blit(self._state_surface(state), self.rect)
         else:
-            self.hovered = False
-        if self.state_disabled and self.disabled_image:
-            self.image = self.disabled_image
-        if self.state_disabled and self.disabled_color:
-            self.color = self.disabled_color
-        if self.state_disabled and self.disabled_border_color:
-            self.border_color = self.disabled_border_color
+            start, end = transition.start_state, transition.end_state
+            # Buttons with the same signature draw the same state surfaces and share the keyframes between them
+            frames = keyframe_cache.get((signature, start, end), lambda: self._state_surface(start),
+                                        lambda: self._state_surface(end))
+            frame = transition.frame(frames)
+            master.blit(frame, frame.get_rect(center=self.rect_original.center))
+        self.dirty = False
+
+    @property
+    def animating(self):
+        """Whether the button is in the middle of a transition between two states."""
+        return self._transition is not None
+
+    def _state_surface(self, state):
+        # The finished surface of a state, built once per style signature
+        state_surface = self._state_surfaces.get(state)
+        if state_surface is None:
+            state_surface = self._state_surfaces[state] = self._build_state_surface(state)
+        return state_surface
 
+    def get_visual_state(self):
+        """Return which of "normal", "hovered", "clicked" or "disabled" the button should be painted as, a busy button
+        looks disabled."""
+        if self.state_disabled or self.future is not None:
+            return "disabled"
         if self.clicked:
-            if self.clicked_color:
-                color = self.clicked_color
-                if self.clicked_font_color:
-                    self.text_surface = self.clicked_text
-            self.image = self.image_copy
-            self.rect = self.rect_inflated
-            self.text_surface = self.text_inflated
-        elif self.hovered and self.hover_color:
-            color = self.hover_color
-            if self.hover_font_color:
-                self.text_surface = self.hover_text
-
-        if self.image and not isinstance(self.image, list):
-            self.image.set_alpha(self.alpha)
-        elif isinstance(self.image, list):
-            for img in self.image:
-                img.set_alpha(self.alpha)
-        if self.text_surface:
-            self.text_surface.set_alpha(self.alpha)
-        if self.border_radius and self.border_color and not self.clicked:
-            draw_bordered_rounded_rect(self.master, self.rect, color, self.border_color, self.border_radius,
-                                       self.border_thickness)
-        elif self.border_radius:
-            pygame.draw.rect(self.master, color, self.rect, border_radius=self.border_radius)
-        elif self.fill_bg:
-            self.master.fill(pygame.Color("black"), self.rect)
-            pygame.draw.rect(self.master, self.color, self.rect.inflate(-4, -4))
-
-        if self.text and not self.text_position and not self.image:
-            if self.justify == "left":
-                text_rect = self.text_surface.get_rect(midleft=(self.rect.midleft[0] + 3, self.rect.midleft[1]))
-            elif self.justify == "right":
-                text_rect = self.text_surface.get_rect(midright=(self.rect.midright[0] - 3, self.rect.midright[1]))
+            return "clicked"
+        if self.hovered:
+            return "hovered"
+        return "normal"
+
+    def _style_signature(self):
+        # Everything a state surface depends on, a change in any of these drops the cached surfaces
+        return (self.style, self._scale, self.text, self.text_surface, self.hover_text, self.clicked_text,
+                self.image, self.pressed_image, self.disabled_image, self.rect_original.size, self.rect_inflated.size,
+                self.text_position, self.image_position)
+
+    def _build_state_surface(self, state):
+        """Composite the background, border, text and image of one visual state into a single surface."""
+        style = self.style
+        clicked = state == "clicked"
+        image = self.image
+        base_color = style.bg
+        border_color = style.border_color
+        text_surface = self.text_surface
+        border_radius = self.border_radius
+        rect = self.rect_inflated if clicked else self.rect_original
+        surface = pygame.Surface(rect.size, pygame.SRCALPHA)
+        rect = surface.get_rect()
+
+        if state == "disabled" and self.disabled_image:
+            image = self.disabled_image
+        if state == "disabled" and style.disabled_color:
+            base_color = style.disabled_color
+        if state == "disabled" and style.disabled_border_color:
+            border_color = style.disabled_border_color
+        color = base_color
+
+        if clicked:
+            if style.active_background:
+                color = style.active_background
+                if style.active_foreground:
+                    text_surface = self.clicked_text
+            image = self.pressed_image
+            text_surface = self.text_inflated
+        elif state == "hovered" and style.highlight_color:
+            color = style.highlight_color
+            if style.hover_font_color:
+                text_surface = self.hover_text
+
+        # The images and text surfaces are shared, so faded copies are used instead of changing them
+        image = _map_images(image, lambda img: image_cache.with_alpha(img, style.alpha))
+        if text_surface and style.alpha < 255:
+            text_surface = text_surface.copy()
+            text_surface.set_alpha(style.alpha)
+        if border_radius and border_color and not clicked:
+            draw_bordered_rounded_rect(surface, rect, color, border_color, border_radius, self.border_thickness)
+        elif border_radius:
+            pygame.draw.rect(surface, color, rect, border_radius=border_radius)
+        elif style.fill_bg:
+            surface.fill(pygame.Color("black"), rect)
+            pygame.draw.rect(surface, base_color, rect.inflate(-4, -4))
+
+        if self.text and not self.text_position and not image:
+            if style.justify == "left":
+                text_rect = text_surface.get_rect(midleft=(rect.midleft[0] + 3, rect.midleft[1]))
+            elif style.justify == "right":
+                text_rect = text_surface.get_rect(midright=(rect.midright[0] - 3, rect.midright[1]))
             else:
-                text_rect = self.text_surface.get_rect(center=self.rect.center)
-            self.master.blit(self.text_surface, text_rect)
+                text_rect = text_surface.get_rect(center=rect.center)
+            surface.blit(text_surface, text_rect)
         elif self.text and self.text_position:
-            self.master.blit(self.text_surface, (self.rect.x + self.text_position[0], self.rect.y + self.text_position[1]))
+            surface.blit(text_surface, (rect.x + self.text_position[0], rect.y + self.text_position[1]))
 
-        if self.image and self.image_position:
-            if not isinstance(self.image, list):
-                self.master.blit(self.image,
-                                 (self.rect.x + self.image_position[0], self.rect.y + self.image_position[1]))
+        if image and self.image_position:
+            if not isinstance(image, list):
+                surface.blit(image, (rect.x + self.image_position[0], rect.y + self.image_position[1]))
             else:
-                for index, image in enumerate(self.image):
-                    self.master.blit(image, (
-                        self.rect.x + self.image_position[index][0], self.rect.y + self.image_position[index][1]))
-        elif self.image and not self.text:
-            image_rect = self.image.get_rect(center=self.rect.center)
-            self.master.blit(self.image, image_rect)
-        elif self.image and self.image_align == "bottom" and self.text:
-            image_rect = self.image.get_rect()
-            image_rect.centerx = self.rect.centerx
-            image_rect.bottom = self.rect.bottom - (
-                    self.rect.height - self.image.get_height() - self.text_surface.get_height() - 5) / 2
-            text_rect = self.text_surface.get_rect()
-            text_rect.centerx = self.rect.centerx
-            text_rect.top = self.rect.y + (self.rect.height - self.image.get_height() - self.text_surface.get_height() - 5) / 2
-            self.master.blit(self.image, image_rect)
-            self.master.blit(self.text_surface, text_rect)
-        elif self.image and self.image_align == "top" and self.text:
-            image_rect = self.image.get_rect()
-            image_rect.centerx = self.rect.centerx
-            text_rect = self.text_surface.get_rect()
-            text_rect.centerx = self.rect.centerx
-            image_rect.top = self.rect.y + (self.rect.height - self.image.get_height() - self.text_surface.get_height()) / 2
-            text_rect.bottom = self.rect.y + self.rect.height - (
-                    self.rect.height - self.image.get_height() - self.text_surface.get_height()) / 2
-            self.master.blit(self.image, image_rect)
-            self.master.blit(self.text_surface, text_rect)
+                for index, img in enumerate(image):
+                    surface.blit(img, (rect.x + self.image_position[index][0], rect.y + self.image_position[index][1]))
+        elif image and not self.text:
+            image_rect = image.get_rect(center=rect.center)
+            surface.blit(image, image_rect)
+        elif image and style.image_align == "bottom" and self.text:
+            image_rect = image.get_rect()
+            image_rect.centerx = rect.centerx
+            image_rect.bottom = rect.bottom - (
+                    rect.height - image.get_height() - text_surface.get_height() - 5) / 2
+            text_rect = text_surface.get_rect()
+            text_rect.centerx = rect.centerx
+            text_rect.top = rect.y + (rect.height - image.get_height() - text_surface.get_height() - 5) / 2
+            surface.blit(image, image_rect)
+            surface.blit(text_surface, text_rect)
+        elif image and style.image_align == "top" and self.text:
+            image_rect = image.get_rect()
+            image_rect.centerx = rect.centerx
+            text_rect = text_surface.get_rect()
+            text_rect.centerx = rect.centerx
+            image_rect.top = rect.y + (rect.height - image.get_height() - text_surface.get_height()) / 2
+            text_rect.bottom = rect.y + rect.height - (
+                    rect.height - image.get_height() - text_surface.get_height()) / 2
+            surface.blit(image, image_rect)
+            surface.blit(text_surface, text_rect)
+        return surface
@@ -0,0 +1,360 @@
+import pygame
+
+from profiler import profiled
+from scaling import rescaled_position, scaled, track
+
+try:
+    import numpy as np
+    import pygame.surfarray
+except ImportError:
+    np = None
+
+ALL = "all"
+# Below this many rectangles they are filled one by one, above it all at once: pixel by pixel while they cover a
+# small part of the layer, else in one pass over the whole layer
+_FILL_BATCH = 64
+
+
+def _pixel_values(surface, color):
+    """Map a color, or an array of colors, to the pixel values of a 32 bit surface."""
+    color = np.asarray(color)
+    if color.ndim == 1:
+        return np.uint32(surface.map_rgb(color.tolist()) & 0xFFFFFFFF)
+    color = color.astype(np.uint32)
+    red, green, blue, alpha = surface.get_shifts()
+    values = (color[:, 0] << red) | (color[:, 1] << green) | (color[:, 2] << blue)
+    if color.shape[1] > 3:
+        return values | (color[:, 3] << alpha)
+    return values | np.uint32(0xFF << alpha)
+
+
+def _clip_segments(segments, width, height):
+    """Clip line segments to the area 0 <= x < width, 0 <= y < height (Liang-Barsky) and drop the ones outside.
+    Return the clipped segments and the mask of the segments kept."""
+    x0, y0, x1, y1 = segments.T
+    outside = ((np.minimum(x0, x1) < 0) | (np.maximum(x0, x1) > width - 1) |
+               (np.minimum(y0, y1) < 0) | (np.maximum(y0, y1) > height - 1))
+    if not outside.any():
+        return segments, ~outside
+    keep = ~outside
+    clipped = segments[outside]
+    x0, y0, x1, y1 = clipped.T
+    dx, dy = x1 - x0, y1 - y0
+    start = np.zeros(len(clipped))
+    end = np.ones(len(clipped))
+    inside = np.ones(len(clipped), bool)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0), (dx, width - 1 - x0), (-dy, y0), (dy, height - 1 - y0)):
+            inside &= (p != 0) | (q >= 0)
+            t = q / p
+            start = np.where(p < 0, np.maximum(start, t), start)
+            end = np.where(p > 0, np.minimum(end, t), end)
+    inside &= start <= end
+    clipped = np.stack((x0 + start * dx, y0 + start * dy, x0 + end * dx, y0 + end * dy), axis=1)
+    segments = segments.copy()
+    segments[outside] = clipped
+    keep[outside] = inside
+    return segments[keep], keep
+
+
+def _segment_pixels(segments, width, height):
+    """Return the x and y of every pixel on the segments, sampled once per pixel along the longer axis, and the
+    index of the segment each pixel belongs to."""
+    segments, keep = _clip_segments(segments, width, height)
+    x0, y0, x1, y1 = segments.T
+    steps = np.maximum(np.abs(x1 - x0), np.abs(y1 - y0)).astype(np.intp) + 1
+    owner = np.repeat(np.flatnonzero(keep), steps)
+    # The number of every sample along its segment, and how far the samples are apart
+    number = np.arange(len(owner)) - np.repeat(np.cumsum(steps) - steps, steps)
+    spacing = 1 / np.maximum(steps - 1, 1)
+    xs = np.rint(np.repeat(x0, steps) + number * np.repeat((x1 - x0) * spacing, steps)).astype(np.intp)
+    ys = np.rint(np.repeat(y0, steps) + number * np.repeat((y1 - y0) * spacing, steps)).astype(np.intp)
+    return xs, ys, owner
+
+
+def _rect_pixels(rects):
+    """Return the x and y of every pixel covered by the rects, given as x0, y0, x1, y1 rows."""
+    x0, y0, x1, y1 = rects.T
+    widths = x1 - x0
+    areas = widths * (y1 - y0)
+    owner = np.repeat(np.arange(len(rects)), areas)
+    offset = np.arange(len(owner)) - (np.cumsum(areas) - areas)[owner]
+    widths = widths[owner]
+    return x0[owner] + offset % widths, y0[owner] + offset // widths
+
+
+def _fill_mask(rects, width, height):
+    """Return a width x height mask of the pixels covered by any of the rects, given as x0, y0, x1, y1 rows, built
+    from the running sum of their corners so the cost does not depend on the size or number of rects."""
+    size = (width + 1) * (height + 1)
+    x0, y0, x1, y1 = rects.T
+    corners = (np.bincount(x0 * (height + 1) + y0, minlength=size) - np.bincount(x1 * (height + 1) + y0, minlength=size)
+               - np.bincount(x0 * (height + 1) + y1, minlength=size) + np.bincount(x1 * (height + 1) + y1, minlength=size))
+    coverage = corners.astype(np.int32).reshape(width + 1, height + 1)
+    # Summing row by row is several times faster than cumsum across the rows
+    for x in range(1, width):
+        coverage[x] += coverage[x - 1]
+    return coverage[:width, :height].cumsum(1, dtype=np.int32) > 0
+
+
+class Canvas:
+    """A surface for drawing large numbers of points, lines and rectangles given as NumPy arrays, like a Tkinter
+    Canvas for plots.
+
+    Every item is drawn with a handful of vectorized NumPy operations straight into the pixels of its layer, no
+    matter how many points it holds. Layers are drawn in the order they were first used and are only drawn again
+    when one of their items changed, so a static grid in one layer costs nothing while a plot in another one is
+    updated every frame. Needs numpy:
+
+    canvas = Canvas(screen, (0, 0, 800, 400))
+    canvas.create_rectangles([(0, 0, 800, 1)], color=(60, 60, 60), layer="grid")
+    plot = canvas.create_line(np.column_stack((x, y)), color=(0, 255, 0), layer="data")
+    ...
+    canvas.coords(plot, np.column_stack((x, new_y)))
+    canvas.draw()
+
+    Items of a layer overwrite each other's pixels, colors with alpha only blend with the layers below.
+    """
+    __slots__ = ("master", "rect", "background", "surface", "dirty", "dispatcher", "geometry", "_items", "_layers",
+                 "_layer_surfaces", "_dirty_layers", "_base", "_base_layers", "_next_id", "_scale", "_requested_size",
+                 "_unscaled_size", "_origin", "__weakref__")
+
+    def __init__(self, master, rect, background=(0, 0, 0)):
+        """
+        :param master: the surface the canvas is drawn on
+        :param rect: the area the canvas covers
+        :param background: a color or a surface painted behind the layers
+        """
+        if np is None:
+            raise ImportError("Canvas needs numpy, install it with pip install numpy")
+        self.master = master
+        self.rect = pygame.Rect(rect)
+        self.background = background
+        # The layers composited over the background, only rebuilt when a layer changed
+        self.surface = pygame.Surface(self.rect.size)
+        self.dirty = True
+        # Set by an EventDispatcher the canvas is registered with
+        self.dispatcher = None
+        # Set by the geometry manager the canvas is arranged by
+        self.geometry = None
+        # [kind, layer, data, color, size] of every item by id
+        self._items = {}
+        # The ids of the items of every layer in drawing order, the layers in the order they were first used
+        self._layers = {}
+        self._layer_surfaces = {}
+        self._dirty_layers = set()
+        # The background with the layers below the ones that keep changing, so they are not blended every frame
+        self._base = None
+        self._base_layers = None
+        self._next_id = 1
+        self._scale = 1
+        self._requested_size = self._unscaled_size = self.rect.size
+        self._origin = None
+        track(self)
+
+    def _create(self, kind, data, color, size, layer):
+        item = self._next_id
+        self._next_id += 1
+        self._items[item] = [kind, layer, data, color, size]
+        self._layers.setdefault(layer, []).append(item)
+        self._changed(layer)
+        return item
+
+    def _changed(self, layer):
+        self._dirty_layers.add(layer)
+        self.dirty = True
+
+    def create_points(self, xy, color=(255, 255, 255), size=1, layer="main"):
+        """
+        Add points, returning the id of the item
+        :param xy: an array of shape (n, 2) holding the x and y of every point
+        :param color: the color of every point, or an array of shape (n, 3) or (n, 4) with a color per point
+        :param size: the side of the square every point is drawn as
+        :param layer: the name of the layer the points are drawn in
+        """
+        return self._create("points", np.asarray(xy, float).reshape(-1, 2), color, size, layer)
+
+    def create_line(self, xy, color=(255, 255, 255), layer="main"):
+        """
+        Add a line through the points in xy, eg. a plot, returning the id of the item
+        :param xy: an array of shape (n, 2) holding the x and y of every point the line goes through
+        :param color: the color of the line
+        :param layer: the name of the layer the line is drawn in
+        """
+        return self._create("line", np.asarray(xy, float).reshape(-1, 2), color, 1, layer)
+
+    def create_lines(self, segments, color=(255, 255, 255), layer="main"):
+        """
+        Add separate line segments, returning the id of the item
+        :param segments: an array of shape (n, 4) holding x0, y0, x1, y1 of every segment
+        :param color: the color of every segment, or an array of shape (n, 3) or (n, 4) with a color per segment
+        :param layer: the name of the layer the segments are drawn in
+        """
+        return self._create("lines", np.asarray(segments, float).reshape(-1, 4), color, 1, layer)
+
+    def create_rectangles(self, rects, color=(255, 255, 255), width=0, layer="main"):
+        """
+        Add rectangles, returning the id of the item
+        :param rects: an array of shape (n, 4) holding x, y, width and height of every rectangle
+        :param color: the color of the rectangles
+        :param width: the width of the outline, 0 fills the rectangles
+        :param layer: the name of the layer the rectangles are drawn in
+        """
+        return self._create("rectangles", np.asarray(rects, float).reshape(-1, 4), color, width, layer)
+
+    def coords(self, item, data=None):
+        """Return the array of an item, or replace it with data of the same layout as the item was created with."""
+        entry = self._items[item]
+        if data is None:
+            return entry[2]
+        entry[2] = np.asarray(data, float).reshape(-1, entry[2].shape[1])
+        self._changed(entry[1])
+
+    def itemconfigure(self, item, color=None, size=None, width=None):
+        """Change the color of an item, the size of points or the outline width of rectangles."""
+        entry = self._items[item]
+        if color is not None:
+            entry[3] = color
+        if size is not None or width is not None:
+            entry[4] = size if size is not None else width
+        self._changed(entry[1])
+
+    def delete(self, *items):
+        """Remove the items with these ids, ALL removes every item."""
+        if ALL in items:
+            items = list(self._items)
+        for item in items:
+            entry = self._items.pop(item, None)
+            if entry is not None:
+                self._layers[entry[1]].remove(item)
+                self._changed(entry[1])
+
+    def get_bounds(self):
+        """Return the area the canvas covers."""
+        return self.rect.copy()
+
+    def get_requested_size(self):
+        """Return the size the canvas was created with."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the canvas, this is how geometry managers arrange it. The items keep their coordinates
+        :param rect: the new area the canvas covers
+        """
+        rect = pygame.Rect(rect)
+        if rect.size != self.rect.size:
+            self.surface = pygame.Surface(rect.size)
+            self._layer_surfaces.clear()
+            self._base = None
+            self._dirty_layers.update(self._layers)
+        self.rect = rect
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def apply_scale(self, scale):
+        """
+        Draw the items at a UI scale factor, scaling.set_scale calls this
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        position, self._origin = rescaled_position(self.rect.topleft, self._scale, scale, self._origin)
+        self._scale = scale
+        self._dirty_layers.update(self._layers)
+        self._requested_size = (scaled(self._unscaled_size[0], scale), scaled(self._unscaled_size[1], scale))
+        self.set_rect(position + self._requested_size)
+        if self.geometry is not None:
+            self.geometry.invalidate(self)
+
+    def _draw_item(self, pixels, surface, kind, data, color, size):
+        width, height = pixels.shape
+        data = data * self._scale if self._scale != 1 else data
+        if kind == "points":
+            xs = np.floor(data[:, 0]).astype(np.intp)
+            ys = np.floor(data[:, 1]).astype(np.intp)
+            values = _pixel_values(surface, color)
+            for dx in range(size):
+                for dy in range(size):
+                    x, y = xs + dx, ys + dy
+                    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+                    pixels[x[inside], y[inside]] = values if values.ndim == 0 else values[inside]
+        elif kind in ("line", "lines"):
+            segments = np.hstack((data[:-1], data[1:])) if kind == "line" else data
+            if not len(segments):
+                return
+            xs, ys, owner = _segment_pixels(segments, width, height)
+            values = _pixel_values(surface, color)
+            pixels[xs, ys] = values if values.ndim == 0 else values[owner]
+        else:
+            x0, y0 = data[:, 0], data[:, 1]
+            x1, y1 = x0 + data[:, 2], y0 + data[:, 3]
+            if size:
+                # An outline is four filled strips along the edges
+                size = size * self._scale
+                x0, y0, x1, y1 = (np.concatenate(parts) for parts in (
+                    (x0, x0, x0, x1 - size), (y0, y1 - size, y0, y0),
+                    (x1, x1, x0 + size, x1), (y0 + size, y1, y1, y1)))
+            rects = np.stack((np.clip(x0, 0, width), np.clip(y0, 0, height),
+                              np.clip(x1, 0, width), np.clip(y1, 0, height)), axis=1)
+            rects = np.rint(rects).astype(np.intp)
+            rects = rects[(rects[:, 0] < rects[:, 2]) & (rects[:, 1] < rects[:, 3])]
+            value = _pixel_values(surface, color)
+            if len(rects) < _FILL_BATCH:
+                for x0, y0, x1, y1 in rects:
+                    pixels[x0:x1, y0:y1] = value
+            elif ((rects[:, 2] - rects[:, 0]) * (rects[:, 3] - rects[:, 1])).sum() < width * height // 4:
+                pixels[_rect_pixels(rects)] = value
+            else:
+                pixels[_fill_mask(rects, width, height)] = value
+
+    def _draw_layer(self, layer):
+        surface = self._layer_surfaces.get(layer)
+        if surface is None:
+            surface = self._layer_surfaces[layer] = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        surface.fill((0, 0, 0, 0))
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            for item in self._layers[layer]:
+                kind, _, data, color, size = self._items[item]
+                if len(data):
+                    self._draw_item(pixels, surface, kind, data, color, size)
+        finally:
+            # The surface stays locked while the pixel array exists
+            del pixels
+
+    def _composite(self):
+        order = [layer for layer, items in self._layers.items() if items]
+        for layer in self._dirty_layers:
+            if layer in order:
+                self._draw_layer(layer)
+        lowest = min((order.index(layer) for layer in self._dirty_layers if layer in order), default=len(order))
+        self._dirty_layers.clear()
+        below = tuple(order[:lowest])
+        if self._base is None or below != self._base_layers:
+            if self._base is None:
+                self._base = pygame.Surface(self.rect.size)
+            if isinstance(self.background, pygame.Surface):
+                self._base.blit(self.background, (0, 0))
+            else:
+                self._base.fill(self.background)
+            self._base.blits([(self._layer_surfaces[layer], (0, 0)) for layer in below], False)
+            self._base_layers = below
+        self.surface.blit(self._base, (0, 0))
+        self.surface.blits([(self._layer_surfaces[layer], (0, 0)) for layer in order[len(below):]], False)
+
+    def update(self):
+        """Update needs to be called every frame in the main loop."""
+        self.draw()
+
+    @profiled("render")
+    def draw(self, surface=None):
+        """
+        Draw the layers whose items changed and blit the canvas
+        :param surface: the surface to draw on, defaults to master
+        """
+        if self._dirty_layers:
+            self._composite()
+        (self.master if surface is None else surface).blit(self.surface, self.rect)
+        self.dirty = False
@@ -0,0 +1,108 @@
+import inspect
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Posted whenever a command finishes, so a loop waiting in pygame.event.wait() wakes up to deliver its result
+COMMAND_DONE = pygame.event.custom_type()
+
+
+class CommandRunner:
+    """Runs widget commands off the UI thread and hands their outcome back to it.
+
+    Coroutine functions run on an asyncio event loop of their own, other functions on a thread pool, both are started
+    the first time they are needed. The callbacks given to submit() are only called from process(), which the main
+    loop calls once per frame, so they can touch widgets and surfaces like any other code of the loop:
+
+    runner.submit(download, url, callback=on_download)
+    ...
+    runner.process()  # once per frame, on the thread that draws
+    """
+
+    def __init__(self, max_workers=None):
+        """
+        :param max_workers: the number of threads blocking commands run on, defaults to ThreadPoolExecutor's default
+        """
+        self.max_workers = max_workers
+        self._executor = None
+        self._loop = None
+        self._lock = threading.Lock()
+        # (future, callback) of the finished commands, filled by the worker threads and drained by process()
+        self._done = queue.SimpleQueue()
+        self._pending = set()
+
+    @property
+    def pending(self):
+        """The number of commands submitted and not delivered yet."""
+        return len(self._pending)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="command")
+            return self._executor
+
+    def _get_loop(self):
+        # asyncio takes tens of milliseconds to import, only applications with coroutine commands pay for it
+        import asyncio
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="command-loop", daemon=True).start()
+            return self._loop
+
+    def submit(self, function, *args, callback=None):
+        """
+        Start a command without waiting for it
+        :param function: a coroutine function or a blocking function
+        :param args: the arguments the function is called with
+        :param callback: called with the finished concurrent.futures.Future by process(), on the UI thread
+        :return: a concurrent.futures.Future of the command's result
+        """
+        if inspect.iscoroutinefunction(function):
+            import asyncio
+            future = asyncio.run_coroutine_threadsafe(function(*args), self._get_loop())
+        else:
+            future = self._get_executor().submit(function, *args)
+        self._pending.add(future)
+        future.add_done_callback(lambda finished: self._finished(finished, callback))
+        return future
+
+    def _finished(self, future, callback):
+        # Called on the thread the command finished on
+        self._done.put((future, callback))
+        if pygame.display.get_init():
+            try:
+                pygame.event.post(pygame.event.Event(COMMAND_DONE))
+            except pygame.error:
+                pass
+
+    def process(self):
+        """Call the callbacks of the commands finished since the last call, return how many were delivered. An
+        exception raised by a callback propagates, the remaining commands are delivered by the next call."""
+        delivered = 0
+        while True:
+            try:
+                future, callback = self._done.get_nowait()
+            except queue.Empty:
+                return delivered
+            self._pending.discard(future)
+            delivered += 1
+            if callback is not None:
+                callback(future)
+
+    def shutdown(self, wait=True):
+        """Stop the thread pool and the event loop, commands submitted afterwards start them again."""
+        with self._lock:
+            executor, loop = self._executor, self._loop
+            self._executor = self._loop = None
+        if executor is not None:
+            executor.shutdown(wait)
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+# The runner widgets submit their asynchronous commands to
+runner = CommandRunner()
@@ -0,0 +1,158 @@
+import pygame
+
+MOUSE_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION)
+KEY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT, pygame.TEXTEDITING)
+
+
+class EventDispatcher:
+    """Routes events to the widget they concern instead of handing every event to every widget.
+
+    Widget rects are kept in a uniform grid, so finding the widget under the pointer only looks at the widgets sharing
+    its cell. Mouse events go to the widget under the pointer, which also receives on_enter()/on_leave() calls
+    instead of polling pygame.mouse.get_pos(). Keyboard events go to the focused widget, the focus follows the last
+    widget that was clicked. Widgets registered later are on top of the ones registered before them.
+
+    dispatcher = EventDispatcher()
+    dispatcher.register(button, input_box)
+    for event in pygame.event.get():
+        dispatcher.dispatch(event)
+    """
+
+    def __init__(self, cell_size=64):
+        """
+        :param cell_size: the width and height in pixels of a grid cell
+        """
+        self.cell_size = cell_size
+        self.hovered = None
+        self.focus = None
+        self._grid = {}
+        self._cells = {}
+        self._order = {}
+        self._next_order = 0
+        # The widget that received the last mouse press, it is sent the matching release wherever the pointer is
+        self._grabbed = None
+
+    def register(self, *widgets):
+        """Start routing events to the widgets."""
+        for widget in widgets:
+            if widget in self._order:
+                continue
+            self._order[widget] = self._next_order
+            self._next_order += 1
+            widget.dispatcher = self
+            self._index(widget)
+            # An input box created active takes the keys from the start, unless another widget has the focus already
+            if self.focus is None and getattr(widget, "active", False):
+                self.set_focus(widget)
+
+    def unregister(self, *widgets):
+        """Stop routing events to the widgets."""
+        for widget in widgets:
+            if widget not in self._order:
+                continue
+            self._unindex(widget)
+            del self._order[widget]
+            widget.dispatcher = None
+            if self.hovered is widget:
+                self.hovered = None
+            if self.focus is widget:
+                self.focus = None
+            if self._grabbed is widget:
+                self._grabbed = None
+
+    def reindex(self, widget):
+        """Move a widget to the grid cells of its current bounds, widgets call this when they move or resize."""
+        if widget in self._order:
+            self._unindex(widget)
+            self._index(widget)
+
+    def lift(self, widget):
+        """Put a widget above every other registered widget."""
+        if widget in self._order:
+            self._order[widget] = self._next_order
+            self._next_order += 1
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield cx, cy
+
+    def _index(self, widget):
+        bounds = widget.get_bounds()
+        cells = list(self._cell_range(bounds)) if bounds.w > 0 and bounds.h > 0 else []
+        for cell in cells:
+            self._grid.setdefault(cell, []).append(widget)
+        self._cells[widget] = (bounds, cells)
+
+    def _unindex(self, widget):
+        _, cells = self._cells.pop(widget)
+        for cell in cells:
+            bucket = self._grid[cell]
+            bucket.remove(widget)
+            if not bucket:
+                del self._grid[cell]
+
+    def widget_at(self, pos):
+        """Return the topmost registered widget whose bounds contain pos, or None."""
+        cell = (int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size)
+        found = None
+        for widget in self._grid.get(cell, ()):
+            if self._cells[widget][0].collidepoint(pos) and (found is None or self._order[widget] > self._order[found]):
+                found = widget
+        return found
+
+    def set_focus(self, widget):
+        """Give the keyboard focus to a widget, or take it away from every widget with None."""
+        if widget is self.focus:
+            return
+        old, self.focus = self.focus, widget
+        if old is not None and hasattr(old, "on_focus_out"):
+            old.on_focus_out()
+        if widget is not None and hasattr(widget, "on_focus_in"):
+            widget.on_focus_in()
+
+    def _hover(self, widget):
+        if widget is self.hovered:
+            return
+        old, self.hovered = self.hovered, widget
+        if old is not None and hasattr(old, "on_leave"):
+            old.on_leave()
+        if widget is not None and hasattr(widget, "on_enter"):
+            widget.on_enter()
+
+    def dispatch(self, event):
+        """
+        Send an event to the widgets it concerns, call it inside the for loop over pygame.event.get()
+        :param event: a single event obtained from pygame.event.get()
+        :return: the widget under the pointer for mouse events, the focused widget for keyboard events, else None
+        """
+        if event.type in MOUSE_EVENTS:
+            target = self.widget_at(event.pos)
+            self._hover(target)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                self.set_focus(target)
+                self._grabbed = target
+            elif event.type == pygame.MOUSEBUTTONUP:
+                grabbed, self._grabbed = self._grabbed, None
+                if grabbed is not None and grabbed is not target:
+                    grabbed.check_event(event)
+            if target is not None:
+                target.check_event(event)
+            return target
+        if event.type == pygame.MOUSEWHEEL:
+            if self.hovered is not None:
+                self.hovered.check_event(event)
+            return self.hovered
+        if event.type in KEY_EVENTS:
+            if self.focus is not None:
+                self.focus.check_event(event)
+            return self.focus
+        if event.type == pygame.WINDOWLEAVE:
+            self._hover(None)
+        return None
+
+    def dispatch_all(self, events):
+        """Dispatch every event of a list, eg. dispatcher.dispatch_all(pygame.event.get())."""
+        for event in events:
+            self.dispatch(event)
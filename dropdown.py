@@ -1,54 +1,303 @@
+import time
+from bisect import bisect_left
+
 import pygame
 import pygame as pg
-pygame.init()
+
+from profiler import profiled, profiler
+from render_queue import POPUP, RenderQueue
+from fonts import font_from
+from scaling import rescaled_position, scaled, scaled_font, track
+from text_cache import render
 
 
 class DropDown:
+    __slots__ = ("color_menu", "color_option", "rect", "font", "main", "options", "command", "max_visible",
+                 "draw_menu", "menu_active", "active_option", "scroll", "dirty", "dispatcher", "geometry",
+                 "_requested_size", "_row_surfaces", "_row_style", "_row_styles", "_prefix_index", "_indexed_options",
+                 "_search", "_search_time", "_last_mouse", "_scale", "_unscaled", "_origin",
+                 "__weakref__")
 
-    def __init__(self, color_menu, color_option, x, y, w, h, font, main, options):
+    def __init__(self, color_menu, color_option, x, y, w, h, font, main, options, command=None, max_visible=0):
+        """
+        :param font: the font of the header and the options, a (path, size) pair is loaded through get_font so the
+                     text is rasterized again at the scaled size when the UI is scaled
+        :param command: optional function called with the index of the option that was picked
+        :param max_visible: the number of options shown at once, the list scrolls with the mouse wheel and only the
+                            visible options are drawn. 0 shows every option
+        """
         self.color_menu = color_menu
         self.color_option = color_option
         self.rect = pg.Rect(x, y, w, h)
-        self.font = font
+        self.font = font_from(font)
         self.main = main
         self.options = options
+        self.command = command
+        self.max_visible = max_visible
         self.draw_menu = False
         self.menu_active = False
         self.active_option = -1
+        # Index of the first visible option
+        self.scroll = 0
+        self.dirty = True
+        # Set by an EventDispatcher the menu is registered with, it then feeds the pointer position
+        self.dispatcher = None
+        # Set by the geometry manager the menu is arranged by
+        self.geometry = None
+        self._requested_size = self.rect.size
+        # Finished option rows keyed by (text, highlighted)
+        self._row_surfaces = {}
+        self._row_style = None
+        # The finished rows of the other styles drawn so far, eg. at other UI scales
+        self._row_styles = {}
+        # Sorted (lowercase text, index) pairs for type-ahead search, rebuilt when the options change
+        self._prefix_index = None
+        self._indexed_options = None
+        self._search = ""
+        self._search_time = 0
+        self._last_mouse = None
+        self._scale = 1
+        self._origin = None
+        self._unscaled = (self.font, self._requested_size)
+        track(self)
+
+    def visible_count(self):
+        """Return how many option rows are shown while the menu is open."""
+        if self.max_visible > 0:
+            return min(self.max_visible, len(self.options))
+        return len(self.options)
+
+    def get_bounds(self):
+        """Return the rect covering the header and, while it is open, the option list."""
+        rect = self.rect.copy()
+        if self.draw_menu:
+            rect.h += self.visible_count() * self.rect.height
+        return rect
+
+    def get_requested_size(self):
+        """Return the size of the header the menu was created with."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the header, the option rows take its size. This is how geometry managers arrange the menu
+        :param rect: the new rect of the header
+        """
+        self.rect = pg.Rect(rect)
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def apply_scale(self, scale):
+        """
+        Resize the menu and render its text with the font at a UI scale factor, scaling.set_scale calls this
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        font, size = self._unscaled
+        position, self._origin = rescaled_position(self.rect.topleft, self._scale, scale, self._origin)
+        self._scale = scale
+        self.font = scaled_font(font, scale)
+        self._requested_size = (scaled(size[0], scale), scaled(size[1], scale))
+        self.rect = pg.Rect(position, self._requested_size)
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+        if self.geometry is not None:
+            self.geometry.invalidate(self)
+
+    def _set_open(self, draw_menu):
+        self.draw_menu = draw_menu
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+            if draw_menu:
+                self.dispatcher.lift(self)
+
+    def _fit_options(self):
+        # The options may have been replaced by a shorter list since the scroll position and highlight were set
+        count = len(self.options)
+        if self.active_option >= count:
+            self.active_option = -1
+            self.dirty = True
+        last = max(0, count - self.visible_count())
+        if self.scroll > last:
+            self.scroll = last
+            self.dirty = True
+
+    def scroll_to(self, first):
+        """Scroll the option list so that the option at index first is the top visible row."""
+        first = max(0, min(first, len(self.options) - self.visible_count()))
+        if first != self.scroll:
+            self.scroll = first
+            self.dirty = True
+
+    def see(self, index):
+        """Scroll the option list just enough to make the option at index visible."""
+        if index < self.scroll:
+            self.scroll_to(index)
+        elif index >= self.scroll + self.visible_count():
+            self.scroll_to(index - self.visible_count() + 1)
+
+    def option_at(self, pos):
+        """Return the index of the visible option at pos, or -1. It is plain arithmetic on the pointer offset."""
+        if not self.draw_menu or not self.rect.left <= pos[0] < self.rect.right:
+            return -1
+        self._fit_options()
+        row = (pos[1] - self.rect.bottom) // self.rect.height
+        if 0 <= row < self.visible_count():
+            return self.scroll + row
+        return -1
 
+    def check_hover(self):
+        """Update the highlighted header and option from the mouse position, marking the menu dirty when they
+        change. Menus registered with an EventDispatcher get the pointer position from mouse motion events instead."""
+        if self.dispatcher is None:
+            mpos = pg.mouse.get_pos()
+            # A still pointer keeps the option picked with the keyboard highlighted
+            if mpos != self._last_mouse or not self.draw_menu:
+                self._last_mouse = mpos
+                self._hover_at(mpos)
+
+    def _hover_at(self, mpos):
+        menu_active = mpos is not None and self.rect.collidepoint(mpos)
+        active_option = -1 if mpos is None else self.option_at(mpos)
+
+        if menu_active != self.menu_active or active_option != self.active_option:
+            self.menu_active = menu_active
+            self.active_option = active_option
+            self.dirty = True
+
+        if not self.menu_active and self.active_option == -1 and self.draw_menu:
+            self._set_open(False)
+
+    def on_leave(self):
+        """Called when the mouse leaves the menu, which closes it."""
+        self._hover_at(None)
+
+    def _row_surface(self, text, highlighted):
+        style = (self.rect.size, self.font, self.color_option[0], self.color_option[1])
+        if style != self._row_style:
+            self._row_styles[self._row_style] = self._row_surfaces
+            self._row_surfaces = self._row_styles.pop(style, {})
+            if len(self._row_styles) > 4:
+                self._row_styles.pop(next(iter(self._row_styles)))
+            self._row_style = style
+        surface = self._row_surfaces.get((text, highlighted))
+        if surface is None:
+            if len(self._row_surfaces) > 4 * max(self.visible_count(), 32):
+                self._row_surfaces.clear()
+            surface = pg.Surface(self.rect.size)
+            surface.fill(self.color_option[1 if highlighted else 0])
+            msg = render(self.font, text, 1, (0, 0, 0))
+            surface.blit(msg, msg.get_rect(center=surface.get_rect().center))
+            self._row_surfaces[(text, highlighted)] = surface
+        return surface
+
+    @profiled("render")
     def draw(self, surf):
-        pg.draw.rect(surf, self.color_menu[self.menu_active], self.rect, 0)
-        msg = self.font.render(self.main, 1, (0, 0, 0))
+        """Paint the menu, surf can also be a RenderQueue, the open option list then goes on the popup layer."""
+        surf.fill(self.color_menu[self.menu_active], self.rect)
+        msg = render(self.font, self.main, 1, (0, 0, 0))
         surf.blit(msg, msg.get_rect(center=self.rect.center))
 
         if self.draw_menu:
-            for i, text in enumerate(self.options):
-                rect = self.rect.copy()
-                rect.y += (i + 1) * self.rect.height
-                pg.draw.rect(surf, self.color_option[1 if i == self.active_option else 0], rect, 0)
-                msg = self.font.render(text, 1, (0, 0, 0))
-                surf.blit(msg, msg.get_rect(center=rect.center))
+            self._fit_options()
+            menu = surf.on_layer(POPUP) if isinstance(surf, RenderQueue) else surf
+            visible = self.visible_count()
+            menu.blits([(self._row_surface(self.options[i], i == self.active_option),
+                         (self.rect.x, self.rect.y + (i - self.scroll + 1) * self.rect.height))
+                        for i in range(self.scroll, self.scroll + visible)], False)
+            if visible < len(self.options):
+                # A thin bar showing which part of the list is visible
+                track = pg.Rect(self.rect.right - 4, self.rect.bottom, 4, visible * self.rect.height)
+                bar_h = max(4, track.h * visible // len(self.options))
+                bar_y = track.y + (track.h - bar_h) * self.scroll // (len(self.options) - visible)
+                menu.fill(self.color_menu[1], (track.x, bar_y, track.w, bar_h))
+        self.dirty = False
 
-    def update(self, event_list):
-        mpos = pg.mouse.get_pos()
-        self.menu_active = self.rect.collidepoint(mpos)
+    def _build_prefix_index(self):
+        # Compared with a copy, so options replaced in place, eg. options[3] = "zeta", are found too
+        options = tuple(self.options)
+        if self._prefix_index is None or self._indexed_options != options:
+            self._prefix_index = sorted((str(text).lower(), i) for i, text in enumerate(options))
+            self._indexed_options = options
+        return self._prefix_index
 
-        self.active_option = -1
-        for i in range(len(self.options)):
-            rect = self.rect.copy()
-            rect.y += (i + 1) * self.rect.height
-            if rect.collidepoint(mpos):
-                self.active_option = i
-                break
+    def find(self, prefix):
+        """Return the index of the first option, in sorted order, starting with prefix ignoring case, or -1."""
+        index = self._build_prefix_index()
+        prefix = prefix.lower()
+        position = bisect_left(index, (prefix, -1))
+        if position < len(index) and index[position][0].startswith(prefix):
+            return index[position][1]
+        return -1
+
+    def _type_ahead(self, text):
+        now = time.monotonic()
+        if now - self._search_time > 1:
+            self._search = ""
+        self._search_time = now
+        self._search += text
+        found = self.find(self._search)
+        if found >= 0:
+            self._highlight(found)
+
+    def _highlight(self, index):
+        if not self.options:
+            return
+        self.active_option = max(0, min(index, len(self.options) - 1))
+        self.see(self.active_option)
+        self.dirty = True
 
-        if not self.menu_active and self.active_option == -1:
-            self.draw_menu = False
+    def _pick(self, index):
+        if not 0 <= index < len(self.options):
+            return -1
+        self._set_open(False)
+        if self.command:
+            profiler.call(self, self.command, index)
+        return index
+
+    @profiled("event")
+    def check_event(self, event):
+        """
+        Handle a single event, returns the index of the option that was picked or -1
+        :param event: event is the event obtained from pygame.event.get()
+        """
+        self._fit_options()
+        if event.type == pg.MOUSEMOTION:
+            self._hover_at(event.pos)
+        elif event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
+            # The press counts where it happened, the hover state may be from an older mouse position
+            self._hover_at(event.pos)
+            if self.menu_active:
+                self._set_open(not self.draw_menu)
+            elif self.draw_menu and self.active_option >= 0:
+                return self._pick(self.active_option)
+        elif event.type == pg.MOUSEWHEEL and self.draw_menu:
+            self.scroll_to(self.scroll - event.y)
+            if self.dispatcher is None:
+                self._hover_at(pg.mouse.get_pos())
+        elif event.type == pg.TEXTINPUT and self.draw_menu:
+            self._type_ahead(event.text)
+        elif event.type == pg.KEYDOWN and self.draw_menu:
+            if event.key == pg.K_DOWN:
+                self._highlight(self.active_option + 1)
+            elif event.key == pg.K_UP:
+                self._highlight(self.active_option - 1)
+            elif event.key in (pg.K_RETURN, pg.K_KP_ENTER) and self.active_option >= 0:
+                return self._pick(self.active_option)
+            elif event.key == pg.K_ESCAPE:
+                self._set_open(False)
+        return -1
+
+    def update(self, event_list):
+        self.check_hover()
 
         for event in event_list:
-            if event.type == pg.MOUSEBUTTONDOWN and event.button == 1:
-                if self.menu_active:
-                    self.draw_menu = not self.draw_menu
-                elif self.draw_menu and self.active_option >= 0:
-                    self.draw_menu = False
-                    return self.active_option
-        return -1
\ No newline at end of file
+            if event.type in (pg.MOUSEBUTTONDOWN, pg.MOUSEWHEEL, pg.TEXTINPUT, pg.KEYDOWN):
+                option = self.check_event(event)
+                if option >= 0:
+                    return option
+        return -1
@@ -0,0 +1,139 @@
+import heapq
+import itertools
+import time
+
+import pygame
+
+from commands import runner
+
+
+class EventLoop:
+    """A Tkinter-like main loop that sleeps while the window is idle.
+
+    Instead of polling pygame.event.get() at full frame rate, the loop blocks in pygame.event.wait() until an event
+    arrives or the next timer is due, then hands the events to the widgets, runs the due timers, delivers the
+    finished commands and repaints what changed. A window nobody touches only wakes up for its timers, eg. the
+    blinking caret of an active InputBox:
+
+    manager = WidgetManager(screen)
+    manager.add(button, input_box)
+    timer = after(1000, refresh)
+    mainloop(manager)
+
+    Timers are kept in a heap ordered by when they are due, cancelled ones are dropped when they reach the top.
+    """
+
+    def __init__(self):
+        # (due, number, timer id) of every timer scheduled, due in seconds of time.monotonic()
+        self._heap = []
+        # The function and arguments of every timer that was neither run nor cancelled yet, by timer id
+        self._timers = {}
+        self._numbers = itertools.count(1)
+        # The number of the last timer scheduled
+        self._scheduled = 0
+        self.running = False
+
+    def after(self, ms, function, *args):
+        """
+        Call function(*args) once, ms milliseconds from now
+        :return: the id of the timer, for after_cancel
+        """
+        number = self._scheduled = next(self._numbers)
+        timer = f"after#{number}"
+        self._timers[timer] = (function, args)
+        heapq.heappush(self._heap, (time.monotonic() + max(0, ms) / 1000, number, timer))
+        return timer
+
+    def after_idle(self, function, *args):
+        """Call function(*args) once the events that are waiting have been handled."""
+        return self.after(0, function, *args)
+
+    def after_cancel(self, timer):
+        """Cancel a timer returned by after, timers that already ran or were cancelled are ignored."""
+        if self._timers.pop(timer, None) is not None and len(self._heap) > 2 * len(self._timers) + 64:
+            # Loops that do not run the timers would otherwise pile up cancelled ones
+            self._heap = [entry for entry in self._heap if entry[2] in self._timers]
+            heapq.heapify(self._heap)
+
+    def timeout(self):
+        """Return the number of seconds until the next timer is due, None when no timer is scheduled."""
+        heap = self._heap
+        while heap and heap[0][2] not in self._timers:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - time.monotonic())
+
+    def run_timers(self):
+        """Call the timers that are due, return how many ran. Loops of their own call this once per frame. Timers
+        scheduled by the timers that run wait for the next call, even after(0) ones."""
+        now = time.monotonic()
+        heap = self._heap
+        # Timers are numbered in the order they were scheduled, the next one is the first scheduled while running
+        newest = self._scheduled
+        ran = 0
+        while heap and heap[0][0] <= now and heap[0][1] <= newest:
+            _, _, timer = heapq.heappop(heap)
+            entry = self._timers.pop(timer, None)
+            if entry is not None:
+                function, args = entry
+                function(*args)
+                ran += 1
+        return ran
+
+    def wait(self):
+        """Block until an event arrives or the next timer is due, then return every event waiting."""
+        timeout = self.timeout()
+        if timeout is None:
+            event = pygame.event.wait()
+        elif timeout > 0:
+            # Rounded up, so the loop does not wake up just before the timer is due
+            event = pygame.event.wait(int(timeout * 1000) + 1)
+        else:
+            return pygame.event.get()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def quit(self):
+        """Make mainloop return once it finished handling the current events."""
+        self.running = False
+
+    def mainloop(self, manager=None, dispatcher=None, on_event=None):
+        """
+        Handle events, timers and commands until the window is closed or quit is called
+        :param manager: the WidgetManager painting the window, its widgets receive the events when no dispatcher is
+                        given and the areas it repaints are updated on the display
+        :param dispatcher: an EventDispatcher the events are routed through
+        :param on_event: called with every event before the widgets receive it
+        """
+        self.running = True
+        if manager is not None:
+            pygame.display.update(manager.update())
+        while self.running:
+            for event in self.wait():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                if on_event is not None:
+                    on_event(event)
+                if dispatcher is not None:
+                    dispatcher.dispatch(event)
+                elif manager is not None:
+                    for widget in list(manager.widgets):
+                        check_event = getattr(widget, "check_event", None)
+                        if check_event:
+                            check_event(event)
+            self.run_timers()
+            runner.process()
+            if manager is not None:
+                rects = manager.update()
+                if rects:
+                    pygame.display.update(rects)
+
+
+# The loop widgets schedule their timers with
+loop = EventLoop()
+after = loop.after
+after_idle = loop.after_idle
+after_cancel = loop.after_cancel
+mainloop = loop.mainloop
@@ -0,0 +1,124 @@
+import inspect
+
+import pygame
+
+from Label import Label
+from button import PRESSED_SCALE, Button
+from fonts import font_from, get_font, with_style
+from input_box import InputBox
+from text_cache import render
+from text_layout import get_layout
+
+WIDGETS = {"button": Button, "label": Label, "input_box": InputBox}
+# The color InputBox renders its placeholder text in
+PLACEHOLDER_COLOR = (238, 234, 222)
+
+
+def _defaults(cls):
+    return {name: parameter.default for name, parameter in inspect.signature(cls.__init__).parameters.items()
+            if parameter.default is not inspect.Parameter.empty}
+
+
+def _color(color):
+    # Jobs are deduplicated in a set, colors given as lists or pygame.Color are not hashable
+    if not color or isinstance(color, tuple):
+        return color
+    return tuple(pygame.Color(color))
+
+
+def _button_jobs(options):
+    style = options["style"]
+    if style is None:
+        font, justify = options["font"], options["justify_text"]
+        colors = (options["fg"], options["hover_font_color"], options["active_foreground"])
+    else:
+        font, justify = style.font, style.justify
+        colors = (style.fg, style.hover_font_color, style.active_foreground)
+    font = with_style(font_from(font), options["bold"], options["italic"], options["underline"])
+    if not options.get("text"):
+        return []
+    layout_args = (font, options["text"], options["width"], options["height"], options["wraplength"], justify)
+    colors = tuple(_color(color) for color in colors if color)
+    return [("layout", layout_args, colors)]
+
+
+def _label_jobs(options):
+    font = get_font(options["font"], options["font_size"], options["bold"], options["italic"], options["underline"])
+    text, color, background = options["text"], _color(options["color"]), _color(options["background"])
+    if options["wraplength"] > 0 or "\n" in text:
+        return [("label_layout", (font, text, options["wraplength"], options["justify"]), (color, background))]
+    return [("text", (font, text), (color, background or None))]
+
+
+def _input_box_jobs(options):
+    font = font_from(options["font"], options["h"] - 5)
+    return [("text", (font, options["text"]), (PLACEHOLDER_COLOR, None))]
+
+
+JOBS = {Button: _button_jobs, Label: _label_jobs, InputBox: _input_box_jobs}
+
+
+def _run_job(job):
+    # Returns the layout or surface that was rendered, holding on to it keeps it findable in the caches
+    kind, arguments, color = job
+    if kind == "layout":
+        # Every color of a button and its shrunk pressed text share one layout
+        layout = Button.get_text_layout(*arguments)
+        for each in color:
+            layout.render(each)
+        layout.render_scaled(color[0], PRESSED_SCALE)
+        return layout
+    if kind == "label_layout":
+        font, text, wraplength, justify = arguments
+        layout = get_layout(font, text, wraplength, justify=justify)
+        layout.render(*color)
+        return layout
+    return render(*arguments, True, *color)
+
+
+def prerender(specs):
+    """
+    Render the text every widget of specs will show into the shared caches, each distinct piece of text only once,
+    eg. behind a loading screen before the widgets are built. Building the widgets renders the same text, so this
+    only moves the work, it does not make building faster
+    :param specs: widget specs as taken by build_widgets
+    :return: the rendered layouts and surfaces, text layouts stay shared for as long as this list is kept
+    """
+    seen = set()
+    rendered = []
+    defaults = {}
+    for spec in specs:
+        cls = WIDGETS[spec["type"]]
+        if cls not in defaults:
+            defaults[cls] = _defaults(cls)
+        for job in JOBS[cls]({**defaults[cls], **spec}):
+            if job not in seen:
+                seen.add(job)
+                rendered.append(_run_job(job))
+    return rendered
+
+
+def build_widgets(master, specs):
+    """
+    Build many widgets at once. Identical text is rendered once through the shared text and layout caches and images
+    with the same content are scaled once through the image cache.
+
+    widgets = build_widgets(screen, [
+        {"type": "button", "position": (10, 10), "text": "Save", "width": 100, "height": 40},
+        {"type": "label", "text": "Name", "position": (10, 60)},
+        {"type": "input_box", "x": 80, "y": 60, "w": 200, "h": 32},
+    ])
+    :param master: the surface buttons and labels are drawn on
+    :param specs: one dictionary per widget with a "type" of "button", "label" or "input_box" and the keyword
+                  arguments of that widget
+    :return: the widgets in the order of specs
+    """
+    widgets = []
+    for spec in specs:
+        options = dict(spec)
+        cls = WIDGETS[options.pop("type")]
+        if cls is InputBox:
+            widgets.append(cls(**options))
+        else:
+            widgets.append(cls(master, **options))
+    return widgets
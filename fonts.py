@@ -0,0 +1,82 @@
+import weakref
+
+import pygame
+
+# Fonts handed out so far keyed by (path, size, bold, italic, underline), and the key of every such font
+_fonts = {}
+_keys = weakref.WeakKeyDictionary()
+
+
+def init_fonts():
+    """Initialize only the pygame font module, the widgets call it before they first need a font."""
+    if not pygame.font.get_init():
+        pygame.font.init()
+
+
+def get_font(path=None, size=36, bold=False, italic=False, underline=False):
+    """
+    Return a shared font, every call with the same arguments gets the same font object. The style of the returned
+    font must not be changed, ask for a font with the style instead
+    :param path: the font file, None is pygame's default font
+    :param size: the font size
+    :param bold: synthesized bold
+    :param italic: synthesized italic
+    :param underline: underlined text
+    """
+    key = (path, size, bool(bold), bool(italic), bool(underline))
+    font = _fonts.get(key)
+    if font is None:
+        init_fonts()
+        font = pygame.font.Font(path, size)
+        font.set_bold(key[2])
+        font.set_italic(key[3])
+        font.set_underline(key[4])
+        _fonts[key] = font
+        _keys[font] = key
+    return font
+
+
+def font_from(font, size=36):
+    """
+    Return the font a widget's font argument stands for. A (path, size) pair, or a (path, size, bold, italic,
+    underline) tuple, is looked up with get_font so the widget's text can be rasterized again when the UI is scaled,
+    a pygame font is used as it is and None is the default font
+    :param size: the size of the default font
+    """
+    if font is None:
+        return get_font(None, size)
+    if isinstance(font, tuple):
+        return get_font(*font)
+    return font
+
+
+def font_key(font):
+    """Return the (path, size, bold, italic, underline) a font was obtained from get_font with, None for other
+    fonts."""
+    return _keys.get(font)
+
+
+def with_style(font, bold=False, italic=False, underline=False):
+    """
+    Return font with the style flags that are True added. For a font obtained from get_font the matching shared
+    font is returned and font itself is left alone, other fonts have no known file to load again, so they are
+    changed in place
+    """
+    if not (bold or italic or underline):
+        return font
+    key = _keys.get(font)
+    if key is not None:
+        path, size, font_bold, font_italic, font_underline = key
+        return get_font(path, size, font_bold or bold, font_italic or italic, font_underline or underline)
+    if underline:
+        font.set_underline(True)
+    if bold:
+        font.set_bold(True)
+    if italic:
+        font.set_italic(True)
+    return font
+
+
+def clear_fonts():
+    """Forget the shared fonts, eg. after pygame.font.quit()."""
+    _fonts.clear()
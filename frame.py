@@ -0,0 +1,177 @@
+import pygame
+
+from dispatcher import KEY_EVENTS, MOUSE_EVENTS, EventDispatcher
+from profiler import profiled
+from widget_manager import WidgetManager
+
+
+class Frame:
+    """A container, like Tkinter's Frame, that paints its children into a surface of its own.
+
+    Children are positioned relative to the frame's content and are only repainted when they are dirty, a frame
+    whose children did not change costs a single blit. The content can be larger than the frame and scrolled, which
+    only changes the part of the content surface that is blitted:
+
+    frame = Frame(screen, (20, 20, 300, 400), background=(40, 40, 40), content_size=(300, 2000))
+    frame.add(Button(frame.surface, (10, 10), text="Save"))
+    ...
+    frame.check_event(event)  # inside the for loop over pygame.event.get()
+    frame.update()  # once per frame
+    frame.scroll_to(0, 500)
+
+    A frame is a widget itself, so it can be added to a WidgetManager, registered with an EventDispatcher or put
+    inside another frame.
+    """
+    __slots__ = ("master", "rect", "surface", "manager", "events", "scroll_x", "scroll_y", "scroll_step", "dirty",
+                 "dispatcher", "geometry", "_requested_size", "_last_mouse", "__weakref__")
+
+    def __init__(self, master, rect, background=(0, 0, 0), content_size=None, scroll_step=40):
+        """
+        :param master: the surface the frame is drawn on
+        :param rect: the area of master the frame covers
+        :param background: a color or a surface painted behind the children
+        :param content_size: the size of the content surface the children are drawn on, defaults to the frame's size
+        :param scroll_step: the number of pixels one mouse wheel step scrolls the content, 0 disables wheel scrolling
+        """
+        self.master = master
+        self.rect = pygame.Rect(rect)
+        self.surface = pygame.Surface(content_size or self.rect.size)
+        self.manager = WidgetManager(self.surface, background)
+        # Routes the events the frame receives, in content coordinates, to its children
+        self.events = EventDispatcher()
+        self.scroll_x = 0
+        self.scroll_y = 0
+        self.scroll_step = scroll_step
+        self.dirty = True
+        # Set by an EventDispatcher the frame is registered with, it then feeds the hover state
+        self.dispatcher = None
+        # Set by the geometry manager the frame is arranged by
+        self.geometry = None
+        self._requested_size = self.rect.size
+        self._last_mouse = None
+
+    @property
+    def children(self):
+        return self.manager.widgets
+
+    def add(self, *widgets):
+        """Add widgets to the frame, their positions are relative to the top left of the content."""
+        self.manager.add(*widgets)
+        self.events.register(*widgets)
+        self.dirty = True
+
+    def remove(self, *widgets):
+        """Remove widgets from the frame."""
+        self.manager.remove(*widgets)
+        self.events.unregister(*widgets)
+        self.dirty = True
+
+    def get_bounds(self):
+        """Return the area of master the frame covers."""
+        return self.rect.copy()
+
+    def get_requested_size(self):
+        """Return the size the frame was created with."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the frame, this is how geometry managers arrange it. The content surface grows when the
+        frame becomes larger than it
+        :param rect: the new area of master the frame covers
+        """
+        self.rect = pygame.Rect(rect)
+        width, height = self.surface.get_size()
+        if self.rect.w > width or self.rect.h > height:
+            self.surface = pygame.Surface((max(width, self.rect.w), max(height, self.rect.h)))
+            self.manager.surface = self.surface
+            self.manager.mark_dirty()
+        self.scroll_to(self.scroll_x, self.scroll_y)
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def scroll_to(self, x, y):
+        """Show the content from (x, y) on, the offsets are kept inside the content."""
+        width, height = self.surface.get_size()
+        x = max(0, min(int(x), width - self.rect.w))
+        y = max(0, min(int(y), height - self.rect.h))
+        if (x, y) != (self.scroll_x, self.scroll_y):
+            self.scroll_x, self.scroll_y = x, y
+            self.dirty = True
+            # The pointer is now over other content
+            self._last_mouse = None
+
+    def scroll(self, dx=0, dy=0):
+        """Scroll the content by dx and dy pixels."""
+        self.scroll_to(self.scroll_x + dx, self.scroll_y + dy)
+
+    def to_content(self, pos):
+        """Convert a position on master into a position on the content surface."""
+        return pos[0] - self.rect.x + self.scroll_x, pos[1] - self.rect.y + self.scroll_y
+
+    def check_hover(self):
+        """Poll the children and the mouse, marking the frame dirty when a child needs to be repainted. Frames
+        registered with an EventDispatcher are told about the pointer instead and do not poll the mouse."""
+        if self.dispatcher is None:
+            mouse = pygame.mouse.get_pos()
+            if mouse != self._last_mouse:
+                self._last_mouse = mouse
+                if self.rect.collidepoint(mouse):
+                    self.events.dispatch(pygame.event.Event(pygame.MOUSEMOTION, pos=self.to_content(mouse),
+                                                            rel=(0, 0), buttons=(0, 0, 0)))
+                else:
+                    self.on_leave()
+        for widget in self.manager.widgets:
+            check_hover = getattr(widget, "check_hover", None)
+            if check_hover:
+                check_hover()
+            if widget.dirty:
+                self.dirty = True
+
+    def on_leave(self):
+        """Called when the mouse leaves the frame, the child under it is left as well."""
+        self.events.dispatch(pygame.event.Event(pygame.WINDOWLEAVE))
+
+    def check_event(self, event):
+        """
+        Hand an event to the children it concerns, mouse positions are converted to content coordinates. The mouse
+        wheel scrolls the content unless the child under the pointer takes it
+        :param event: a single event obtained from pygame.event.get()
+        """
+        if event.type in MOUSE_EVENTS:
+            inside = self.rect.collidepoint(event.pos)
+            if not inside and event.type != pygame.MOUSEBUTTONUP:
+                # Presses outside take the focus away from the children like a click on another widget does
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    self.events.set_focus(None)
+                self.on_leave()
+                return
+            attributes = dict(event.dict, pos=self.to_content(event.pos))
+            self.events.dispatch(pygame.event.Event(event.type, attributes))
+        elif event.type == pygame.MOUSEWHEEL:
+            hovered = self.events.hovered
+            if isinstance(hovered, Frame) or getattr(hovered, "draw_menu", False):
+                # Nested frames and open menus scroll themselves
+                self.events.dispatch(event)
+            elif self.scroll_step:
+                self.scroll(-event.x * self.scroll_step, -event.y * self.scroll_step)
+        elif event.type in KEY_EVENTS or event.type == pygame.WINDOWLEAVE:
+            self.events.dispatch(event)
+
+    def update(self):
+        """Update needs to be called every frame in the main loop."""
+        self.check_hover()
+        self.draw()
+
+    @profiled("render")
+    def draw(self, surface=None):
+        """
+        Repaint the dirty children into the content surface and blit the visible part of it
+        :param surface: the surface to draw on, defaults to master. A RenderQueue can be given as well
+        """
+        if self.dirty or self.manager.full_redraw or any(widget.dirty for widget in self.manager.widgets):
+            self.manager.update(poll=False)
+        target = self.master if surface is None else surface
+        target.blit(self.surface, self.rect, pygame.Rect(self.scroll_x, self.scroll_y, self.rect.w, self.rect.h))
+        self.dirty = False
@@ -0,0 +1,362 @@
+import pygame
+
+# Where a widget smaller than its parcel sits inside it, as fractions of the free space
+ANCHORS = {"nw": (0, 0), "n": (0.5, 0), "ne": (1, 0), "w": (0, 0.5), "center": (0.5, 0.5), "e": (1, 0.5),
+           "sw": (0, 1), "s": (0.5, 1), "se": (1, 1)}
+
+
+def _pad(value):
+    # Tkinter takes either one padding for both sides or a (before, after) pair
+    if isinstance(value, (tuple, list)):
+        return value[0], value[1]
+    return value, value
+
+
+def _anchored(size, parcel, anchor):
+    fx, fy = ANCHORS[anchor]
+    return pygame.Rect(parcel.x + int((parcel.w - size[0]) * fx), parcel.y + int((parcel.h - size[1]) * fy), *size)
+
+
+class Geometry:
+    """Base of the pack, grid and place geometry managers.
+
+    A manager arranges widgets, and other managers, inside its rect. The requested size of every child is measured
+    once and cached, as is the rect it was last given, so arranging again only touches the children whose rect
+    changes. Widgets arranged by a manager expose ``get_requested_size()`` and ``set_rect(rect)``, managers expose
+    the same two methods and can be nested:
+
+    root = Pack(screen.get_rect())
+    toolbar = Pack()
+    root.pack(toolbar, side="top", fill="x")
+    toolbar.pack(button, side="left", padx=4)
+    ...
+    root.set_rect(screen.get_rect())  # after a VIDEORESIZE event
+    root.update()  # once per frame, arranges again only if a child asked for another size
+    """
+
+    def __init__(self, rect=None):
+        """
+        :param rect: the area the children are arranged in, nested managers get theirs from their parent
+        """
+        self.rect = pygame.Rect(rect) if rect is not None else None
+        # Set by the manager this one is nested in
+        self.geometry = None
+        self.children = []
+        self._options = {}
+        self._sizes = {}
+        self._rects = {}
+        self._requested = None
+        self._dirty = True
+
+    def _add(self, child, options):
+        if child not in self._options:
+            if child.geometry is not None:
+                child.geometry.forget(child)
+            self.children.append(child)
+            child.geometry = self
+        self._options[child] = options
+        self.invalidate(child)
+
+    def forget(self, child):
+        """Stop arranging a child, it keeps its current rect."""
+        if child in self._options:
+            self.children.remove(child)
+            del self._options[child]
+            self._sizes.pop(child, None)
+            self._rects.pop(child, None)
+            child.geometry = None
+            self.invalidate()
+
+    def invalidate(self, child=None):
+        """Drop the cached size of a child, or of this manager, and arrange again on the next update. Widgets whose
+        requested size changes call this on their manager, the child is given its rect again even if it is unchanged
+        since the child may have set a rect of its own, eg. when scaled."""
+        manager = self
+        while manager is not None:
+            manager._sizes.pop(child, None)
+            manager._rects.pop(child, None)
+            manager._requested = None
+            manager._dirty = True
+            child, manager = manager, manager.geometry
+
+    def size_of(self, child):
+        """Return the cached requested size of a child."""
+        size = self._sizes.get(child)
+        if size is None:
+            size = self._sizes[child] = tuple(child.get_requested_size())
+        return size
+
+    def get_requested_size(self):
+        """Return the smallest size fitting every child at its requested size."""
+        if self._requested is None:
+            self._requested = self._measure()
+        return self._requested
+
+    def set_rect(self, rect):
+        """Arrange the children inside rect, nothing is done when rect and the children's sizes did not change."""
+        rect = pygame.Rect(rect)
+        if rect == self.rect and not self._dirty:
+            return
+        self.rect = rect
+        self._dirty = False
+        self._arrange(rect)
+
+    def update(self):
+        """Arrange the children again if any of them asked for another size since the last time."""
+        if self._dirty and self.rect is not None:
+            self.set_rect(self.rect)
+
+    def _give(self, child, rect):
+        # Children whose rect stays the same are skipped, unless they are managers with work of their own
+        if self._rects.get(child) != rect:
+            self._rects[child] = rect
+            child.set_rect(rect)
+        elif isinstance(child, Geometry):
+            child.update()
+
+    def _measure(self):
+        raise NotImplementedError
+
+    def _arrange(self, rect):
+        raise NotImplementedError
+
+
+class Pack(Geometry):
+    """Stacks children against the sides of the remaining space, like Tkinter's pack."""
+
+    def pack(self, child, side="top", fill="none", expand=False, anchor="center", padx=0, pady=0):
+        """
+        Arrange a child with the packer
+        :param child: a widget or another geometry manager
+        :param side: "top", "bottom", "left" or "right", the side of the remaining space the child is put against
+        :param fill: "none", "x", "y" or "both", the directions the child is stretched to fill its parcel in
+        :param expand: give the child a share of the space left over once every child got its requested size
+        :param anchor: where the child sits in its parcel when it does not fill it, eg. "n", "sw" or "center"
+        :param padx: the space left on the left and right of the child, one number or a (left, right) pair
+        :param pady: the space left above and below the child, one number or a (top, bottom) pair
+        """
+        self._add(child, (side, fill, expand, anchor, _pad(padx), _pad(pady)))
+
+    def _padded(self, child):
+        _, _, _, _, padx, pady = self._options[child]
+        width, height = self.size_of(child)
+        return width + padx[0] + padx[1], height + pady[0] + pady[1]
+
+    def _measure(self):
+        width = height = max_width = max_height = 0
+        for child in self.children:
+            side = self._options[child][0]
+            child_width, child_height = self._padded(child)
+            if side in ("top", "bottom"):
+                max_width = max(max_width, child_width + width)
+                height += child_height
+            else:
+                max_height = max(max_height, child_height + height)
+                width += child_width
+        return max(max_width, width), max(max_height, height)
+
+    def _expansion(self, index, cavity, vertical):
+        # The extra space an expanding child gets along the packing direction, shared with the expanding children
+        # after it and limited by what the children packed across that direction need
+        min_expand = cavity
+        expanding = 0
+        for child in self.children[index:]:
+            side, _, expand, _, _, _ = self._options[child]
+            size = self._padded(child)[1 if vertical else 0]
+            if (side in ("top", "bottom")) != vertical:
+                if expanding:
+                    min_expand = min(min_expand, (cavity - size) // expanding)
+            else:
+                cavity -= size
+                if expand:
+                    expanding += 1
+        if expanding:
+            min_expand = min(min_expand, cavity // expanding)
+        return max(0, min_expand)
+
+    def _arrange(self, rect):
+        cavity = rect.copy()
+        for index, child in enumerate(self.children):
+            side, fill, expand, anchor, padx, pady = self._options[child]
+            child_width, child_height = self._padded(child)
+            if side in ("top", "bottom"):
+                height = min(cavity.h, child_height + (self._expansion(index, cavity.h, True) if expand else 0))
+                y = cavity.y if side == "top" else cavity.bottom - height
+                parcel = pygame.Rect(cavity.x, y, cavity.w, height)
+                cavity.h -= height
+                if side == "top":
+                    cavity.y += height
+            else:
+                width = min(cavity.w, child_width + (self._expansion(index, cavity.w, False) if expand else 0))
+                x = cavity.x if side == "left" else cavity.right - width
+                parcel = pygame.Rect(x, cavity.y, width, cavity.h)
+                cavity.w -= width
+                if side == "left":
+                    cavity.x += width
+            parcel = pygame.Rect(parcel.x + padx[0], parcel.y + pady[0], max(0, parcel.w - padx[0] - padx[1]),
+                                 max(0, parcel.h - pady[0] - pady[1]))
+            width, height = self.size_of(child)
+            if fill in ("x", "both"):
+                width = parcel.w
+            if fill in ("y", "both"):
+                height = parcel.h
+            self._give(child, _anchored((min(width, parcel.w), min(height, parcel.h)), parcel, anchor))
+
+
+class Grid(Geometry):
+    """Arranges children in rows and columns, like Tkinter's grid."""
+
+    def __init__(self, rect=None):
+        super().__init__(rect)
+        self._row_config = {}
+        self._column_config = {}
+        # The minimum width of every column and height of every row, measured along with the requested size
+        self._columns = []
+        self._rows = []
+
+    def grid(self, child, row=0, column=0, rowspan=1, columnspan=1, sticky="", padx=0, pady=0):
+        """
+        Arrange a child in a cell of the grid
+        :param child: a widget or another geometry manager
+        :param row: the row of the cell, counted from 0
+        :param column: the column of the cell, counted from 0
+        :param rowspan: the number of rows the child covers
+        :param columnspan: the number of columns the child covers
+        :param sticky: any of "n", "s", "e" and "w", the sides of the cell the child sticks to. Sticking to
+                       opposite sides stretches the child, "" centers it
+        :param padx: the space left on the left and right of the child, one number or a (left, right) pair
+        :param pady: the space left above and below the child, one number or a (top, bottom) pair
+        """
+        self._add(child, (row, column, max(1, rowspan), max(1, columnspan), sticky.lower(), _pad(padx), _pad(pady)))
+
+    def rowconfigure(self, index, weight=0, minsize=0):
+        """
+        :param weight: the share of the extra height this row gets when the grid is taller than it needs to be
+        :param minsize: the smallest height of the row
+        """
+        self._row_config[index] = (weight, minsize)
+        self.invalidate()
+
+    def columnconfigure(self, index, weight=0, minsize=0):
+        """
+        :param weight: the share of the extra width this column gets when the grid is wider than it needs to be
+        :param minsize: the smallest width of the column
+        """
+        self._column_config[index] = (weight, minsize)
+        self.invalidate()
+
+    @staticmethod
+    def _sizes_along(spans, count, config):
+        # spans are (first, span, size) triples, single cells are fitted first and spanning children then grow the
+        # lines they cover evenly
+        sizes = [config.get(index, (0, 0))[1] for index in range(count)]
+        for first, span, size in sorted(spans, key=lambda each: each[1]):
+            lines = range(first, first + span)
+            missing = size - sum(sizes[index] for index in lines)
+            if missing > 0:
+                for offset, index in enumerate(lines):
+                    sizes[index] += missing // span + (1 if offset < missing % span else 0)
+        return sizes
+
+    def _measure(self):
+        columns = rows = 0
+        column_spans = []
+        row_spans = []
+        for child in self.children:
+            row, column, rowspan, columnspan, _, padx, pady = self._options[child]
+            width, height = self.size_of(child)
+            column_spans.append((column, columnspan, width + padx[0] + padx[1]))
+            row_spans.append((row, rowspan, height + pady[0] + pady[1]))
+            columns = max(columns, column + columnspan)
+            rows = max(rows, row + rowspan)
+        columns = max([columns] + [index + 1 for index in self._column_config])
+        rows = max([rows] + [index + 1 for index in self._row_config])
+        self._columns = self._sizes_along(column_spans, columns, self._column_config)
+        self._rows = self._sizes_along(row_spans, rows, self._row_config)
+        return sum(self._columns), sum(self._rows)
+
+    @staticmethod
+    def _offsets(sizes, config, start, available):
+        # Hand the space left over to the weighted lines and return where every line starts, plus the end
+        sizes = list(sizes)
+        weights = [config.get(index, (0, 0))[0] for index in range(len(sizes))]
+        extra = available - sum(sizes)
+        total = sum(weights)
+        if extra > 0 and total:
+            given = 0
+            for index, weight in enumerate(weights):
+                share = extra * weight // total
+                sizes[index] += share
+                given += share
+            # The rounding remainder goes to the last weighted line
+            sizes[max(index for index, weight in enumerate(weights) if weight)] += extra - given
+        offsets = [start]
+        for size in sizes:
+            offsets.append(offsets[-1] + size)
+        return offsets
+
+    def _arrange(self, rect):
+        self.get_requested_size()
+        x_offsets = self._offsets(self._columns, self._column_config, rect.x, rect.w)
+        y_offsets = self._offsets(self._rows, self._row_config, rect.y, rect.h)
+        for child in self.children:
+            row, column, rowspan, columnspan, sticky, padx, pady = self._options[child]
+            cell = pygame.Rect(x_offsets[column] + padx[0], y_offsets[row] + pady[0],
+                               x_offsets[column + columnspan] - x_offsets[column] - padx[0] - padx[1],
+                               y_offsets[row + rowspan] - y_offsets[row] - pady[0] - pady[1])
+            width, height = self.size_of(child)
+            width, height = min(width, max(0, cell.w)), min(height, max(0, cell.h))
+            if "e" in sticky and "w" in sticky:
+                width = cell.w
+            if "n" in sticky and "s" in sticky:
+                height = cell.h
+            fx = 1 if "e" in sticky and "w" not in sticky else 0 if "w" in sticky else 0.5
+            fy = 1 if "s" in sticky and "n" not in sticky else 0 if "n" in sticky else 0.5
+            self._give(child, pygame.Rect(cell.x + int((cell.w - width) * fx), cell.y + int((cell.h - height) * fy),
+                                          width, height))
+
+
+class Place(Geometry):
+    """Puts children at absolute or relative positions, like Tkinter's place."""
+
+    def place(self, child, x=0, y=0, relx=0.0, rely=0.0, width=None, height=None, relwidth=None, relheight=None,
+              anchor="nw"):
+        """
+        Arrange a child at a fixed spot, the position and size are the absolute value plus the relative one
+        :param child: a widget or another geometry manager
+        :param x: the x offset in pixels of the anchor point
+        :param y: the y offset in pixels of the anchor point
+        :param relx: the x offset of the anchor point as a fraction of the manager's width
+        :param rely: the y offset of the anchor point as a fraction of the manager's height
+        :param width: the width in pixels, defaults to the requested width
+        :param height: the height in pixels, defaults to the requested height
+        :param relwidth: the width as a fraction of the manager's width, added to width
+        :param relheight: the height as a fraction of the manager's height, added to height
+        :param anchor: which point of the child is put at the position, eg. "nw" or "center"
+        """
+        self._add(child, (x, y, relx, rely, width, height, relwidth, relheight, anchor))
+
+    def _measure(self):
+        # Only the absolute part of a placement needs room, relative placements follow whatever size is given
+        width = height = 0
+        for child in self.children:
+            x, y, relx, rely, child_width, child_height, _, _, _ = self._options[child]
+            requested = self.size_of(child)
+            width = max(width, x + (requested[0] if child_width is None else child_width))
+            height = max(height, y + (requested[1] if child_height is None else child_height))
+        return width, height
+
+    def _arrange(self, rect):
+        for child in self.children:
+            x, y, relx, rely, width, height, relwidth, relheight, anchor = self._options[child]
+            requested = self.size_of(child)
+            if width is None:
+                width = 0 if relwidth is not None else requested[0]
+            if height is None:
+                height = 0 if relheight is not None else requested[1]
+            width = int(width + (relwidth or 0) * rect.w)
+            height = int(height + (relheight or 0) * rect.h)
+            fx, fy = ANCHORS[anchor]
+            left = rect.x + int(x + relx * rect.w - width * fx)
+            top = rect.y + int(y + rely * rect.h - height * fy)
+            self._give(child, pygame.Rect(left, top, width, height))
@@ -0,0 +1,143 @@
+import hashlib
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+# The content digest of every surface seen so far, images are expected not to change once handed to a widget
+_digests = weakref.WeakKeyDictionary()
+
+
+def content_key(surface):
+    """Return a digest of a surface's size, format and pixels, surfaces with the same content get the same key."""
+    key = _digests.get(surface)
+    if key is None:
+        digest = hashlib.blake2b(pygame.image.tobytes(surface, "RGBA"), digest_size=16).digest()
+        key = _digests[surface] = (surface.get_size(), surface.get_flags() & pygame.SRCALPHA, digest)
+    return key
+
+
+class ImageCache:
+    """A least recently used cache of image variants keyed by the content of the source image.
+
+    Buttons using the same icon, even when it was loaded more than once, share one scaled, faded or greyed out
+    variant of it. Like the text cache, the surfaces handed out are shared and must not be modified.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        """
+        :param max_bytes: the amount of pixel memory the cached variants may use before the least recently used
+                          ones are evicted
+        """
+        self._surfaces = OrderedDict()
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def _get(self, key, make):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = make()
+        self.size_bytes += surface.get_pitch() * surface.get_height()
+        while self.size_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self.size_bytes -= old.get_pitch() * old.get_height()
+        return surface
+
+    def shared(self, surface):
+        """Return the first surface seen with the same content as surface, so duplicate loads share memory."""
+        return self._get(("shared", content_key(surface)), lambda: surface)
+
+    def scaled(self, surface, size):
+        """Return surface scaled to size."""
+        size = (int(size[0]), int(size[1]))
+        return self._get(("scaled", content_key(surface), size), lambda: pygame.transform.scale(surface, size))
+
+    def with_alpha(self, surface, alpha):
+        """Return a copy of surface with its surface alpha set, surface itself is returned for an opaque alpha."""
+        if alpha is None or alpha >= 255:
+            return surface
+
+        def make():
+            copy = surface.copy()
+            copy.set_alpha(alpha)
+            return copy
+        return self._get(("alpha", content_key(surface), alpha), make)
+
+    def disabled(self, surface):
+        """Return a greyed out variant of surface."""
+        return self._get(("disabled", content_key(surface)), lambda: pygame.transform.grayscale(surface))
+
+    def clear(self):
+        self._surfaces.clear()
+        self.size_bytes = 0
+
+
+# The process wide cache every button takes its image variants from
+image_cache = ImageCache()
+
+
+class TextureAtlas:
+    """Packs small images into a few large surfaces.
+
+    add() returns a subsurface of an atlas page, it behaves like any other surface but blitting it copies a
+    sub-rect of the page, and every icon added shares the memory of its page. Identical icons are only packed once.
+
+    atlas = TextureAtlas()
+    icon = atlas.add(pygame.image.load("save.png").convert_alpha())
+    Button(screen, (10, 10), image=icon)
+    """
+
+    def __init__(self, page_size=(1024, 1024), padding=1):
+        """
+        :param page_size: the size of every atlas page
+        :param padding: empty pixels left around every image so scaled blits do not bleed into neighbours
+        """
+        self.page_size = page_size
+        self.padding = padding
+        self.pages = []
+        self._regions = {}
+        # Shelf packing state of the last page: the top and height of the current shelf and the next free x
+        self._shelf_y = 0
+        self._shelf_h = 0
+        self._x = 0
+
+    def _new_page(self):
+        self.pages.append(pygame.Surface(self.page_size, pygame.SRCALPHA))
+        self._shelf_y = self._shelf_h = self._x = 0
+
+    def add(self, surface):
+        """Copy surface into the atlas and return the subsurface it occupies, images larger than a page are returned
+        unchanged."""
+        key = content_key(surface)
+        region = self._regions.get(key)
+        if region is not None:
+            return region
+
+        width, height = surface.get_width() + 2 * self.padding, surface.get_height() + 2 * self.padding
+        if width > self.page_size[0] or height > self.page_size[1]:
+            return surface
+        if not self.pages:
+            self._new_page()
+        if self._x + width > self.page_size[0]:
+            # Start a new shelf below the current one
+            self._shelf_y += self._shelf_h
+            self._shelf_h = self._x = 0
+        if self._shelf_y + height > self.page_size[1]:
+            self._new_page()
+
+        page = self.pages[-1]
+        rect = pygame.Rect(self._x + self.padding, self._shelf_y + self.padding, *surface.get_size())
+        page.blit(surface, rect, special_flags=pygame.BLEND_RGBA_MAX)
+        self._x += width
+        self._shelf_h = max(self._shelf_h, height)
+        region = self._regions[key] = page.subsurface(rect)
+        return region
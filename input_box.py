@@ -1,6 +1,17 @@
+import inspect
+import time
+import weakref
+
 import pygame
 
-pygame.init()
+from commands import runner
+from event_loop import after, after_cancel
+from fonts import font_from
+from image_cache import image_cache
+from profiler import profiled, profiler
+from scaling import rescaled_position, scaled, scaled_font, track
+from text_buffer import TextBuffer
+from text_cache import render
 
 
 def draw_bordered_rect(surface, rect, color, border_color, corner_radius, border_thickness):
@@ -23,86 +34,396 @@ def draw_bordered_rect(surface, rect, color, border_color, corner_radius, border
         pygame.draw.rect(surface, color, rect_tmp, border_radius=inner_radius)
 
 
+# The box surfaces drawn so far keyed by size, color and border radius
+_box_surfaces = {}
+
+
+def _call_weakly(method):
+    # The blink timers only hold their box weakly, so a box dropped while active is collected and its timer stops
+    method = method()
+    if method is not None:
+        method()
+
+
+def _init_scrap():
+    # The clipboard module is only started when it is first used, it needs the display to be set up
+    if not pygame.scrap.get_init():
+        pygame.scrap.init()
+
+
 class InputBox:
+    __slots__ = ("rect", "color", "color_active", "color_inactive", "color_hover", "font", "buffer", "font_color",
+                 "given_text", "_active", "function", "border_radius", "remove_active", "cursor_color",
+                 "selection_color", "function_every_user_press", "scroll_index", "_visible_end", "_blink_start",
+                 "_blink_timer", "drawn", "cursor_speed", "hovered", "dirty", "dispatcher", "geometry",
+                 "_requested_size", "_scale", "_unscaled", "txt_surface", "async_command", "on_result", "on_error",
+                 "future", "_origin", "__weakref__")
+
 
     def __init__(self, x: int, y: int, w: int, h: int, color_inactive: tuple[int, int, int] = (128, 128, 128),
                  color_active: tuple[int, int, int] = (255, 255, 255),
                  color_hover: tuple[int, int, int] = (135, 206, 235), function=None,
-                 font: pygame.font.Font = None, text: str = '',
+                 font: pygame.font.Font | tuple = None, text: str = '',
                  font_color: tuple[int, int, int] = (0, 0, 0), active: bool = False, border_radius: int = 0,
-                 remove_active=False, cursor_color=(0, 0, 0), function_every_user_press=None):
+                 remove_active=False, cursor_color=(0, 0, 0), function_every_user_press=None,
+                 selection_color=(173, 214, 255), async_command=False, on_result=None, on_error=None):
         self.rect = pygame.Rect(x, y, w, h)
         self.color = color_inactive
         self.color_active = color_active
         self.color_inactive = color_inactive
         self.color_hover = color_hover
-        self.font = font or pygame.font.Font(None, h - 5)
-        self.text = ""
+        self.font = font_from(font, h - 5)
+        self.buffer = TextBuffer(self.font)
         self.font_color = font_color
         self.given_text = text
-        self.active = active
+        self._active = active
         self.function = function
         self.border_radius = border_radius
         self.remove_active = remove_active
         self.cursor_color = cursor_color
+        self.selection_color = selection_color
         self.function_every_user_press = function_every_user_press
-        if self.active:
-            self.txt_surface = self.font.render(self.text, True, self.font_color)
-        else:
-            self.txt_surface = self.font.render(self.given_text, True, (238, 234, 222))
-            self.txt_surface.set_alpha(128)
-        self.draw_cursor = 0
+        # With async_command, or a coroutine function, the function runs through commands.runner and on_result or
+        # on_error get its outcome, Return is ignored while the future of the running command is set
+        self.async_command = async_command
+        self.on_result = on_result
+        self.on_error = on_error
+        self.future = None
+        # The first character shown, the text is scrolled by whole characters to keep the cursor inside the box, and
+        # the position the shown text ends at
+        self.scroll_index = 0
+        self._visible_end = 0
+        # The caret is shown for cursor_speed milliseconds and hidden for as long, counted from _blink_start
+        self._blink_start = 0
+        self._blink_timer = None
         self.drawn = False
         self.cursor_speed = 600
+        self.hovered = False
+        self.dirty = True
+        # Set by an EventDispatcher the box is registered with, it then feeds the hover state
+        self.dispatcher = None
+        # Set by the geometry manager the box is arranged by
+        self.geometry = None
+        self._requested_size = self.rect.size
+        self._scale = 1
+        self._origin = None
+        self._unscaled = (self.font, border_radius, self._requested_size)
+        self._render_text()
+        track(self)
+
+    @property
+    def active(self):
+        return self._active
+
+    @active.setter
+    def active(self, value):
+        if value != self._active:
+            self._active = value
+            self._restart_blink()
+        # The keyboard events only reach the box while it has the focus
+        if value and self.dispatcher is not None:
+            self.dispatcher.set_focus(self)
+
+    @property
+    def text(self):
+        return self.buffer.text
+
+    @text.setter
+    def text(self, value):
+        self.buffer.text = value
+        self._render_text()
+
+    def get_bounds(self):
+        """Return the rect covering everything the input box paints."""
+        return self.rect.copy()
+
+    def get_requested_size(self):
+        """Return the size the box was created with."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the box, this is how geometry managers arrange it
+        :param rect: the new rect of the box
+        """
+        rect = pygame.Rect(rect)
+        resized = rect.size != self.rect.size
+        self.rect = rect
+        if resized:
+            self._render_text()
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def apply_scale(self, scale):
+        """
+        Resize the box and measure and render its text with the font at a UI scale factor, scaling.set_scale calls
+        this. The box surfaces are cached per size, so the ones of scales used before are reused
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        font, border_radius, size = self._unscaled
+        position, self._origin = rescaled_position(self.rect.topleft, self._scale, scale, self._origin)
+        self._scale = scale
+        self.font = scaled_font(font, scale)
+        self.buffer.set_font(self.font)
+        self.border_radius = scaled(border_radius, scale)
+        self._requested_size = (scaled(size[0], scale), scaled(size[1], scale))
+        self.rect = pygame.Rect(position, self._requested_size)
+        self.scroll_index = 0
+        self._render_text()
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+        if self.geometry is not None:
+            self.geometry.invalidate(self)
+
+    def check_hover(self):
+        """Update the box color from the mouse position and step the cursor blink, marking the box dirty when either
+        changes."""
+        if self.dispatcher is None:
+            self.hovered = self.rect.collidepoint(pygame.mouse.get_pos())
+        self._update_color()
+        if self._advance_cursor():
+            self.dirty = True
+
+    def on_enter(self):
+        """Called when the mouse moves over the box."""
+        self.hovered = True
+        self._update_color()
+
+    def on_leave(self):
+        """Called when the mouse leaves the box."""
+        self.hovered = False
+        self._update_color()
+
+    def on_focus_out(self):
+        """Called when another widget is clicked, which deactivates the box like a click outside of it does."""
+        if self.active and not self.remove_active:
+            self.active = False
+            self._render_text()
+            self._update_color()
+
+    def _update_color(self):
+        if self.hovered:
+            color = self.color_hover
+        else:
+            color = self.color_inactive
+            # Change the current color of the input box.
+        if self.active:
+            color = self.color_active
+        if color != self.color:
+            self.color = color
+            self.dirty = True
+
+    def insert(self, text):
+        """Insert text at the cursor in one go, replacing the selected text, eg. for pasting."""
+        if not text:
+            return
+        if self.function_every_user_press:
+            profiler.call(self, self.function_every_user_press, text)
+        else:
+            self.buffer.insert(text)
+        self._render_text()
+
+    def check_events(self, event_list):
+        """
+        Handle a list of events, consecutive TEXTINPUT events are inserted as a single piece of text
+        :param event_list: the list obtained from pygame.event.get()
+        """
+        pending = []
+        for event in event_list:
+            if event.type == pygame.TEXTINPUT and self.active:
+                pending.append(event.text)
+                continue
+            if pending:
+                self.insert("".join(pending))
+                pending.clear()
+            self.check_event(event)
+        if pending:
+            self.insert("".join(pending))
 
+    @profiled("event")
     def check_event(self, event):
+        """
+        Handle a single event. Typed text arrives as TEXTINPUT events, KEYDOWN events are used for the editing keys
+        :param event: event is the event obtained from pygame.event.get()
+        """
         if event.type == pygame.MOUSEBUTTONDOWN and not self.remove_active:
             # If the user clicked on the input_box rect.
             if self.rect.collidepoint(event.pos):
                 # Toggle the active variable.
                 self.active = not self.active
+                if self.active:
+                    self.buffer.set_caret(self.buffer.index_at(event.pos[0] - self.rect.x - 5, self.scroll_index))
             else:
                 self.active = False
-        if self.rect.collidepoint(pygame.mouse.get_pos()):
-            self.color = self.color_hover
-        else:
-            self.color = self.color_inactive
-            # Change the current color of the input box.
-        if self.active:
-            self.color = self.color_active
-        if event.type == pygame.KEYDOWN:
-            if self.active:
-                if event.key == pygame.K_RETURN and self.text:
-                    if self.function:
-                        self.function(self.text)
-                elif event.key == pygame.K_BACKSPACE:
-                    self.text = self.text[:-1]
+            self._render_text()
+        if self.dispatcher is None:
+            self.hovered = self.rect.collidepoint(pygame.mouse.get_pos())
+        self._update_color()
+        if not self.active:
+            return
+        if event.type == pygame.TEXTINPUT:
+            self.insert(event.text)
+        elif event.type == pygame.KEYDOWN:
+            self._check_key(event)
+
+    @property
+    def busy(self):
+        """Whether an asynchronous command of the box is still running."""
+        return self.future is not None
+
+    def _command_done(self, future):
+        # Called by commands.runner.process() on the UI thread
+        self.future = None
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            if self.on_error is None:
+                raise error
+            profiler.call(self, self.on_error, error)
+        elif self.on_result is not None:
+            profiler.call(self, self.on_result, future.result())
+
+    def _check_key(self, event):
+        buffer = self.buffer
+        select = bool(event.mod & pygame.KMOD_SHIFT)
+        ctrl = event.mod & (pygame.KMOD_CTRL | pygame.KMOD_META)
+        if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            if self.text and self.function and self.future is None:
+                if self.async_command or inspect.iscoroutinefunction(self.function):
+                    self.future = runner.submit(self.function, self.text, callback=self._command_done)
                 else:
-                    if self.font.render(self.text + event.unicode, True,
-                                        self.font_color).get_width() <= self.rect.w - 10 and event.key != pygame.K_RETURN:
-                        if self.function_every_user_press:
-                            self.function_every_user_press(event.unicode)
-                        else:
-                            self.text += event.unicode
-                # Re-render the text.
-        if self.active:
-            self.txt_surface = self.font.render(self.text, True, self.font_color)
+                    profiler.call(self, self.function, self.text)
+            return
+        if event.key == pygame.K_BACKSPACE:
+            buffer.delete_back()
+        elif event.key == pygame.K_DELETE:
+            buffer.delete_forward()
+        elif event.key == pygame.K_LEFT:
+            buffer.move(-1, select)
+        elif event.key == pygame.K_RIGHT:
+            buffer.move(1, select)
+        elif event.key == pygame.K_HOME:
+            buffer.set_caret(0, select)
+        elif event.key == pygame.K_END:
+            buffer.set_caret(len(buffer), select)
+        elif ctrl and event.key == pygame.K_a:
+            buffer.select_all()
+        elif ctrl and event.key in (pygame.K_c, pygame.K_x) and buffer.selection():
+            try:
+                _init_scrap()
+                pygame.scrap.put_text(buffer.selected_text())
+            except (pygame.error, AttributeError):
+                return
+            if event.key == pygame.K_x:
+                buffer.delete_back()
+        elif ctrl and event.key == pygame.K_v:
+            try:
+                _init_scrap()
+                self.insert(pygame.scrap.get_text())
+            except (pygame.error, AttributeError):
+                pass
+            return
+        else:
+            return
+        self._render_text()
+
+    def _render_text(self):
+        """Render the part of the text that is visible inside the box, scrolling it to keep the cursor visible."""
+        self.dirty = True
+        if self._active:
+            self._restart_blink()
+        inner_width = self.rect.w - 10
+        if not self.active and not self.text:
+            # The cached surface is shared, so the faded placeholder is a shared copy from the image cache
+            self.txt_surface = image_cache.with_alpha(render(self.font, self.given_text, True, (238, 234, 222)), 128)
+            self.scroll_index = self._visible_end = 0
+            return
+
+        # Only the text around the visible part is measured, however long the whole text is
+        buffer = self.buffer
+        caret = buffer.caret
+        if caret < self.scroll_index:
+            self.scroll_index = caret
+        elif buffer.x_of(caret, self.scroll_index) > inner_width:
+            self.scroll_index = buffer.fit_before(caret, inner_width, self.scroll_index)
+        # The text after the caret is measured from the caret, when typing at the end there is none
+        end = buffer.index_at(inner_width - buffer.x_of(caret, self.scroll_index), caret)
+        if end == len(buffer) and self.scroll_index and buffer.width_of(self.scroll_index - 1, end) <= inner_width:
+            # Do not leave empty space on the right after deleting text
+            self.scroll_index = buffer.fit_before(end, inner_width)
+        # One more character, partly visible
+        self._visible_end = min(len(buffer), end + 1)
+        self.txt_surface = render(self.font, self.text[self.scroll_index:self._visible_end], True, self.font_color)
+
+    def _advance_cursor(self):
+        """Show or hide the cursor by the time since the blink started, returns True when it toggled."""
+        if not self._active:
+            return False
+        drawn = (time.monotonic() - self._blink_start) * 1000 // self.cursor_speed % 2 == 0
+        if drawn == self.drawn:
+            return False
+        self.drawn = drawn
+        return True
+
+    def _restart_blink(self):
+        # Editing and activating show the cursor at once, a timer wakes the main loop up for the next toggle
+        self._blink_start = time.monotonic()
+        self.drawn = self._active
+        self.dirty = True
+        if self._blink_timer is not None:
+            after_cancel(self._blink_timer)
+            self._blink_timer = None
+        if self._active:
+            self._blink_timer = after(self.cursor_speed, _call_weakly, weakref.WeakMethod(self._blink))
+
+    def _blink(self):
+        self._blink_timer = None
+        if not self._active:
+            return
+        if self._advance_cursor():
+            self.dirty = True
+        elapsed = (time.monotonic() - self._blink_start) * 1000
+        self._blink_timer = after(self.cursor_speed - elapsed % self.cursor_speed, _call_weakly,
+                                 weakref.WeakMethod(self._blink))
 
     def cursor(self, screen):
-        if self.active:
-            if (self.drawn and self.draw_cursor % self.cursor_speed != 0) or \
-                    (not self.drawn and self.draw_cursor % self.cursor_speed == 0):
-                pygame.draw.line(screen, self.cursor_color,
-                                 (self.txt_surface.get_width() + self.rect.x + 5, self.rect.y + 7),
-                                 (self.txt_surface.get_width() + self.rect.x + 5, self.rect.bottom - 7), width=2)
-                self.drawn = True
-            else:
-                self.drawn = False
-            self.draw_cursor += 1
-            if self.draw_cursor == self.cursor_speed:
-                self.draw_cursor = 0
+        if self.active and self.drawn:
+            x = self.rect.x + 5 + self.buffer.x_of(self.buffer.caret, self.scroll_index)
+            screen.fill(self.cursor_color, (x - 1, self.rect.y + 7, 2, self.rect.h - 13))
 
     def update(self, screen):
-        draw_bordered_rect(screen, self.rect, self.color, (0, 0, 0), self.border_radius, 2)
-        screen.blit(self.txt_surface, (self.rect.x + 5, self.rect.y + 5))
+        self._advance_cursor()
+        self.draw(screen)
+
+    def _box_surface(self):
+        # The bordered box in its current color, drawn once per color and size and shared by every box looking alike
+        key = (self.rect.size, tuple(self.color), self.border_radius)
+        box = _box_surfaces.get(key)
+        if box is None:
+            if len(_box_surfaces) > 64:
+                _box_surfaces.clear()
+            box = _box_surfaces[key] = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+            draw_bordered_rect(box, box.get_rect(), self.color, (0, 0, 0), self.border_radius, 2)
+        return box
+
+    @profiled("render")
+    def draw(self, screen):
+        """Paint the box, its text and the cursor without stepping the blink counter. Only blit and fill are used, so
+        screen can also be a RenderQueue."""
+        screen.blit(self._box_surface(), self.rect)
+        inner = pygame.Rect(self.rect.x + 5, self.rect.y + 5, self.rect.w - 10, self.rect.h - 5)
+        selection = self.buffer.selection() if self.active else None
+        if selection:
+            # Clamped to the visible text, so the text scrolled out of the box is not measured
+            start, end = self.scroll_index, self._visible_end
+            left = inner.x + self.buffer.x_of(min(max(selection[0], start), end), start)
+            right = min(inner.right, inner.x + self.buffer.x_of(min(max(selection[1], start), end), start))
+            screen.fill(self.selection_color, (left, inner.y, right - left, self.txt_surface.get_height()))
+        # Only the part of the rendered text that lies inside the box is blitted
+        screen.blit(self.txt_surface, inner.topleft, pygame.Rect(0, 0, inner.w, inner.h))
         self.cursor(screen)
+        self.dirty = False
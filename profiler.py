@@ -0,0 +1,151 @@
+import time
+import weakref
+from collections import deque
+from functools import wraps
+
+import pygame
+
+from fonts import get_font
+from text_cache import render
+
+KINDS = ("render", "event", "command")
+
+
+class Profiler:
+    """Opt-in timing of widget rendering, event handling and command callbacks.
+
+    The widgets always report to the shared ``profiler`` instance, while it is disabled that is a single attribute
+    check. Call end_frame() once per frame to close the frame statistics:
+
+    profiler.enable()
+    ...
+    profiler.end_frame()
+    profiler.draw_overlay(screen)
+
+    Event times include the time of the command the event triggered.
+    """
+
+    def __init__(self, frame_budget_ms=1000 / 60, history=120):
+        """
+        :param frame_budget_ms: the time a frame may take, the overlay shows the frames against it
+        :param history: the number of past frame times kept
+        """
+        self.enabled = False
+        self.frame_budget_ms = frame_budget_ms
+        self.frame_times = deque(maxlen=history)
+        self.last_frame = {}
+        self._frame = {}
+        self._totals = weakref.WeakKeyDictionary()
+        self._frame_start = None
+        self._font = None
+
+    def enable(self):
+        self.enabled = True
+        self._frame_start = time.perf_counter()
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget every statistic gathered so far."""
+        self.frame_times.clear()
+        self.last_frame = {}
+        self._frame = {}
+        self._totals = weakref.WeakKeyDictionary()
+
+    def record(self, widget, kind, elapsed):
+        """Add elapsed seconds spent in kind ("render", "event" or "command") to a widget's statistics."""
+        for table in (self._frame, self._totals):
+            stats = table.get(widget)
+            if stats is None:
+                stats = table[widget] = {name: [0, 0.0] for name in KINDS}
+            stats[kind][0] += 1
+            stats[kind][1] += elapsed
+
+    def call(self, widget, function, *args):
+        """Call a user command on behalf of a widget, timing it while the profiler is enabled."""
+        if not self.enabled:
+            return function(*args)
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(widget, "command", time.perf_counter() - start)
+
+    def end_frame(self):
+        """Close the statistics of the current frame, call it once per frame."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self.frame_times.append((now - self._frame_start) * 1000)
+        self._frame_start = now
+        self.last_frame, self._frame = self._frame, {}
+
+    @staticmethod
+    def _summary(widget, stats):
+        summary = {"widget": widget, "name": describe(widget)}
+        for kind, (calls, total) in stats.items():
+            summary[kind + "_calls"] = calls
+            summary[kind + "_ms"] = total * 1000
+        summary["total_ms"] = sum(total for _, total in stats.values()) * 1000
+        return summary
+
+    def widget_stats(self, widget, frame=True):
+        """Return the calls and milliseconds per kind of a widget for the last frame, or since it was first seen."""
+        stats = (self.last_frame if frame else self._totals).get(widget)
+        return self._summary(widget, stats or {kind: [0, 0.0] for kind in KINDS})
+
+    def slowest(self, count=5, frame=True):
+        """Return the statistics of the widgets that took the longest in the last frame, or since they were first
+        seen, slowest first."""
+        table = self.last_frame if frame else self._totals
+        summaries = [self._summary(widget, stats) for widget, stats in list(table.items())]
+        summaries.sort(key=lambda summary: summary["total_ms"], reverse=True)
+        return summaries[:count]
+
+    def draw_overlay(self, surface, position=(5, 5), count=5):
+        """Draw the last frame time against the frame budget and the slowest widgets of the last frame."""
+        if self._font is None:
+            self._font = get_font(None, 18)
+        frame_ms = self.frame_times[-1] if self.frame_times else 0.0
+        over = frame_ms > self.frame_budget_ms
+        lines = [(f"frame {frame_ms:.2f} / {self.frame_budget_ms:.2f} ms", (255, 90, 90) if over else (120, 255, 120))]
+        for summary in self.slowest(count):
+            lines.append((f"{summary['total_ms']:.3f} ms  {summary['name']}", (255, 255, 255)))
+
+        line_height = self._font.get_linesize()
+        panel = pygame.Surface((260, line_height * len(lines) + 10), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        # The bar fills up as the frame uses its budget
+        fraction = min(1.0, frame_ms / self.frame_budget_ms) if self.frame_budget_ms else 0.0
+        panel.fill(lines[0][1], (0, 0, int(panel.get_width() * fraction), 3))
+        for index, (text, color) in enumerate(lines):
+            panel.blit(render(self._font, text, True, color), (5, 5 + index * line_height))
+        surface.blit(panel, position)
+
+
+def describe(widget):
+    """Return a short human readable name of a widget."""
+    label = getattr(widget, "text", None) or getattr(widget, "main", None) or ""
+    return f"{type(widget).__name__} {label!s:.24}".strip()
+
+
+# The instance every widget reports to
+profiler = Profiler()
+
+
+def profiled(kind):
+    """Decorator timing a widget method as kind while the shared profiler is enabled."""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not profiler.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                profiler.record(self, kind, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+import pygame
+
+BASE = 0
+OVERLAY = 1
+POPUP = 2
+TOOLTIP = 3
+LAYERS = (BASE, OVERLAY, POPUP, TOOLTIP)
+
+
+class RenderQueue:
+    """Collects the draw operations of a frame and flushes them with one Surface.blits() call per layer.
+
+    A queue can be handed to a widget's draw() in place of a surface, it supports the blit, blits and fill calls the
+    widgets draw with. Everything is painted in layer order, so a popup such as an open DropDown menu stays above
+    widgets drawn after it:
+
+    queue = RenderQueue()
+    button.draw(queue)
+    dropdown.draw(queue)
+    queue.flush(screen)
+    """
+
+    def __init__(self, layer=BASE):
+        """
+        :param layer: the layer blit, blits and fill submit to
+        """
+        self.layer = layer
+        self._layers = {layer: [] for layer in LAYERS}
+        # Plain colored surfaces standing in for fills, so they can be batched with the blits
+        self._solids = {}
+
+    def __len__(self):
+        return sum(len(operations) for operations in self._layers.values())
+
+    def on_layer(self, layer):
+        """Return a view of the queue whose blit, blits and fill submit to another layer."""
+        return _LayerView(self, layer)
+
+    def submit(self, source, dest, area=None, special_flags=0, layer=None):
+        """Queue a blit of source at dest, layer defaults to the queue's layer."""
+        self._layers[self.layer if layer is None else layer].append((source, dest, area, special_flags))
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.submit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=True, layer=None):
+        operations = self._layers[self.layer if layer is None else layer]
+        for blit in blit_sequence:
+            source, dest, area, special_flags = (tuple(blit) + (None, 0))[:4]
+            operations.append((source, dest, area, special_flags or 0))
+
+    def fill(self, color, rect=None, special_flags=0, layer=None):
+        """Queue filling rect with color, rect is required since the queue has no size of its own."""
+        rect = pygame.Rect(rect)
+        if rect.w <= 0 or rect.h <= 0:
+            return
+        color = pygame.Color(color)
+        key = (rect.size, tuple(color))
+        solid = self._solids.get(key)
+        if solid is None:
+            if len(self._solids) > 256:
+                self._solids.clear()
+            solid = pygame.Surface(rect.size, pygame.SRCALPHA if color.a < 255 else 0)
+            solid.fill(color)
+            self._solids[key] = solid
+        self.submit(solid, rect.topleft, None, special_flags, layer)
+
+    def clear(self):
+        """Drop the queued operations without drawing them."""
+        for operations in self._layers.values():
+            operations.clear()
+
+    def flush(self, target, return_rects=False):
+        """
+        Draw every queued operation onto target, layer by layer, and empty the queue
+        :param target: the surface to draw on
+        :param return_rects: return the rects that were drawn to, eg. for pygame.display.update
+        """
+        rects = []
+        for layer in LAYERS:
+            operations = self._layers[layer]
+            if operations:
+                drawn = target.blits(operations, return_rects)
+                if return_rects:
+                    rects.extend(drawn)
+                operations.clear()
+        return rects if return_rects else None
+
+
+class _LayerView:
+    """The part of a RenderQueue that submits to one layer."""
+
+    def __init__(self, queue, layer):
+        self.queue = queue
+        self.layer = layer
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        self.queue.submit(source, dest, area, special_flags, self.layer)
+
+    def blits(self, blit_sequence, doreturn=True):
+        self.queue.blits(blit_sequence, doreturn, self.layer)
+
+    def fill(self, color, rect=None, special_flags=0):
+        self.queue.fill(color, rect, special_flags, self.layer)
@@ -0,0 +1,80 @@
+import weakref
+
+from fonts import font_key, get_font
+from image_cache import image_cache
+
+# The factor every tracked widget is drawn at, sizes given to the widgets are in unscaled pixels
+_scale = 1.0
+_widgets = weakref.WeakSet()
+
+
+def get_scale():
+    """Return the current UI scale factor."""
+    return _scale
+
+
+def set_scale(scale):
+    """
+    Change the UI scale factor, every widget created so far is resized and its text rasterized again at the scaled
+    font size. Surfaces rendered at a scale used before are taken from the caches instead of being rendered again
+    :param scale: the factor sizes are multiplied by, eg. 2 for a 4K display showing a UI laid out for 1080p
+    """
+    global _scale
+    if scale <= 0:
+        raise ValueError("the scale factor must be positive")
+    _scale = scale
+    for widget in list(_widgets):
+        widget.apply_scale(scale)
+
+
+def track(widget):
+    """Have a widget follow set_scale, it is scaled right away when the scale is not 1. Widgets call this at the
+    end of __init__ and implement apply_scale(scale)."""
+    _widgets.add(widget)
+    if _scale != 1:
+        widget.apply_scale(_scale)
+
+
+def scaled(value, scale=None):
+    """Return a length in unscaled pixels multiplied by the scale factor and rounded."""
+    return round(value * (_scale if scale is None else scale))
+
+
+def rescaled_position(position, old_scale, scale, origin=None):
+    """
+    Return where a widget at position goes at a new scale factor, and the origin to pass the next time. The position
+    is derived from the unscaled one, so going back and forth between scales does not move the widget by a pixel at
+    a time, a widget moved since the last call is scaled from where it is now
+    :param position: the (x, y) of the widget at old_scale
+    :param origin: what the last call returned for this widget, None the first time
+    """
+    if origin is not None and origin[1] == tuple(position):
+        unscaled = origin[0]
+    else:
+        unscaled = (position[0] / old_scale, position[1] / old_scale)
+    position = (round(unscaled[0] * scale), round(unscaled[1] * scale))
+    return position, (unscaled, position)
+
+
+def scaled_font(font, scale=None):
+    """
+    Return the shared font matching font at the scaled size. Only fonts obtained from get_font, or given to a widget
+    as a (path, size) pair, know their file and can be rasterized again, any other font is returned unchanged
+    """
+    scale = _scale if scale is None else scale
+    key = font_key(font)
+    if key is None or scale == 1:
+        return font
+    path, size, bold, italic, underline = key
+    return get_font(path, max(1, round(size * scale)), bold, italic, underline)
+
+
+def scaled_image(image, scale=None):
+    """Return an image, or a list of images, resized by the scale factor through the shared image cache."""
+    scale = _scale if scale is None else scale
+    if image is None or scale == 1:
+        return image
+    if isinstance(image, list):
+        return [scaled_image(each, scale) for each in image]
+    return image_cache.scaled(image, (max(1, round(image.get_width() * scale)),
+                                      max(1, round(image.get_height() * scale))))
@@ -0,0 +1,65 @@
+from typing import Any, NamedTuple
+
+import pygame
+
+# Every distinct style created so far, so buttons built with the same look share one object
+_styles = {}
+MAX_SHARED_STYLES = 1024
+
+
+def _freeze(value):
+    # Colors given as lists or pygame.Color are stored as tuples, so equal styles compare and hash equal
+    if isinstance(value, (list, pygame.Color)):
+        return tuple(value)
+    return value
+
+
+class Style(NamedTuple):
+    """The look of a button: colors, font, border and sounds.
+
+    A style is immutable and shared, Style.shared() hands out one object per distinct look, so a screen of buttons
+    built with the same arguments holds a single style. Use replace() to get a style that differs in some fields:
+
+    primary = Style.shared(bg=(30, 90, 200), fg=(255, 255, 255), border_radius=6)
+    ok = Button(screen, (10, 10), text="OK", style=primary)
+    danger = Button(screen, (10, 50), text="Delete", style=primary.replace(bg=(200, 40, 40)))
+    """
+    bg: Any = (255, 255, 255)
+    highlight_color: Any = None
+    active_background: Any = None
+    fg: Any = (0, 0, 0)
+    hover_font_color: Any = None
+    active_foreground: Any = None
+    font: Any = None
+    click_sound: Any = None
+    hover_sound: Any = None
+    border_radius: int = 0
+    border_color: Any = None
+    bd: int = 7
+    fill_bg: bool = True
+    disabled_color: Any = None
+    disabled_border_color: Any = None
+    alpha: int = 255
+    justify: str = "center"
+    image_align: str = "bottom"
+    transition_ms: int = 0
+
+    @classmethod
+    def shared(cls, **fields):
+        """Return the shared style with these fields, the ones not given take the Button defaults."""
+        style = cls(**fields)
+        try:
+            shared = _styles.get(style)
+        except TypeError:
+            # A color was given as a list or pygame.Color
+            style = cls(**{name: _freeze(value) for name, value in fields.items()})
+            shared = _styles.get(style)
+        if shared is None:
+            if len(_styles) >= MAX_SHARED_STYLES:
+                _styles.clear()
+            shared = _styles[style] = style
+        return shared
+
+    def replace(self, **changes):
+        """Return the shared style equal to this one but for the fields given."""
+        return Style.shared(**dict(self._asdict(), **changes))
@@ -0,0 +1,19 @@
+import os
+import sys
+
+# The widgets are plain modules at the top of the repository, and the tests run without a window
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+
+@pytest.fixture
+def screen():
+    """A window on SDL's dummy video driver."""
+    pygame.display.init()
+    pygame.font.init()
+    yield pygame.display.set_mode((400, 300))
+    pygame.display.quit()
@@ -0,0 +1,95 @@
+import pygame
+import pytest
+
+import animation
+from animation import KEYFRAMES, KeyframeCache, Transition, keyframes
+from event_loop import loop
+
+
+@pytest.fixture
+def cache(screen):
+    """Empties the shared keyframe cache and stops the animator after the test."""
+    animation.keyframe_cache.clear()
+    yield animation.keyframe_cache
+    animation.keyframe_cache.clear()
+    if animation.animator._timer is not None:
+        loop.after_cancel(animation.animator._timer)
+        animation.animator._timer = None
+    animation.animator.widgets.clear()
+
+
+def solid(color, size):
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill(color)
+    return surface
+
+
+def test_keyframes_go_from_start_to_end():
+    start, end = solid((255, 0, 0, 255), (10, 10)), solid((0, 0, 255, 255), (20, 30))
+    frames = keyframes(start, end)
+    assert len(frames) == KEYFRAMES
+    assert frames[0] is start and frames[-1] is end
+    sizes = [frame.get_size() for frame in frames]
+    assert sizes == sorted(sizes)
+    middle = frames[KEYFRAMES // 2].get_at((0, 0))
+    assert middle.r < 255 and middle.b > 0
+
+
+def test_the_cache_makes_keyframes_once_per_key():
+    cache = KeyframeCache()
+    made = []
+
+    def start():
+        made.append("start")
+        return solid((255, 0, 0, 255), (10, 10))
+
+    def end():
+        return solid((0, 255, 0, 255), (10, 10))
+
+    frames = cache.get("a", start, end)
+    assert cache.get("a", start, end) is frames
+    assert (cache.hits, cache.misses, made) == (1, 1, ["start"])
+
+
+def test_the_least_recently_used_keyframes_are_evicted():
+    def one():
+        return solid((0, 0, 0, 255), (10, 10))
+
+    size = KeyframeCache._size(keyframes(one(), one()))
+    cache = KeyframeCache(max_bytes=2 * size)
+    cache.get("a", one, one)
+    cache.get("b", one, one)
+    cache.get("a", one, one)
+    cache.get("c", one, one)
+    assert list(cache._frames) == ["a", "c"]
+    assert cache.size_bytes == 2 * size
+
+
+def test_alike_buttons_share_their_keyframes(cache):
+    from button import Button
+    screen = pygame.display.get_surface()
+    buttons = [Button(screen, (0, 40 * row), text="Save", width=60, height=24, transition_ms=200) for row in range(3)]
+    for button in buttons:
+        button.draw()
+        button.on_enter()
+        button.draw()
+        assert button.animating
+    assert (cache.misses, cache.hits) == (1, 2)
+    assert len(cache) == 1
+    other = Button(screen, (100, 0), text="Open", width=60, height=24, transition_ms=200)
+    other.draw()
+    other.on_enter()
+    other.draw()
+    assert cache.misses == 2
+
+
+def test_a_transition_reversed_halfway_continues_from_the_frame_shown():
+    transition = Transition("normal", "hovered", 1.0, started=0)
+    assert transition.progress(now=0.25) == 0.25
+    assert transition.progress(now=5) == 1.0
+    back = Transition("normal", "hovered", 1.0).retarget("normal", 1.0)
+    assert (back.start_state, back.end_state) == ("hovered", "normal")
+    assert back.progress() > 0.99
+    other = Transition("normal", "hovered", 1.0).retarget("clicked", 0.5)
+    assert (other.start_state, other.end_state, other.duration) == ("normal", "clicked", 0.5)
+    assert Transition("normal", "hovered", 0).progress() == 1.0
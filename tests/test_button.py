@@ -0,0 +1,50 @@
+import pygame
+
+from button import Button
+
+
+def make(screen, **options):
+    return Button(screen, (10, 10), text="Save", width=80, height=30, bg=(255, 255, 255),
+                  highlight_color=(0, 0, 255), **options)
+
+
+def test_state_surfaces_are_built_once_and_reused(screen):
+    button = make(screen)
+    button.draw()
+    normal = button._state_surfaces["normal"]
+    button.on_enter()
+    button.draw()
+    hovered = button._state_surfaces["hovered"]
+    assert hovered is not normal
+    button.on_leave()
+    button.draw()
+    button.on_enter()
+    button.draw()
+    assert button._state_surfaces["normal"] is normal and button._state_surfaces["hovered"] is hovered
+
+
+def test_a_style_change_rebuilds_the_state_surfaces(screen):
+    button = make(screen)
+    button.draw()
+    normal = button._state_surfaces["normal"]
+    assert screen.get_at((14, 14))[:3] == (255, 255, 255)
+    button.color = (255, 0, 0)
+    assert button.dirty
+    button.draw()
+    assert button._state_surfaces["normal"] is not normal
+    assert screen.get_at((14, 14))[:3] == (255, 0, 0)
+
+
+def test_a_text_change_rebuilds_the_state_surfaces(screen):
+    button = make(screen)
+    button.draw()
+    normal = button._state_surfaces["normal"]
+    button.text = "Open"
+    button.render_text()
+    button.draw()
+    assert button._state_surfaces["normal"] is not normal
+
+
+def test_buttons_alike_share_their_style(screen):
+    assert make(screen).style is make(screen).style
+    assert make(screen).style is not make(screen, fg=(9, 9, 9)).style
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pygame
+import pytest
+
+import commands
+from commands import CommandRunner
+
+
+@pytest.fixture
+def runner():
+    runner = CommandRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def deliver(runner, count=1, timeout=5):
+    """Call process() until count commands were delivered."""
+    delivered = 0
+    deadline = time.monotonic() + timeout
+    while delivered < count:
+        assert time.monotonic() < deadline, "the commands did not finish"
+        delivered += runner.process()
+        time.sleep(0.001)
+    return delivered
+
+
+def test_callbacks_run_on_the_thread_calling_process(runner):
+    release = threading.Event()
+    results = []
+    future = runner.submit(lambda value: release.wait(5) and value * 2, 21,
+                           callback=lambda done: results.append((done.result(), threading.current_thread())))
+    assert runner.pending == 1
+    assert runner.process() == 0 and not results
+    release.set()
+    future.result(5)
+    deliver(runner)
+    assert results == [(42, threading.current_thread())]
+    assert runner.pending == 0
+
+
+def test_coroutine_functions_run_on_the_event_loop(runner):
+    async def add(a, b):
+        return a + b
+
+    results = []
+    runner.submit(add, 2, 3, callback=lambda done: results.append(done.result()))
+    deliver(runner)
+    assert results == [5]
+
+
+def test_errors_are_delivered_through_the_future(runner):
+    def fail():
+        raise KeyError("missing")
+
+    async def fail_async():
+        raise ValueError("bad")
+
+    errors = []
+    runner.submit(fail, callback=lambda done: errors.append(done.exception()))
+    runner.submit(fail_async, callback=lambda done: errors.append(done.exception()))
+    deliver(runner, 2)
+    assert sorted(type(error).__name__ for error in errors) == ["KeyError", "ValueError"]
+    assert runner.pending == 0
+
+
+def test_the_runner_starts_again_after_shutdown(runner):
+    runner.submit(int, "1")
+    deliver(runner)
+    runner.shutdown()
+    future = runner.submit(int, "2")
+    deliver(runner)
+    assert future.result() == 2
+
+
+def test_a_button_delivers_its_command_result(screen):
+    from button import Button
+    results, errors = [], []
+    button = Button(screen, (0, 0), command=lambda: 7, width=40, height=20, async_command=True,
+                    on_result=results.append, on_error=errors.append)
+    button.check_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(5, 5), button=1))
+    button.check_event(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(5, 5), button=1))
+    assert button.busy
+    deliver(commands.runner)
+    assert results == [7] and not errors
+    assert not button.busy and button.value_from_function == 7
+
+    button.function = lambda: 1 / 0
+    button.check_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(5, 5), button=1))
+    button.check_event(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(5, 5), button=1))
+    deliver(commands.runner)
+    assert results == [7] and isinstance(errors[0], ZeroDivisionError)
@@ -0,0 +1,85 @@
+import pygame
+
+from dropdown import DropDown
+
+COLORS = [(200, 200, 200), (150, 150, 150)]
+
+
+def make(options, max_visible=0, command=None):
+    return DropDown(COLORS, COLORS, 10, 10, 100, 20, (None, 20), "menu", options, command, max_visible)
+
+
+def press(dropdown, pos):
+    return dropdown.check_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def test_find_sees_options_replaced_in_place(screen):
+    dropdown = make(["alpha", "beta", "gamma", "delta"])
+    assert dropdown.find("ga") == 2
+    dropdown.options[3] = "zeta"
+    assert dropdown.find("ze") == 3
+    assert dropdown.find("de") == -1
+
+
+def test_press_acts_where_it_happened_without_a_dispatcher(screen):
+    picked = []
+    dropdown = make(["alpha", "beta", "gamma"], command=picked.append)
+    # No hover poll ran before the presses, as when EventLoop.mainloop hands the events over
+    press(dropdown, (20, 15))
+    assert dropdown.draw_menu
+    assert press(dropdown, (20, 10 + 2 * 20 + 5)) == 1
+    assert picked == [1] and not dropdown.draw_menu
+
+
+def test_option_at_maps_rows_to_visible_options(screen):
+    dropdown = make([f"option {i}" for i in range(100)], max_visible=5)
+    assert dropdown.option_at((20, 45)) == -1
+    dropdown.draw_menu = True
+    # The rows start below the 20 pixel high header at y 10
+    assert dropdown.option_at((20, 30)) == 0
+    assert dropdown.option_at((20, 30 + 4 * 20 + 19)) == 4
+    assert dropdown.option_at((20, 30 + 5 * 20)) == -1
+    assert dropdown.option_at((20, 15)) == -1
+    assert dropdown.option_at((110, 30)) == -1
+    dropdown.scroll_to(40)
+    assert dropdown.option_at((20, 30 + 20)) == 41
+
+
+def test_scrolling_stays_inside_the_list(screen):
+    dropdown = make([f"option {i}" for i in range(100)], max_visible=5)
+    dropdown.draw_menu = True
+    dropdown.scroll_to(200)
+    assert dropdown.scroll == 95
+    dropdown.scroll_to(-3)
+    assert dropdown.scroll == 0
+    dropdown.check_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-3))
+    assert dropdown.scroll == 3
+    dropdown.see(50)
+    assert dropdown.scroll == 46
+    dropdown.see(10)
+    assert dropdown.scroll == 10
+
+
+def test_a_shorter_list_clamps_the_scroll_and_highlight(screen):
+    dropdown = make([f"option {i}" for i in range(100)], max_visible=5)
+    dropdown.draw_menu = True
+    dropdown.scroll_to(90)
+    dropdown.active_option = 93
+    dropdown.options = ["a", "b", "c"]
+    assert dropdown.option_at((20, 30)) == 0
+    assert dropdown.scroll == 0 and dropdown.active_option == -1
+    dropdown.draw(screen)
+    dropdown.options = []
+    dropdown.draw(screen)
+    dropdown.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0))
+    assert dropdown.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, mod=0)) == -1
+
+
+def test_keys_move_the_highlight_into_view(screen):
+    dropdown = make([f"option {i}" for i in range(20)], max_visible=3)
+    dropdown.draw_menu = True
+    for _ in range(5):
+        dropdown.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_DOWN, mod=0))
+    assert dropdown.active_option == 4 and dropdown.scroll == 2
+    dropdown.check_event(pygame.event.Event(pygame.TEXTINPUT, text="option 1"))
+    assert dropdown.active_option == 1 and dropdown.scroll == 1
@@ -0,0 +1,86 @@
+import pytest
+
+import event_loop
+from event_loop import EventLoop
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable time.monotonic for the loop."""
+    now = [100.0]
+    monkeypatch.setattr(event_loop.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_timers_run_in_order_of_due_time(clock):
+    loop = EventLoop()
+    calls = []
+    loop.after(30, calls.append, "c")
+    loop.after(10, calls.append, "a")
+    loop.after(20, calls.append, "b")
+    assert loop.run_timers() == 0
+    clock[0] += 0.025
+    assert loop.run_timers() == 2
+    assert calls == ["a", "b"]
+    clock[0] += 1
+    loop.run_timers()
+    assert calls == ["a", "b", "c"]
+
+
+def test_timers_due_together_run_in_order_scheduled(clock):
+    loop = EventLoop()
+    calls = []
+    for name in "xyz":
+        loop.after(5, calls.append, name)
+    loop.after_idle(calls.append, "idle")
+    clock[0] += 0.005
+    loop.run_timers()
+    assert calls == ["idle", "x", "y", "z"]
+
+
+def test_timeout_skips_cancelled_timers(clock):
+    loop = EventLoop()
+    assert loop.timeout() is None
+    first = loop.after(10, print)
+    loop.after(50, print)
+    assert loop.timeout() == pytest.approx(0.010)
+    loop.after_cancel(first)
+    assert loop.timeout() == pytest.approx(0.050)
+    clock[0] += 1
+    assert loop.timeout() == 0
+
+
+def test_cancelled_and_finished_timers_are_ignored(clock):
+    loop = EventLoop()
+    calls = []
+    timer = loop.after(0, calls.append, 1)
+    loop.after_cancel(timer)
+    loop.run_timers()
+    assert calls == []
+    timer = loop.after(0, calls.append, 2)
+    loop.run_timers()
+    loop.after_cancel(timer)
+    loop.after_cancel("after#unknown")
+    assert calls == [2]
+
+
+def test_timer_scheduled_from_a_timer_waits_for_the_next_run(clock):
+    loop = EventLoop()
+    calls = []
+
+    def again():
+        calls.append(len(calls))
+        loop.after(0, again)
+    loop.after(0, again)
+    loop.run_timers()
+    loop.run_timers()
+    assert calls == [0, 1]
+
+
+def test_cancelling_compacts_the_heap(clock):
+    loop = EventLoop()
+    timers = [loop.after(1000, print) for _ in range(1000)]
+    for timer in timers[:-1]:
+        loop.after_cancel(timer)
+    assert len(loop._heap) <= 2 * len(loop._timers) + 64
+    assert loop.timeout() == pytest.approx(1.0)
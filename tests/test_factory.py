@@ -0,0 +1,31 @@
+import pygame
+
+from Label import Label
+from button import Button
+from factory import build_widgets, prerender
+from input_box import InputBox
+from text_cache import text_cache
+
+BUTTON = {"type": "button", "text": "Save", "fg": [10, 20, 30], "hover_font_color": pygame.Color(1, 2, 3)}
+SPECS = [
+    dict(BUTTON, position=(0, 0)),
+    dict(BUTTON, position=(0, 40)),
+    {"type": "label", "text": "Name", "position": (0, 80), "color": [1, 2, 3], "background": "red"},
+    {"type": "input_box", "x": 0, "y": 120, "w": 100, "h": 30, "text": "search"},
+]
+
+
+def test_prerender_renders_each_text_once(screen):
+    text_cache.clear()
+    # The two buttons share one job although their colors are lists and pygame.Color objects
+    rendered = prerender(SPECS)
+    assert len(rendered) == 3
+    misses = text_cache.misses
+    prerender(SPECS)
+    assert text_cache.misses == misses
+
+
+def test_build_widgets_in_order(screen):
+    widgets = build_widgets(screen, SPECS)
+    assert [type(widget) for widget in widgets] == [Button, Button, Label, InputBox]
+    assert widgets[0].style is widgets[1].style
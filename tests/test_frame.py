@@ -0,0 +1,88 @@
+import pygame
+
+from frame import Frame
+
+
+class Probe:
+    """A widget that records the events it is sent."""
+
+    def __init__(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.dirty = True
+        self.dispatcher = None
+        self.events = []
+        self.focused = False
+
+    def get_bounds(self):
+        return self.rect.copy()
+
+    def draw(self, surface=None):
+        self.dirty = False
+
+    def check_event(self, event):
+        self.events.append((event.type, getattr(event, "pos", None)))
+
+    def on_focus_in(self):
+        self.focused = True
+
+    def on_focus_out(self):
+        self.focused = False
+
+
+def press(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def make():
+    frame = Frame(pygame.Surface((400, 300)), (50, 40, 100, 100), content_size=(100, 400))
+    top, bottom = Probe((0, 0, 100, 30)), Probe((0, 200, 100, 30))
+    frame.add(top, bottom)
+    return frame, top, bottom
+
+
+def test_mouse_events_are_sent_in_content_coordinates():
+    frame, top, bottom = make()
+    frame.check_event(press((60, 50)))
+    assert top.events == [(pygame.MOUSEBUTTONDOWN, (10, 10))]
+    assert top.focused and not bottom.events
+    frame.scroll_to(0, 180)
+    assert (frame.scroll_x, frame.scroll_y) == (0, 180)
+    frame.check_event(press((60, 65)))
+    assert bottom.events == [(pygame.MOUSEBUTTONDOWN, (10, 205))]
+    assert bottom.focused and not top.focused
+
+
+def test_events_outside_the_frame_are_not_routed():
+    frame, top, bottom = make()
+    frame.check_event(press((60, 50)))
+    frame.check_event(press((10, 10)))
+    frame.check_event(pygame.event.Event(pygame.MOUSEMOTION, pos=(200, 50), rel=(0, 0), buttons=(0, 0, 0)))
+    assert top.events == [(pygame.MOUSEBUTTONDOWN, (10, 10))]
+    assert not top.focused
+    frame.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a"))
+    assert len(top.events) == 1 and not bottom.events
+
+
+def test_a_release_outside_reaches_the_pressed_child():
+    frame, top, _ = make()
+    frame.check_event(press((60, 50)))
+    frame.check_event(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(300, 250), button=1))
+    assert top.events[-1] == (pygame.MOUSEBUTTONUP, (250, 210))
+
+
+def test_keys_go_to_the_focused_child():
+    frame, top, bottom = make()
+    frame.check_event(press((60, 50)))
+    frame.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode="a"))
+    assert top.events[-1] == (pygame.KEYDOWN, None)
+    assert not bottom.events
+
+
+def test_the_wheel_scrolls_inside_the_content():
+    frame, _, _ = make()
+    frame.check_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-2))
+    assert frame.scroll_y == 80
+    frame.check_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=-100))
+    assert frame.scroll_y == 300
+    frame.check_event(pygame.event.Event(pygame.MOUSEWHEEL, x=0, y=100))
+    assert frame.scroll_y == 0
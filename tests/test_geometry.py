@@ -0,0 +1,131 @@
+import pygame
+
+from geometry import Grid, Pack, Place
+
+
+class Box:
+    """The part of the widget protocol the geometry managers use."""
+
+    def __init__(self, width, height):
+        self.size = (width, height)
+        self.rect = None
+        self.geometry = None
+        self.arranged = 0
+
+    def get_requested_size(self):
+        return self.size
+
+    def set_rect(self, rect):
+        self.rect = pygame.Rect(rect)
+        self.arranged += 1
+
+    def resize(self, width, height):
+        self.size = (width, height)
+        self.geometry.invalidate(self)
+
+
+def test_pack_sides_and_fill():
+    root = Pack((0, 0, 200, 100))
+    top, left, rest = Box(50, 20), Box(30, 10), Box(10, 10)
+    root.pack(top, side="top", fill="x")
+    root.pack(left, side="left", anchor="n")
+    root.pack(rest, side="left", fill="both", expand=True)
+    root.update()
+    assert top.rect == (0, 0, 200, 20)
+    assert left.rect == (0, 20, 30, 10)
+    assert rest.rect == (30, 20, 170, 80)
+
+
+def test_pack_padding_and_requested_size():
+    root = Pack()
+    a, b = Box(40, 10), Box(20, 30)
+    root.pack(a, side="top", padx=5, pady=(1, 2))
+    root.pack(b, side="left")
+    assert root.get_requested_size() == (50, 43)
+    root.set_rect((0, 0, 50, 43))
+    assert a.rect == (5, 1, 40, 10)
+    assert b.rect == (0, 13, 20, 30)
+
+
+def test_pack_shares_the_extra_space_between_expanding_children():
+    root = Pack((0, 0, 100, 90))
+    children = [Box(10, 10) for _ in range(3)]
+    for child in children:
+        root.pack(child, side="top", fill="y", expand=True)
+    root.update()
+    assert [child.rect.h for child in children] == [30, 30, 30]
+    assert [child.rect.y for child in children] == [0, 30, 60]
+
+
+def test_grid_cells_spans_and_weights():
+    root = Grid((0, 0, 100, 50))
+    a, b, wide = Box(20, 10), Box(30, 20), Box(80, 10)
+    root.grid(a, row=0, column=0, sticky="nw")
+    root.grid(b, row=0, column=1)
+    root.grid(wide, row=1, column=0, columnspan=2, sticky="ew")
+    assert root.get_requested_size() == (80, 30)
+    root.columnconfigure(1, weight=1)
+    root.update()
+    # The span needs 80 pixels, the 30 missing are split between the columns, 35 and 45, then the weighted column
+    # gets the 20 pixels left over
+    assert a.rect == (0, 0, 20, 10)
+    assert b.rect == (35 + (65 - 30) // 2, 0, 30, 20)
+    assert wide.rect == (0, 20, 100, 10)
+
+
+def test_grid_offsets_give_the_rounding_remainder_to_the_last_weighted_line():
+    offsets = Grid._offsets([10, 10, 10], {0: (1, 0), 1: (1, 0)}, 5, 41)
+    assert offsets == [5, 20, 36, 46]
+
+
+def test_place_absolute_and_relative():
+    root = Place((10, 10, 200, 100))
+    fixed, centered, stretched = Box(20, 20), Box(40, 10), Box(5, 5)
+    root.place(fixed, x=5, y=6)
+    root.place(centered, relx=0.5, rely=0.5, anchor="center")
+    root.place(stretched, relwidth=1, relheight=0.5, height=4)
+    root.update()
+    assert fixed.rect == (15, 16, 20, 20)
+    assert centered.rect == (90, 55, 40, 10)
+    assert stretched.rect == (10, 10, 200, 54)
+    assert root.get_requested_size() == (40, 26)
+
+
+def test_unchanged_children_are_not_arranged_again():
+    root = Pack((0, 0, 100, 100))
+    a, b = Box(10, 10), Box(10, 10)
+    root.pack(a, side="top")
+    root.pack(b, side="top")
+    root.update()
+    b.resize(10, 20)
+    root.update()
+    assert (a.arranged, b.arranged) == (1, 2)
+    assert b.rect == (45, 10, 10, 20)
+
+
+def test_invalidated_child_gets_its_rect_even_if_unchanged():
+    root = Place((0, 0, 88, 68))
+    child = Box(20, 20)
+    root.place(child, relwidth=1, relheight=1)
+    root.update()
+    # A widget that set a rect of its own, eg. when scaled, asks to be arranged again
+    child.set_rect((0, 0, 40, 40))
+    root.invalidate(child)
+    root.update()
+    assert child.rect == (0, 0, 88, 68)
+
+
+def test_nested_managers_follow_their_parent():
+    root = Pack((0, 0, 100, 100))
+    toolbar = Pack()
+    button = Box(10, 10)
+    root.pack(toolbar, side="top", fill="x")
+    toolbar.pack(button, side="right")
+    root.update()
+    assert button.rect == (90, 0, 10, 10)
+    root.set_rect((0, 0, 200, 100))
+    assert button.rect == (190, 0, 10, 10)
+    button.resize(10, 30)
+    root.update()
+    assert toolbar.rect == (0, 0, 200, 30)
+    assert button.rect == (190, 0, 10, 30)
@@ -0,0 +1,28 @@
+import gc
+import weakref
+
+import event_loop
+from event_loop import loop
+from input_box import InputBox
+
+
+def test_blink_timer_stops_with_a_deactivated_box(screen):
+    box = InputBox(0, 0, 100, 30, active=True)
+    timer = box._blink_timer
+    assert timer in loop._timers
+    box.active = False
+    assert timer not in loop._timers and box._blink_timer is None
+
+
+def test_dropped_active_box_is_collected_and_stops_waking_the_loop(screen, monkeypatch):
+    box = InputBox(0, 0, 100, 30, active=True)
+    reference = weakref.ref(box)
+    del box
+    gc.collect()
+    assert reference() is None
+    # The timer left behind fires once and schedules no other
+    now = event_loop.time.monotonic()
+    monkeypatch.setattr(event_loop.time, "monotonic", lambda: now + 10)
+    loop.run_timers()
+    loop.run_timers()
+    assert loop.timeout() is None
@@ -0,0 +1,59 @@
+import pygame
+
+from render_queue import OVERLAY, POPUP, TOOLTIP, RenderQueue
+
+
+def solid(color, size=(10, 10)):
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+def test_layers_are_painted_in_order_whatever_the_submission_order():
+    target = pygame.Surface((20, 20))
+    queue = RenderQueue()
+    queue.on_layer(TOOLTIP).blit(solid((0, 0, 255)), (0, 0))
+    queue.on_layer(POPUP).fill((0, 255, 0), (0, 0, 20, 20))
+    queue.blit(solid((255, 0, 0), (20, 20)), (0, 0))
+    queue.fill((255, 255, 0), (15, 15, 5, 5), layer=OVERLAY)
+    assert len(queue) == 4
+    queue.flush(target)
+    assert target.get_at((5, 5))[:3] == (0, 0, 255)
+    assert target.get_at((17, 17))[:3] == (0, 255, 0)
+    assert len(queue) == 0
+
+
+def test_operations_of_a_layer_keep_their_order():
+    target = pygame.Surface((10, 10))
+    queue = RenderQueue()
+    queue.blits([(solid((255, 0, 0)), (0, 0)), (solid((0, 255, 0), (5, 10)), (0, 0))])
+    queue.blit(solid((0, 0, 255), (5, 5)), (0, 0))
+    queue.flush(target)
+    assert target.get_at((1, 1))[:3] == (0, 0, 255)
+    assert target.get_at((3, 8))[:3] == (0, 255, 0)
+    assert target.get_at((8, 8))[:3] == (255, 0, 0)
+
+
+def test_flush_returns_the_rects_drawn_and_clear_drops_everything():
+    target = pygame.Surface((30, 30))
+    queue = RenderQueue(layer=OVERLAY)
+    queue.fill((255, 0, 0), (5, 5, 10, 10))
+    queue.fill((255, 0, 0), (0, 0, 0, 10))
+    assert queue.flush(target, return_rects=True) == [pygame.Rect(5, 5, 10, 10)]
+    queue.blit(solid((0, 255, 0)), (0, 0))
+    queue.clear()
+    queue.flush(target)
+    assert target.get_at((0, 0))[:3] == (0, 0, 0)
+
+
+def test_open_dropdown_stays_above_widgets_drawn_after_it(screen):
+    from dropdown import DropDown
+    colors = [(200, 0, 0), (200, 0, 0)]
+    dropdown = DropDown(colors, colors, 0, 0, 100, 20, (None, 20), "menu", ["a", "b"])
+    dropdown.draw_menu = True
+    queue = RenderQueue()
+    dropdown.draw(queue)
+    queue.blit(solid((0, 0, 255), (100, 60)), (0, 0))
+    queue.flush(screen)
+    assert screen.get_at((95, 30))[:3] == (200, 0, 0)
+    assert screen.get_at((95, 5))[:3] == (0, 0, 255)
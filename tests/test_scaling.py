@@ -0,0 +1,97 @@
+import pygame
+import pytest
+
+import scaling
+from dropdown import DropDown
+from fonts import get_font
+
+
+@pytest.fixture
+def scale(screen):
+    """Resets the UI scale after the test."""
+    yield scaling.set_scale
+    scaling.set_scale(1)
+
+
+def test_dropdown_text_follows_the_scale(scale):
+    colors = [(200, 200, 200), (150, 150, 150)]
+    dropdown = DropDown(colors, colors, 10, 10, 100, 20, (None, 20), "Servers", ["alpha", "beta"])
+    height = dropdown.font.get_height()
+    assert dropdown.font is get_font(None, 20)
+    scale(2)
+    assert dropdown.rect.size == (200, 40)
+    assert dropdown.font is get_font(None, 40)
+    assert dropdown.font.get_height() >= 2 * height - 2
+    dropdown.draw_menu = True
+    dropdown.draw(pygame.display.get_surface())
+    scale(1)
+    assert dropdown.font is get_font(None, 20)
+
+
+def _positions(widgets):
+    return [tuple(widget.position) if hasattr(widget, "position") else widget.get_bounds().topleft
+            for widget in widgets]
+
+
+def test_positions_do_not_drift_over_scale_changes(scale):
+    from Label import Label
+    from button import Button
+    from canvas import Canvas
+    from input_box import InputBox
+    from text import Text
+    surface = pygame.display.get_surface()
+    colors = [(200, 200, 200), (150, 150, 150)]
+    widgets = [Button(surface, (33, 17), text="ok", width=40, height=20), Label(surface, "label", (35, 19)),
+               InputBox(37, 21, 50, 20), DropDown(colors, colors, 39, 23, 50, 20, (None, 20), "menu", ["a"]),
+               Text(surface, (41, 25, 50, 40)), Canvas(surface, (43, 27, 30, 30))]
+    before = _positions(widgets)
+    for _ in range(10):
+        scale(1.37)
+        scale(0.71)
+    scale(1)
+    assert _positions(widgets) == before
+    assert [widget.get_requested_size() for widget in widgets[2:]] == [(50, 20), (50, 20), (50, 40), (30, 30)]
+
+
+def test_a_moved_widget_is_scaled_from_where_it_is(scale):
+    from button import Button
+    button = Button(pygame.display.get_surface(), (10, 10), text="ok", width=40, height=20)
+    scale(2)
+    assert button.rect_original.topleft == (20, 20)
+    button.move(6, 0)
+    scale(1)
+    assert button.rect_original.topleft == (13, 10)
+
+
+def test_scaling_back_reuses_the_surfaces_of_the_old_scale(scale):
+    from button import Button
+    from text_cache import text_cache
+    surface = pygame.display.get_surface()
+    button = Button(surface, (10, 10), text="Save", width=60, height=24)
+    button.draw()
+    text_surface, state_surfaces = button.text_surface, dict(button._state_surfaces)
+    assert state_surfaces
+    scale(2)
+    assert button.get_requested_size() == (120, 48)
+    assert button.text_surface.get_height() > text_surface.get_height()
+    button.draw()
+    misses = text_cache.misses
+    scale(1)
+    assert text_cache.misses == misses
+    assert button.get_requested_size() == (60, 24)
+    assert button.rect_original == pygame.Rect(10, 10, 60, 24)
+    assert button.text_surface is text_surface
+    assert button._state_surfaces == state_surfaces
+    button.draw()
+    assert all(button._state_surfaces[state] is surface for state, surface in state_surfaces.items())
+
+
+def test_a_changed_text_is_rendered_again_when_scaling_back(scale):
+    from button import Button
+    button = Button(pygame.display.get_surface(), (10, 10), text="Save", width=60, height=24)
+    text_surface = button.text_surface
+    scale(2)
+    button.text = "Save as"
+    button.render_text()
+    scale(1)
+    assert button.text_surface is not text_surface
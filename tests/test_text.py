@@ -0,0 +1,53 @@
+import pytest
+
+from fonts import get_font
+from text import END, Text
+
+
+def make(screen, max_lines=5, height=1000):
+    return Text(screen, (0, 0, 200, height), max_lines=max_lines)
+
+
+def test_the_oldest_lines_are_dropped(screen):
+    text = make(screen)
+    for number in range(8):
+        text.insert(END, "line %d\n" % number)
+    assert len(text) == 5
+    assert (text.dropped, text.end) == (3, 8)
+    assert text.get() == "\n".join("line %d" % number for number in range(3, 8))
+    assert text.get(0, 4) == "line 3"
+
+
+def test_an_open_line_is_continued_without_dropping(screen):
+    text = make(screen)
+    text.write("a\nb\nc\nd\ne")
+    text.write("f\ng")
+    assert text.get() == "b\nc\nd\nef\ng"
+    assert text.dropped == 1
+
+
+def test_a_large_insert_keeps_only_the_last_lines(screen):
+    text = make(screen)
+    text.insert(END, "old\n")
+    text.insert(END, "".join("%d\n" % number for number in range(100)))
+    assert text.get() == "95\n96\n97\n98\n99"
+    assert (text.dropped, text.end) == (96, 101)
+
+
+def test_the_view_stays_on_kept_lines(screen):
+    text = make(screen, max_lines=50, height=3 * get_font(None, 20).get_linesize())
+    text.insert(END, "".join("%d\n" % number for number in range(20)))
+    assert text.following() and text.top == 17
+    text.yview(5)
+    text.insert(END, "".join("%d\n" % number for number in range(20, 60)))
+    # The view does not follow, but the lines it showed were dropped
+    assert text.top == text.dropped == 10
+    text.draw()
+    assert all(number >= text.dropped for number in text._surfaces)
+    text.see_end()
+    assert text.top == 57 and text.following()
+
+
+def test_only_appending_is_supported(screen):
+    with pytest.raises(ValueError):
+        make(screen).insert(0, "text")
@@ -0,0 +1,129 @@
+import pygame
+import pytest
+
+from text_buffer import TextBuffer
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 24)
+
+
+def test_offsets_are_whole_prefix_widths(font):
+    buffer = TextBuffer(font, "AVAWAY To")
+    for index in range(len(buffer) + 1):
+        assert buffer.x_of(index) == font.size(buffer.text[:index])[0]
+    assert buffer.width() == font.size(buffer.text)[0]
+
+
+def test_insert_replaces_the_selection(font):
+    buffer = TextBuffer(font, "hello world")
+    buffer.set_caret(0)
+    buffer.set_caret(5, select=True)
+    assert buffer.selected_text() == "hello"
+    buffer.insert("goodbye")
+    assert buffer.text == "goodbye world"
+    assert buffer.caret == 7 and buffer.selection() is None
+
+
+def test_editing_drops_the_offsets_after_the_change(font):
+    buffer = TextBuffer(font, "abcdef")
+    buffer.width()
+    buffer.set_caret(2)
+    buffer.insert("WW")
+    assert buffer.width() == font.size("abWWcdef")[0]
+    assert buffer.x_of(2) == font.size("ab")[0]
+    buffer.delete_back()
+    buffer.delete_forward()
+    assert buffer.text == "abWdef"
+    assert buffer.width() == font.size("abWdef")[0]
+
+
+def test_delete_at_the_edges(font):
+    buffer = TextBuffer(font, "ab")
+    buffer.delete_forward()
+    assert buffer.text == "ab"
+    buffer.set_caret(0)
+    buffer.delete_back()
+    assert buffer.text == "ab" and buffer.caret == 0
+
+
+def test_index_at_picks_the_closest_position(font):
+    buffer = TextBuffer(font, "some text")
+    for index in range(len(buffer) + 1):
+        assert buffer.index_at(buffer.x_of(index)) == index
+    assert buffer.index_at(-10) == 0
+    assert buffer.index_at(buffer.width() + 10) == len(buffer)
+
+
+def test_move_collapses_the_selection(font):
+    buffer = TextBuffer(font, "abcdef")
+    buffer.set_caret(1)
+    buffer.move(3, select=True)
+    assert buffer.selection() == (1, 4)
+    buffer.move(-1)
+    assert buffer.caret == 1 and buffer.selection() is None
+    buffer.select_all()
+    buffer.move(1)
+    assert buffer.caret == 6
+    buffer.set_caret(100)
+    assert buffer.caret == 6
+
+
+def test_set_font_measures_again(font):
+    buffer = TextBuffer(font, "abc")
+    buffer.width()
+    bigger = pygame.font.Font(None, 48)
+    buffer.set_font(bigger)
+    assert buffer.width() == bigger.size("abc")[0]
+
+
+def test_offsets_relative_to_a_position(font):
+    buffer = TextBuffer(font, "AVAWAY To")
+    assert buffer.x_of(7, 3) == font.size("WAY ")[0]
+    assert buffer.x_of(3, 7) == -font.size("WAY ")[0]
+    for index in range(3, len(buffer) + 1):
+        assert buffer.index_at(buffer.x_of(index, 3), 3) == index
+
+
+def test_fit_before_finds_the_widest_piece_that_fits(font):
+    buffer = TextBuffer(font, "the quick brown fox jumps over the lazy dog")
+    end = len(buffer)
+    for width in (0, 1, 30, 100, 1000):
+        start = buffer.fit_before(end, width)
+        assert buffer.width_of(start, end) <= width
+        if start > 0:
+            assert buffer.width_of(start - 1, end) > width
+
+
+class CountingFont(pygame.font.Font):
+    """Counts the characters measured, the work a keystroke does."""
+
+    measured = 0
+
+    def size(self, text):
+        CountingFont.measured += len(text)
+        return super().size(text)
+
+
+def _measured_per_key(length, caret):
+    from input_box import InputBox
+    box = InputBox(0, 0, 200, 32, font=CountingFont(None, 24), active=True)
+    box.text = "ab cd" * (length // 5)
+    box.buffer.set_caret(caret(length))
+    box.insert("x")
+    CountingFont.measured = 0
+    for _ in range(20):
+        box.insert("x")
+        box.check_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_BACKSPACE, mod=0))
+        box.insert("y")
+    return CountingFont.measured / 60
+
+
+@pytest.mark.parametrize("caret", [lambda length: length, lambda length: length // 2, lambda length: 0],
+                         ids=["end", "middle", "start"])
+def test_keystroke_cost_does_not_grow_with_the_text(screen, caret):
+    short = _measured_per_key(100, caret)
+    long = _measured_per_key(50000, caret)
+    assert long <= short * 1.5 + 50
@@ -0,0 +1,284 @@
+from collections import deque
+
+import pygame
+
+from fonts import get_font
+from profiler import profiled
+from scaling import rescaled_position, scaled, track
+
+END = "end"
+
+
+class Text:
+    """A scrolling multi line text view for streaming output such as logs, like a read only Tkinter Text.
+
+    Lines are kept in a ring buffer holding at most max_lines, the oldest lines are dropped as new ones arrive. Every
+    line is rendered once when it first becomes visible, and the visible lines are kept in a surface of their own:
+    scrolling moves that surface and only renders the lines scrolled into view, so the cost of a frame depends on
+    the number of new lines and not on the length of the history. While the view shows the last line it follows new
+    output. A Text can be written to like a file, eg. logging.StreamHandler(console):
+
+    console = Text(screen, (10, 10, 600, 300))
+    console.insert(END, "connected\\n")
+    ...
+    console.check_event(event)  # inside the for loop over pygame.event.get(), the mouse wheel scrolls
+    console.draw()
+    """
+    __slots__ = ("master", "rect", "font", "color", "background", "lines", "dropped", "top", "padx", "scroll_step",
+                 "dirty", "dispatcher", "geometry", "_font_args", "_scale", "_open", "_surfaces", "_stale", "_view",
+                 "_view_top", "_view_end", "_requested_size", "_unscaled_size", "_origin", "__weakref__")
+
+    def __init__(self, master, rect, font=None, font_size=20, color=(220, 220, 220), background=(0, 0, 0),
+                 max_lines=10000, padx=4, scroll_step=3):
+        """
+        :param master: the surface the text is drawn on
+        :param rect: the area the text covers
+        :param font: the font file, None is pygame's default font
+        :param font_size: the font size
+        :param color: the color of lines inserted without a color of their own
+        :param background: the background color
+        :param max_lines: the number of lines kept, the oldest ones are dropped beyond it
+        :param padx: the space in pixels left of every line
+        :param scroll_step: the number of lines one mouse wheel step scrolls
+        """
+        self.master = master
+        self.rect = pygame.Rect(rect)
+        self.font = get_font(font, font_size)
+        self.color = color
+        self.background = background
+        # (text, color) of every line kept, lines[0] is line number `dropped` of everything inserted
+        self.lines = deque(maxlen=max_lines)
+        self.dropped = 0
+        # The number of the first visible line
+        self.top = 0
+        self.padx = padx
+        self.scroll_step = scroll_step
+        self.dirty = True
+        # Set by an EventDispatcher the text is registered with
+        self.dispatcher = None
+        # Set by the geometry manager the text is arranged by
+        self.geometry = None
+        self._font_args = (font, font_size)
+        self._scale = 1
+        # Whether the last line is still open, ie. the last insert did not end with a newline
+        self._open = False
+        # Rendered lines by line number, only lines around the view are kept
+        self._surfaces = {}
+        # Line numbers whose text changed since they were painted into the view
+        self._stale = set()
+        self._view = pygame.Surface(self.rect.size)
+        # The first line and the end of the lines painted into the view, None when it has to be painted afresh
+        self._view_top = None
+        self._view_end = 0
+        self._requested_size = self._unscaled_size = self.rect.size
+        self._origin = None
+        track(self)
+
+    def __len__(self):
+        return len(self.lines)
+
+    @property
+    def end(self):
+        """The number one past the last line inserted so far."""
+        return self.dropped + len(self.lines)
+
+    @property
+    def line_height(self):
+        return self.font.get_linesize()
+
+    @property
+    def rows(self):
+        """The number of lines that fit in the view, the last one possibly cut off."""
+        return -(-self.rect.h // self.line_height)
+
+    def _max_top(self):
+        return max(self.dropped, self.end - self.rect.h // self.line_height)
+
+    def following(self):
+        """Return whether the view shows the last line, new output then scrolls it along."""
+        return self.top >= self._max_top()
+
+    def insert(self, index, chars, color=None):
+        """
+        Add text at the end, newlines start new lines. Text not ending with a newline is continued by the next insert
+        :param index: only END is supported, the text is append only
+        :param chars: the text to add
+        :param color: the color of the lines started by this text, defaults to the text's color
+        """
+        if index != END:
+            raise ValueError("text can only be inserted at the end")
+        if not chars:
+            return
+        follow = self.following()
+        parts = chars.split("\n")
+        if chars.endswith("\n"):
+            parts.pop()
+        if self._open and self.lines:
+            text, line_color = self.lines[-1]
+            self.lines[-1] = (text + parts.pop(0), line_color)
+            self._changed(self.end - 1)
+        maxlen = self.lines.maxlen
+        if maxlen is not None and len(parts) > maxlen:
+            # Only the last maxlen lines of a large insert are kept
+            self.dropped += len(self.lines) + len(parts) - maxlen
+            self.lines.clear()
+            parts = parts[-maxlen:]
+        for part in parts:
+            if len(self.lines) == maxlen:
+                self.dropped += 1
+            self.lines.append((part, color or self.color))
+        self._open = not chars.endswith("\n")
+        if follow:
+            self.top = self._max_top()
+        elif self.top < self.dropped:
+            self.top = self.dropped
+        self.dirty = True
+
+    def write(self, chars):
+        """Insert text at the end, so the text can stand in for a file."""
+        self.insert(END, chars)
+        return len(chars)
+
+    def flush(self):
+        pass
+
+    def _changed(self, number):
+        self._surfaces.pop(number, None)
+        self._stale.add(number)
+
+    def get(self, first=None, last=None):
+        """Return the text of the lines numbered first up to last, every line kept by default."""
+        first = self.dropped if first is None else max(first, self.dropped)
+        last = self.end if last is None else min(last, self.end)
+        return "\n".join(self.lines[number - self.dropped][0] for number in range(first, last))
+
+    def clear(self):
+        """Drop every line."""
+        self.lines.clear()
+        self.dropped = 0
+        self.top = 0
+        self._open = False
+        self._surfaces.clear()
+        self._stale.clear()
+        self._view_top = None
+        self.dirty = True
+
+    def yview(self, number):
+        """Scroll the view so line number is the first visible line, as far as there are lines."""
+        top = max(self.dropped, min(int(number), self._max_top()))
+        if top != self.top:
+            self.top = top
+            self.dirty = True
+
+    def scroll(self, lines):
+        """Scroll the view down by lines, or up for a negative number."""
+        self.yview(self.top + lines)
+
+    def see_end(self):
+        """Scroll to the last line, the view follows new output again."""
+        self.yview(self._max_top())
+
+    def get_bounds(self):
+        """Return the area the text covers."""
+        return self.rect.copy()
+
+    def get_requested_size(self):
+        """Return the size the text was created with."""
+        return self._requested_size
+
+    def set_rect(self, rect):
+        """
+        Move and resize the text, this is how geometry managers arrange it
+        :param rect: the new area the text covers
+        """
+        rect = pygame.Rect(rect)
+        follow = self.following()
+        if rect.size != self.rect.size:
+            self._view = pygame.Surface(rect.size)
+            self._view_top = None
+        self.rect = rect
+        self.yview(self._max_top() if follow else self.top)
+        self.dirty = True
+        if self.dispatcher is not None:
+            self.dispatcher.reindex(self)
+
+    def apply_scale(self, scale):
+        """
+        Render the text with the font at a UI scale factor, scaling.set_scale calls this
+        :param scale: the new scale factor
+        """
+        if scale == self._scale:
+            return
+        position, self._origin = rescaled_position(self.rect.topleft, self._scale, scale, self._origin)
+        self._scale = scale
+        path, size = self._font_args
+        self.font = get_font(path, max(1, round(size * scale)))
+        self._surfaces.clear()
+        self._requested_size = (scaled(self._unscaled_size[0], scale), scaled(self._unscaled_size[1], scale))
+        self.set_rect(position + self._requested_size)
+        if self.geometry is not None:
+            self.geometry.invalidate(self)
+
+    def check_event(self, event):
+        """
+        Scroll with the mouse wheel while the pointer is over the text
+        :param event: a single event obtained from pygame.event.get()
+        """
+        if event.type == pygame.MOUSEWHEEL and (self.dispatcher is not None or
+                                                self.rect.collidepoint(pygame.mouse.get_pos())):
+            self.scroll(-event.y * self.scroll_step)
+
+    def _line_surface(self, number):
+        surface = self._surfaces.get(number)
+        if surface is None:
+            text, color = self.lines[number - self.dropped]
+            surface = self._surfaces[number] = self.font.render(text, True, color, self.background)
+        return surface
+
+    def _paint_row(self, number):
+        line_height = self.line_height
+        y = (number - self.top) * line_height
+        self._view.fill(self.background, (0, y, self.rect.w, line_height))
+        if self.dropped <= number < self.end:
+            self._view.blit(self._line_surface(number), (self.padx, y))
+
+    def _paint(self):
+        top, rows, end = self.top, self.rows, self.end
+        view_top = self._view_top
+        if view_top is None or abs(top - view_top) >= rows:
+            self._view.fill(self.background)
+            numbers = range(top, min(end, top + rows))
+        else:
+            # Move what is already painted and fill in the rows scrolled into view, the rows that were empty the
+            # last time and the lines whose text changed
+            shift = top - view_top
+            if shift:
+                self._view.scroll(0, -shift * self.line_height)
+            # The last row may have been cut off, so it is painted again once it moves up
+            exposed = range(top + rows - shift - 1, top + rows) if shift > 0 else range(top, top - shift)
+            filled = range(max(top, self._view_end), min(end, top + rows))
+            numbers = set(exposed) | set(filled) | {number for number in self._stale if top <= number < top + rows}
+        for number in numbers:
+            self._paint_row(number)
+        self._stale.clear()
+        self._view_top = top
+        self._view_end = min(end, top + rows)
+        if len(self._surfaces) > 4 * rows:
+            # Forget the rendered lines far from the view
+            self._surfaces = {number: surface for number, surface in self._surfaces.items()
+                              if top - rows <= number < top + 2 * rows}
+
+    def update(self):
+        """Update needs to be called every frame in the main loop."""
+        self.draw()
+
+    @profiled("render")
+    def draw(self, surface=None):
+        """
+        Paint the visible lines, only the ones not painted before are rendered
+        :param surface: the surface to draw on, defaults to master
+        """
+        if self.dirty or self._view_top is None:
+            self._paint()
+        (self.master if surface is None else surface).blit(self._view, self.rect)
+        self.dirty = False
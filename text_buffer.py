@@ -0,0 +1,187 @@
+class TextBuffer:
+    """Editable single line text with a caret, a selection and cached text widths.
+
+    Pixel offsets are measured relative to a nearby position, eg. the first character visible in an input box, as
+    the width of the text between the two, since kerning and hinting make it differ from the sum of the character
+    widths. Only the text between the two positions is measured, so the cost does not grow with the length of the
+    text. Widths are kept until the text they cover changes.
+    """
+
+    def __init__(self, font, text=""):
+        """
+        :param font: the font used to measure the text
+        :param text: the initial text, the caret is placed after it
+        """
+        self.font = font
+        self._text = text
+        self.caret = len(text)
+        # The other end of the selection, None when nothing is selected
+        self.anchor = None
+        # _widths[start, end] is the width of text[start:end], for the pieces measured so far
+        self._widths = {}
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.caret = len(value)
+        self.anchor = None
+        self._widths = {}
+
+    def set_font(self, font):
+        """Measure the text with another font from now on."""
+        self.font = font
+        self._widths = {}
+
+    def __len__(self):
+        return len(self._text)
+
+    def _invalidate(self, index):
+        # The widths asked for again are the few around the visible text, so the cache is simply dropped once it grew
+        if len(self._widths) > 64:
+            self._widths = {}
+        else:
+            self._widths = {key: width for key, width in self._widths.items() if key[1] <= index}
+
+    def width_of(self, start, end):
+        """Return the width in pixels of the text from start to end."""
+        if end <= start:
+            return 0
+        width = self._widths.get((start, end))
+        if width is None:
+            width = self._widths[start, end] = self.font.size(self._text[start:end])[0]
+        return width
+
+    def x_of(self, index, start=0):
+        """Return the pixel offset of a caret position from the position start, negative left of it."""
+        return self.width_of(start, index) if index >= start else -self.width_of(index, start)
+
+    def width(self):
+        """Return the width in pixels of the whole text."""
+        return self.width_of(0, len(self._text))
+
+    def index_at(self, x, start=0):
+        """Return the caret position closest to a pixel offset from the position start, at or right of it."""
+        if x <= 0:
+            return start
+        # The search range doubles until it reaches x, so only the text up to about x is measured
+        below, step = start, 1
+        while True:
+            high = min(len(self._text), start + step)
+            if self.x_of(high, start) >= x:
+                break
+            if high == len(self._text):
+                return high
+            below, step = high, step * 2
+        # The first position at or right of x
+        low = below + 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.x_of(middle, start) < x:
+                low = middle + 1
+            else:
+                high = middle
+        if x - self.x_of(low - 1, start) < self.x_of(low, start) - x:
+            low -= 1
+        return low
+
+    def fit_before(self, end, width, too_wide=None):
+        """
+        Return the smallest position from which the text up to end is at most width pixels wide
+        :param too_wide: a position the text up to end is known to be too wide from, the search then starts right of
+                         it instead of at end, eg. where the text was scrolled to before the caret moved right
+        """
+        step = 1
+        if too_wide is None:
+            fits = end
+            while fits > 0:
+                too_wide = max(0, end - step)
+                if self.width_of(too_wide, end) > width:
+                    break
+                fits, step = too_wide, step * 2
+            else:
+                return 0
+        else:
+            while True:
+                fits = min(end, too_wide + step)
+                if self.width_of(fits, end) <= width:
+                    break
+                too_wide, step = fits, step * 2
+        # The text from too_wide on is too wide, from fits on it is not
+        low = too_wide + 1
+        while low < fits:
+            middle = (low + fits) // 2
+            if self.width_of(middle, end) <= width:
+                fits = middle
+            else:
+                low = middle + 1
+        return fits
+
+    def selection(self):
+        """Return the (start, end) indices of the selected text, or None if nothing is selected."""
+        if self.anchor is None or self.anchor == self.caret:
+            return None
+        return min(self.anchor, self.caret), max(self.anchor, self.caret)
+
+    def selected_text(self):
+        selection = self.selection()
+        return self._text[selection[0]:selection[1]] if selection else ""
+
+    def _replace(self, start, end, text):
+        self._text = self._text[:start] + text + self._text[end:]
+        self._invalidate(start)
+        self.caret = start + len(text)
+        self.anchor = None
+
+    def insert(self, text):
+        """Insert text at the caret, replacing the selection, however long the text is it is inserted at once."""
+        start, end = self.selection() or (self.caret, self.caret)
+        self._replace(start, end, text)
+
+    def delete_back(self):
+        """Delete the selection or the character before the caret, like backspace."""
+        selection = self.selection()
+        if selection:
+            self._replace(*selection, "")
+        elif self.caret > 0:
+            self._replace(self.caret - 1, self.caret, "")
+        else:
+            self.anchor = None
+
+    def delete_forward(self):
+        """Delete the selection or the character after the caret, like the delete key."""
+        selection = self.selection()
+        if selection:
+            self._replace(*selection, "")
+        elif self.caret < len(self._text):
+            self._replace(self.caret, self.caret + 1, "")
+        else:
+            self.anchor = None
+
+    def set_caret(self, index, select=False):
+        """
+        Move the caret to an index
+        :param index: the new caret position, it is clamped to the text
+        :param select: extend the selection to the new position instead of dropping it
+        """
+        if select:
+            if self.anchor is None:
+                self.anchor = self.caret
+        else:
+            self.anchor = None
+        self.caret = max(0, min(index, len(self._text)))
+
+    def move(self, delta, select=False):
+        """Move the caret by delta characters, collapsing a selection to its edge when select is False."""
+        selection = self.selection()
+        if selection and not select:
+            self.set_caret(selection[0] if delta < 0 else selection[1])
+        else:
+            self.set_caret(self.caret + delta, select)
+
+    def select_all(self):
+        self.anchor = 0
+        self.caret = len(self._text)
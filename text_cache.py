@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """A least recently used cache of rendered text surfaces.
+
+    Surfaces are keyed by the font object and its bold/italic/underline/strikethrough style, the text, antialias,
+    color and background, so two widgets showing the same caption in the same font share one surface. The surfaces
+    handed out are shared and must not be modified, copy them before calling set_alpha or drawing on them. The cache
+    may be used from several threads, as long as a font is only rendered with by one thread at a time.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """
+        :param max_bytes: the amount of pixel memory the cached surfaces may use before the least recently used ones
+                          are evicted
+        """
+        self._surfaces = OrderedDict()
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._max_bytes = value
+        with self._lock:
+            self._evict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    @staticmethod
+    def _color_key(color):
+        if color is None or isinstance(color, tuple):
+            return color
+        return tuple(pygame.Color(color))
+
+    def render(self, font, text, antialias, color, background=None):
+        """Same as font.render(text, antialias, color, background) but returns a cached surface when possible."""
+        key = (font, font.bold, font.italic, font.underline, font.strikethrough, text, bool(antialias),
+               self._color_key(color), self._color_key(background))
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self._surfaces.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+
+        if background is None:
+            surface = font.render(text, antialias, color)
+        else:
+            surface = font.render(text, antialias, color, background)
+        with self._lock:
+            # Another thread may have rendered the same text in the meantime
+            existing = self._surfaces.get(key)
+            if existing is not None:
+                return existing
+            self._surfaces[key] = surface
+            self.size_bytes += surface.get_pitch() * surface.get_height()
+            self._evict()
+        return surface
+
+    def _evict(self):
+        # The surface just rendered is kept even if it alone is bigger than the bound
+        while self.size_bytes > self._max_bytes and len(self._surfaces) > 1:
+            _, surface = self._surfaces.popitem(last=False)
+            self.size_bytes -= surface.get_pitch() * surface.get_height()
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached surface, the statistics are kept."""
+        with self._lock:
+            self._surfaces.clear()
+            self.size_bytes = 0
+
+    def stats(self):
+        """Return the hit/miss counters and memory use of the cache as a dictionary."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0, "entries": len(self._surfaces),
+                "size_bytes": self.size_bytes, "max_bytes": self._max_bytes}
+
+
+# The process wide cache every widget renders its text through
+text_cache = TextCache()
+
+
+def render(font, text, antialias, color, background=None):
+    """Render text through the shared cache, see TextCache.render."""
+    return text_cache.render(font, text, antialias, color, background)
@@ -0,0 +1,153 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import pygame
+
+from text_cache import render
+
+# Measured word widths per font, keyed by (bold, italic, word) since both change the width of the glyphs
+_word_widths = weakref.WeakKeyDictionary()
+MAX_CACHED_WORDS = 8192
+# Recently used layouts, so widgets showing the same text share the line breaks and rendered surfaces
+_layouts = OrderedDict()
+MAX_CACHED_LAYOUTS = 256
+# Every layout still referenced somewhere, eg. by the widget factory, is found even after the LRU dropped it
+_live_layouts = weakref.WeakValueDictionary()
+# Guards the two caches above, layouts may be created off the UI thread, eg. by asynchronous commands
+_lock = threading.Lock()
+
+
+def measure(font, word):
+    """Return the width in pixels of a word, measuring each word only once per font."""
+    widths = _word_widths.get(font)
+    if widths is None:
+        with _lock:
+            widths = _word_widths.setdefault(font, {})
+    key = (font.bold, font.italic, word)
+    width = widths.get(key)
+    if width is None:
+        if len(widths) >= MAX_CACHED_WORDS:
+            widths.clear()
+        width = widths[key] = font.size(word)[0]
+    return width
+
+
+def wrap_lines(font, text, width=0):
+    """
+    Break text into lines that are no wider than width, newlines always start a new line. Every word is measured
+    once and the line widths are summed up, so the cost grows linearly with the length of the text
+    :param font: the font the text will be rendered with
+    :param text: the text to be wrapped
+    :param width: the maximum width of a line in pixels, the text is only split on newlines if it is 0 or less
+    :return: a list of strings, one per line
+    """
+    lines = []
+    space_width = measure(font, " ")
+    for paragraph in text.split("\n"):
+        if width <= 0:
+            lines.append(paragraph)
+            continue
+        words = []
+        line_width = 0
+        for word in paragraph.split(" "):
+            word_width = measure(font, word)
+            if words and line_width + space_width + word_width > width:
+                lines.append(" ".join(words))
+                words = [word]
+                line_width = word_width
+            else:
+                line_width += word_width + (space_width if words else 0)
+                words.append(word)
+        lines.append(" ".join(words))
+    return lines
+
+
+class TextLayout:
+    """Line breaks of a text computed once, rendered at most once per color.
+
+    layout = TextLayout(font, "Some long caption", width=120)
+    surface = layout.render((0, 0, 0))
+    """
+
+    def __init__(self, font, text, width=0, max_height=0, justify="left"):
+        """
+        :param font: the font used to measure and render the text
+        :param text: the text to lay out
+        :param width: the width the lines are wrapped at, 0 means only newlines break lines
+        :param max_height: lines that do not fit in this height are dropped, 0 means no limit
+        :param justify: "left", "center" or "right" alignment of the lines within the rendered surface
+        """
+        self.font = font
+        self.text = text
+        self.width = width
+        self.justify = justify
+        self.line_height = font.get_height()
+        self.lines = wrap_lines(font, text, width)
+        if max_height > 0:
+            self.lines = self.lines[:max(1, max_height // self.line_height)]
+        self.height = len(self.lines) * self.line_height
+        if max_height > 0:
+            self.height = min(self.height, max_height)
+        self._surfaces = {}
+
+    def render(self, color, background=None):
+        """Return the laid out text rendered in color, the surface is shared by every call with the same colors."""
+        key = (tuple(pygame.Color(color)), background and tuple(pygame.Color(background)))
+        surface = self._surfaces.get(key)
+        if surface is None:
+            surface = self._surfaces[key] = self._render(color, background)
+        return surface
+
+    def render_scaled(self, color, scale):
+        """Return the text rendered in color and scaled by the (x, y) factors of scale, shared like render()."""
+        key = (tuple(pygame.Color(color)), "scaled", tuple(scale))
+        surface = self._surfaces.get(key)
+        if surface is None:
+            unscaled = self.render(color)
+            size = (scale[0] * unscaled.get_width(), scale[1] * unscaled.get_height())
+            surface = self._surfaces[key] = pygame.transform.scale(unscaled, size)
+        return surface
+
+    def _render(self, color, background):
+        line_surfaces = [render(self.font, line, True, color) for line in self.lines]
+        width = max((line.get_width() for line in line_surfaces), default=0)
+        surface = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        if background:
+            surface.fill(background)
+        for index, line in enumerate(line_surfaces):
+            if self.justify == "center":
+                x = (width - line.get_width()) // 2
+            elif self.justify == "right":
+                x = width - line.get_width()
+            else:
+                x = 0
+            surface.blit(line, (x, index * self.line_height))
+        return surface
+
+
+def get_layout(font, text, width=0, max_height=0, justify="left"):
+    """Return a TextLayout for the arguments, reusing a recently created one when possible."""
+    key = (font, font.bold, font.italic, font.underline, font.strikethrough, text, width, max_height, justify)
+    with _lock:
+        layout = _layouts.get(key)
+        if layout is not None:
+            _layouts.move_to_end(key)
+            return layout
+        layout = _live_layouts.get(key)
+    if layout is None:
+        layout = TextLayout(font, text, width, max_height, justify)
+    with _lock:
+        layout = _layouts.setdefault(key, layout)
+        _live_layouts[key] = layout
+        if len(_layouts) > MAX_CACHED_LAYOUTS:
+            _layouts.popitem(last=False)
+    return layout
+
+
+def clear_layouts():
+    """Forget the cached layouts and measured word widths."""
+    with _lock:
+        _layouts.clear()
+        _live_layouts.clear()
+        _word_widths.clear()
@@ -0,0 +1,120 @@
+import pygame
+
+from render_queue import RenderQueue
+
+
+class WidgetManager:
+    """Repaints only the widgets whose look changed since the last frame.
+
+    Every widget added to the manager is expected to expose a ``dirty`` flag, a ``get_bounds()`` method and a
+    ``draw(surface)`` method, widgets that react to the mouse also expose ``check_hover()``. Instead of calling
+    ``update()``/``draw()`` on every widget, call the manager once per frame and hand its result to
+    ``pygame.display.update``:
+
+    manager = WidgetManager(screen, background=(30, 30, 30))
+    manager.add(button)
+    ...
+    pygame.display.update(manager.update())
+    """
+
+    def __init__(self, surface, background=(0, 0, 0), batch=False):
+        """
+        :param surface: the surface the widgets are painted on, usually the display surface
+        :param background: a color or a surface used to clear the area behind a widget before it is repainted
+        :param batch: paint the widgets through a RenderQueue, flushed with one blits() call per layer
+        """
+        self.surface = surface
+        self.queue = RenderQueue() if batch else None
+        self.background = background
+        self.widgets = []
+        self.full_redraw = True
+        self._bounds = {}
+        # Areas left behind by removed widgets, cleared on the next update
+        self._pending = []
+
+    def add(self, *widgets):
+        """Add widgets to the manager, they are painted in the order they were added."""
+        for widget in widgets:
+            if widget not in self._bounds:
+                self.widgets.append(widget)
+                self._bounds[widget] = None
+                widget.dirty = True
+
+    def remove(self, *widgets):
+        """Remove widgets from the manager, the area they covered is cleared on the next update."""
+        for widget in widgets:
+            if widget in self._bounds:
+                self.widgets.remove(widget)
+                bounds = self._bounds.pop(widget)
+                if bounds:
+                    self._pending.append(bounds)
+
+    def mark_dirty(self, widget=None):
+        """Force a widget, or every widget when none is given, to be repainted on the next update."""
+        if widget is None:
+            self.full_redraw = True
+        else:
+            widget.dirty = True
+
+    def _clear(self, rect):
+        if isinstance(self.background, pygame.Surface):
+            self.surface.blit(self.background, rect, rect)
+        else:
+            self.surface.fill(self.background, rect)
+
+    def update(self, force=False, poll=True):
+        """
+        Poll the widgets, repaint the ones that changed and return the areas of the surface that were touched
+        :param force: repaint every widget even if nothing changed, the whole surface is returned
+        :param poll: call check_hover on the widgets first, containers that already polled their children skip it
+        :return: a list of rects to be passed to pygame.display.update
+        """
+        target = self.surface if self.queue is None else self.queue
+        if poll:
+            for widget in self.widgets:
+                check_hover = getattr(widget, "check_hover", None)
+                if check_hover:
+                    check_hover()
+
+        if force or self.full_redraw:
+            self.full_redraw = False
+            self._pending.clear()
+            self._clear(self.surface.get_rect())
+            for widget in self.widgets:
+                widget.draw(target)
+                self._bounds[widget] = widget.get_bounds()
+            if self.queue is not None:
+                self.queue.flush(self.surface)
+            return [self.surface.get_rect()]
+
+        dirty_rects = list(self._pending)
+        self._pending.clear()
+        repaint = set()
+        for widget in self.widgets:
+            bounds = widget.get_bounds()
+            old_bounds = self._bounds[widget]
+            if widget.dirty or bounds != old_bounds:
+                repaint.add(widget)
+                dirty_rects.append(bounds)
+                if old_bounds and old_bounds != bounds:
+                    dirty_rects.append(old_bounds)
+            self._bounds[widget] = bounds
+
+        # A clean widget that overlaps a cleared area has to be repainted as well, which in turn clears its own area
+        changed = bool(dirty_rects)
+        while changed:
+            changed = False
+            for widget in self.widgets:
+                if widget not in repaint and self._bounds[widget].collidelist(dirty_rects) != -1:
+                    repaint.add(widget)
+                    dirty_rects.append(self._bounds[widget])
+                    changed = True
+
+        for rect in dirty_rects:
+            self._clear(rect)
+        for widget in self.widgets:
+            if widget in repaint:
+                widget.draw(target)
+        if self.queue is not None:
+            self.queue.flush(self.surface)
+        return dirty_rects